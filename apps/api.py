@@ -1,12 +1,78 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+import hmac
+import os
+import sqlite3
+import sys
+import threading
+import time
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import joblib
+import numpy as np
 import pandas as pd
+from batcher import MicroBatcher
 
-app = FastAPI()
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
 
-# Load the trained Random Forest model
-model = joblib.load('random_forest_model.pkl')
+from compiled_forest import CompiledForest
+from data_preprocessing import Preprocessor, preprocessor_path
+from feature_store import FeatureStore
+from instrumentation import SummarySink, add_sink, emit
+from model_registry import ModelRegistry
+from woe_binning import WoEBinning, woe_binning_path
+
+# Either the pickled sklearn object or its compiled array export
+MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'sklearn')
+MODEL_PATH = os.environ.get('MODEL_PATH', 'random_forest_model.pkl')
+
+# Scaling fitted during feature engineering, saved next to the model by ModelTraining.save_model(preprocessor=...)
+PREPROCESSOR_PATH = os.environ.get('PREPROCESSOR_PATH', preprocessor_path(MODEL_PATH))
+
+# WoE bins of a model trained on WoE values, saved next to the model by ModelTraining.save_model
+WOE_BINNING_PATH = os.environ.get('WOE_BINNING_PATH', woe_binning_path(MODEL_PATH))
+
+# Versioned models written by ModelTraining.save_model(registry_dir=...); without a registry the single files below are used
+MODEL_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR')
+MODEL_NAME = os.environ.get('MODEL_NAME', 'random_forest')
+MODEL_VERSION = os.environ.get('MODEL_VERSION')
+
+# 'r' memory-maps the stored arrays read-only, so workers loading the same version share those pages
+MODEL_MMAP_MODE = os.environ.get('MODEL_MMAP_MODE') or None
+
+# Load the model at startup instead of on the first request (set by the multi-worker launcher)
+MODEL_PRELOAD = os.environ.get('MODEL_PRELOAD', '0') == '1'
+
+# How often each worker checks the registry for a newly promoted version; 0 disables the check
+MODEL_REFRESH_SECONDS = float(os.environ.get('MODEL_REFRESH_SECONDS', 0))
+
+# Token required by the /admin endpoints; without one they are disabled
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# The model is loaded on first use and can be swapped while serving, together with its preprocessor and WoE bins
+model = None
+model_info = {}
+preprocessor = None
+woe_binning = None
+model_lock = threading.Lock()
+promoted_version = None
+promoted_checked_at = 0.0
+
+# Feature order the model was trained on (see ModelTraining.split_data)
+FEATURE_COLUMNS = ['Amount', 'Value', 'total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']
+
+# Upper bound on the number of records accepted by /predict/batch
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 10000))
+
+# SQLite file with per-customer aggregate features, written by FeatureEngineering.save_feature_store
+FEATURE_STORE_PATH = os.environ.get('FEATURE_STORE_PATH', 'feature_store.db')
+feature_store = None
+
+# Micro-batching of single /predict requests: flush every BATCH_WINDOW_MS or MAX_MICRO_BATCH_SIZE records
+BATCH_WINDOW_MS = float(os.environ.get('BATCH_WINDOW_MS', 2))
+MAX_MICRO_BATCH_SIZE = int(os.environ.get('MAX_MICRO_BATCH_SIZE', 64))
 
 # Define the input data model
 class InputData(BaseModel):
@@ -17,20 +83,296 @@ class InputData(BaseModel):
     transaction_count: int
     std_transaction_amount: float
 
+# Define the batch input data model: either a list of records or one list per feature column
+class BatchInputData(BaseModel):
+    records: Optional[List[InputData]] = None
+    columns: Optional[Dict[str, List[float]]] = None
+
+# Define the model swap request: a registry version, or the registry's current version when omitted
+class ModelSwapData(BaseModel):
+    version: Optional[str] = None
+    promote: bool = False
+
+# Define the live transaction data model for scoring a known customer
+class TransactionData(BaseModel):
+    Amount: float
+    Value: float
+
+def get_feature_store():
+    # Open the store on first use so the API can start without one
+    global feature_store
+    if feature_store is None:
+        feature_store = FeatureStore(FEATURE_STORE_PATH, read_only=True)
+    return feature_store
+
+def load_model(version=None):
+    # Returns the model, its metadata, its preprocessor and its WoE bins (None when the model was saved without them)
+    if MODEL_REGISTRY_DIR is not None:
+        registry = ModelRegistry(MODEL_REGISTRY_DIR)
+        loaded, info = registry.load(MODEL_NAME, version, mmap_mode=MODEL_MMAP_MODE, backend=MODEL_BACKEND)
+        return loaded, info, registry.load_preprocessor(MODEL_NAME, info['version']), registry.load_woe_binning(MODEL_NAME, info['version'])
+    if version is not None:
+        raise ValueError("Model versions need MODEL_REGISTRY_DIR")
+    loaded_preprocessor = Preprocessor.load(PREPROCESSOR_PATH) if os.path.exists(PREPROCESSOR_PATH) else None
+    loaded_woe_binning = WoEBinning.load(WOE_BINNING_PATH) if os.path.exists(WOE_BINNING_PATH) else None
+    if MODEL_BACKEND == 'compiled':
+        model_dir = os.environ.get('COMPILED_MODEL_DIR', 'random_forest_model_compiled')
+        return CompiledForest.load(model_dir, mmap_mode=MODEL_MMAP_MODE), {'path': model_dir}, loaded_preprocessor, loaded_woe_binning
+    return joblib.load(MODEL_PATH, mmap_mode=MODEL_MMAP_MODE), {'path': MODEL_PATH}, loaded_preprocessor, loaded_woe_binning
+
+def get_model():
+    # Load lazily so startup doesn't block on unpickling
+    global model, model_info, preprocessor, woe_binning
+    if model is None:
+        with model_lock:
+            if model is None:
+                loaded, model_info, preprocessor, woe_binning = load_model(MODEL_VERSION)
+                model = loaded
+    elif MODEL_REFRESH_SECONDS > 0 and MODEL_REGISTRY_DIR is not None and MODEL_VERSION is None:
+        refresh_promoted_model()
+    return model
+
+def refresh_promoted_model():
+    # Workers don't share memory, so a version promoted through one worker reaches the others here
+    global promoted_version, promoted_checked_at
+    now = time.monotonic()
+    if now - promoted_checked_at < MODEL_REFRESH_SECONDS:
+        return
+    promoted_checked_at = now
+    if promoted_version is None:
+        promoted_version = model_info.get('version')
+
+    # A version that can't be loaded (e.g. promoted without compiled/ under MODEL_BACKEND=compiled) must not fail
+    # the request that happened to trigger the check: keep serving the current model and try again next time
+    try:
+        version = ModelRegistry(MODEL_REGISTRY_DIR).current_version(MODEL_NAME)
+        if version != promoted_version:
+            swap_model(version)
+            promoted_version = version
+    except Exception as e:
+        print(f"Error loading promoted model version, still serving {model_info.get('version')}: {e}")
+
+def swap_model(version=None):
+    # Load the new version completely before publishing it; requests already scoring keep the old reference
+    global model, model_info, preprocessor, woe_binning
+    new_model, new_info, new_preprocessor, new_woe_binning = load_model(version)
+    with model_lock:
+        model, model_info, preprocessor, woe_binning = new_model, new_info, new_preprocessor, new_woe_binning
+    return new_info
+
+def serving_state():
+    # The model and the preprocessor and WoE bins it was trained with, read together so a swap can't pair them wrongly
+    get_model()
+    with model_lock:
+        return model, preprocessor, woe_binning
+
+def check_admin_token(token):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    if not hmac.compare_digest(token or '', ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+def batch_to_matrix(batch):
+    if (batch.records is None) == (batch.columns is None):
+        raise HTTPException(status_code=422, detail="Provide exactly one of 'records' or 'columns'")
+
+    if batch.records is not None:
+        n_rows = len(batch.records)
+    else:
+        missing = [col for col in FEATURE_COLUMNS if col not in batch.columns]
+        if missing:
+            raise HTTPException(status_code=422, detail=f"Missing feature columns: {missing}")
+        lengths = {len(batch.columns[col]) for col in FEATURE_COLUMNS}
+        if len(lengths) != 1:
+            raise HTTPException(status_code=422, detail="All feature columns must have the same length")
+        n_rows = lengths.pop()
+
+    if n_rows == 0:
+        raise HTTPException(status_code=422, detail="Batch is empty")
+    if n_rows > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch size {n_rows} exceeds the maximum of {MAX_BATCH_SIZE}")
+
+    # Build one (n_rows, n_features) float matrix in training feature order
+    if batch.records is not None:
+        return np.array([[getattr(record, col) for col in FEATURE_COLUMNS] for record in batch.records], dtype=np.float64)
+    return np.column_stack([np.asarray(batch.columns[col], dtype=np.float64) for col in FEATURE_COLUMNS])
+
+def score_matrix(matrix, current_model=None, current_preprocessor=None, current_woe_binning=None):
+    # Take one reference to the model so a concurrent swap can't change it mid-batch
+    if current_model is None:
+        current_model, current_preprocessor, current_woe_binning = serving_state()
+
+    # Apply the training-time scaling: one multiply-add per feature column
+    if current_preprocessor is not None:
+        matrix = current_preprocessor.transform_matrix(matrix, FEATURE_COLUMNS)
+
+    # Map the values to the WoE values the model was trained on; the transform is a binary search per feature column
+    if current_woe_binning is not None:
+        matrix = current_woe_binning.transform_matrix(matrix, FEATURE_COLUMNS)
+
+    # Models fitted on a DataFrame check feature names, so wrap the matrix without copying it
+    features = matrix
+    if hasattr(current_model, 'feature_names_in_'):
+        features = pd.DataFrame(matrix, columns=FEATURE_COLUMNS, copy=False)
+
+    # A single predict_proba call; the predicted class is the most probable one
+    probabilities = current_model.predict_proba(features)
+    predictions = current_model.classes_[np.argmax(probabilities, axis=1)]
+    return predictions, probabilities
+
+# Per-route request timings, in the same event format as the instrumented scripts/ classes
+request_metrics = add_sink(SummarySink())
+
+class RequestTimingMiddleware:
+    # Plain ASGI middleware: times each request and emits one event per route; endpoints set request.state.rows
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        response = {'status': 500}
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            await send(message)
+
+        started_at, start = time.time(), time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The route template, so /predict/customer/{customer_id} is one series
+            route = getattr(scope.get('route'), 'path', scope['path'])
+            rows = scope.get('state', {}).get('rows')
+            emit({
+                'event': 'request',
+                'component': 'api',
+                'method': f"{scope['method']} {route}",
+                'started_at': started_at,
+                'wall_seconds': time.perf_counter() - start,
+                # Requests interleave on the event loop, so per-request CPU time isn't measurable
+                'cpu_seconds': None,
+                'rows_in': rows,
+                'rows_out': rows,
+                'peak_memory_delta_mb': None,
+                'status': 'ok' if response['status'] < 400 else 'error',
+                'error': None if response['status'] < 400 else f"HTTP {response['status']}",
+                'status_code': response['status'],
+                'depth': 0,
+                'pid': os.getpid()
+            })
+
+batcher = MicroBatcher(score_matrix, max_batch_size=MAX_MICRO_BATCH_SIZE, max_wait_ms=BATCH_WINDOW_MS)
+
+@asynccontextmanager
+async def lifespan(app):
+    # Run the micro-batcher for the lifetime of the server
+    if MODEL_PRELOAD:
+        await run_in_threadpool(get_model)
+    await batcher.start()
+    yield
+    await batcher.stop()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestTimingMiddleware)
+
 # Define API endpoint for predictions
 @app.post('/predict')
-async def predict(input_data: InputData):
-    # Convert input data to DataFrame
-    input_df = pd.DataFrame([input_data.dict()])
+async def predict(input_data: InputData, request: Request):
+    # Rows scored, for the request metrics
+    request.state.rows = 1
+
+    # Convert input data to a feature row
+    row = np.array([getattr(input_data, col) for col in FEATURE_COLUMNS], dtype=np.float64)
     
-    # Make predictions using the loaded model
-    predictions = model.predict(input_df)
+    # Queue the row; it is scored together with other concurrent requests
+    predictions, _ = await batcher.submit(row)
     
     # Format the predictions as a response
     response = {'predictions': predictions.tolist()}
     
     return response
 
+# Define API endpoint for batch predictions
+@app.post('/predict/batch')
+async def predict_batch(batch: BatchInputData, request: Request):
+    # Validate the whole batch and stack it into a single matrix
+    matrix = batch_to_matrix(batch)
+    request.state.rows = len(matrix)
+
+    # Score every row with one vectorized model call, off the event loop
+    current_model, current_preprocessor, current_woe_binning = await run_in_threadpool(serving_state)
+    predictions, probabilities = await run_in_threadpool(score_matrix, matrix, current_model, current_preprocessor, current_woe_binning)
+
+    # Results are returned in input order
+    response = {
+        'classes': current_model.classes_.tolist(),
+        'predictions': predictions.tolist(),
+        'probabilities': probabilities.tolist()
+    }
+
+    return response
+
+# Define API endpoint for predictions from stored customer features
+@app.post('/predict/customer/{customer_id}')
+async def predict_customer(customer_id: str, transaction: TransactionData, request: Request):
+    request.state.rows = 1
+
+    # Look up the precomputed aggregates with one primary-key probe; a missing or unreadable store is a server-side outage
+    try:
+        features = get_feature_store().get_features(customer_id)
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=503, detail=f"Feature store unavailable: {e}")
+    if features is None:
+        raise HTTPException(status_code=404, detail=f"Customer {customer_id} not found in the feature store")
+
+    # Customers with a single transaction have no standard deviation; treat their spread as zero
+    if np.isnan(features['std_transaction_amount']):
+        features['std_transaction_amount'] = 0.0
+
+    # Join the live transaction with the stored aggregates and score through the micro-batcher
+    features.update(transaction.dict())
+    row = np.array([features[col] for col in FEATURE_COLUMNS], dtype=np.float64)
+    predictions, _ = await batcher.submit(row)
+
+    response = {'CustomerId': customer_id, 'predictions': predictions.tolist()}
+
+    return response
+
+# Define API endpoint for micro-batcher and per-route request metrics
+@app.get('/metrics')
+async def metrics():
+    return {'batcher': batcher.metrics(), 'requests': request_metrics.summary('api')}
+
+# Define admin endpoints for inspecting and hot-swapping the served model
+@app.get('/admin/model')
+async def model_status(x_admin_token: Optional[str] = Header(None)):
+    check_admin_token(x_admin_token)
+    await run_in_threadpool(get_model)
+    response = {'model': model_info}
+    if MODEL_REGISTRY_DIR is not None:
+        response['versions'] = ModelRegistry(MODEL_REGISTRY_DIR).versions(MODEL_NAME)
+    return response
+
+@app.post('/admin/model')
+async def swap_model_version(swap: ModelSwapData, x_admin_token: Optional[str] = Header(None)):
+    check_admin_token(x_admin_token)
+    if swap.promote and MODEL_REGISTRY_DIR is None:
+        raise HTTPException(status_code=422, detail="Promoting a version needs MODEL_REGISTRY_DIR")
+
+    # Loading happens off the event loop; in-flight requests finish on the model they started with
+    try:
+        info = await run_in_threadpool(swap_model, swap.version)
+    except (KeyError, FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=404, detail=f"Cannot load model: {e}")
+
+    # Promoting makes the version the one new workers and restarts load
+    if swap.promote:
+        ModelRegistry(MODEL_REGISTRY_DIR).promote(MODEL_NAME, info['version'])
+    return {'model': info}
+
 if __name__ == '__main__':
     import uvicorn
     uvicorn.run(app, host='127.0.0.1', port=8001)
\ No newline at end of file
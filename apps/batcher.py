@@ -0,0 +1,137 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+import numpy as np
+
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=2.0):
+        # predict_fn takes an (n_rows, n_features) matrix and returns (predictions, probabilities)
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.queue = None
+        self.executor = None
+        self.worker = None
+
+        # The batch being scored, so stop() can fail its requests too
+        self.in_flight = []
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.batch_count = 0
+        self.request_count = 0
+        self.error_count = 0
+        self.fill_rate_total = 0.0
+        self.max_queue_depth = 0
+        self.scoring_seconds = 0.0
+
+    async def start(self):
+        # The queue and the worker task must be created on the serving event loop
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='micro-batcher')
+        self.worker = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+
+        # Fail any request that was being scored or still waiting for a batch
+        pending = self.in_flight
+        while self.queue is not None and not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped before the request was scored"))
+        self.in_flight = []
+
+        # Wait for the scoring thread off the event loop, so other tasks keep running while it finishes
+        if self.executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown, True)
+            self.executor = None
+
+    async def submit(self, row):
+        if self.worker is None:
+            raise RuntimeError("Micro-batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((row, future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def collect_batch(self):
+        loop = asyncio.get_running_loop()
+
+        # Block until the first request arrives, then keep collecting until the window closes or the batch is full;
+        # collected requests count as in flight, so a stop() while collecting fails them too
+        batch = self.in_flight = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.collect_batch()
+
+            # Drop requests whose callers have already gone away
+            batch = [(row, future) for row, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            self.in_flight = batch
+            start = time.perf_counter()
+            try:
+                # A malformed row fails its own batch, not the worker
+                matrix = np.vstack([row for row, _ in batch])
+
+                # Score the whole batch in the worker thread so the event loop stays free
+                predictions, probabilities = await loop.run_in_executor(self.executor, self.predict_fn, matrix)
+            except Exception as e:
+                self.error_count += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self.in_flight = []
+                continue
+            finally:
+                self.scoring_seconds += time.perf_counter() - start
+            self.in_flight = []
+
+            self.batch_count += 1
+            self.request_count += len(batch)
+            self.fill_rate_total += len(batch) / self.max_batch_size
+
+            # Fan the results back out to the waiting requests, in submission order
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result((predictions[i:i + 1], probabilities[i:i + 1]))
+
+    def metrics(self):
+        batches = max(self.batch_count, 1)
+        return {
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'max_queue_depth': self.max_queue_depth,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms,
+            'batches': self.batch_count,
+            'requests': self.request_count,
+            'errors': self.error_count,
+            'mean_batch_size': self.request_count / batches,
+            'mean_fill_rate': self.fill_rate_total / batches,
+            'mean_scoring_ms': 1000 * self.scoring_seconds / batches
+        }
\ No newline at end of file
@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+import httpx
+import numpy as np
+
+# Add the path to the scripts directory
+APPS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(APPS_DIR, '..', 'scripts'))
+
+from process_memory import child_pids
+
+FEATURES = ['Amount', 'Value', 'total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']
+
+# Metrics compared between runs, and whether a higher value is better
+COMPARED_METRICS = {'qps': True, 'p50_ms': False, 'p95_ms': False, 'p99_ms': False, 'cpu_ms_per_request': False}
+
+def parse_mix(spec):
+    # 'single:0.8,batch:0.2' -> {'single': 0.8, 'batch': 0.2}, normalised to sum to one
+    mix = {}
+    for part in spec.split(','):
+        kind, _, weight = part.partition(':')
+        if kind not in ('single', 'batch', 'columns'):
+            raise ValueError(f"Unknown request kind '{kind}'")
+        mix[kind] = float(weight or 1)
+    total = sum(mix.values())
+    return {kind: weight / total for kind, weight in mix.items()}
+
+def random_records(rng, n):
+    # Feature values in the ranges of the Xente data, after scaling
+    values = rng.random((n, len(FEATURES)))
+    values[:, FEATURES.index('transaction_count')] = rng.integers(1, 50, n)
+    return [dict(zip(FEATURES, row)) for row in values.tolist()]
+
+def make_request(kind, rng, batch_size):
+    # (path, JSON body, rows scored) for one request of the given kind
+    if kind == 'single':
+        return '/predict', random_records(rng, 1)[0], 1
+    records = random_records(rng, batch_size)
+    if kind == 'batch':
+        return '/predict/batch', {'records': records}, batch_size
+    return '/predict/batch', {'columns': {col: [record[col] for record in records] for col in FEATURES}}, batch_size
+
+def cpu_seconds(pids):
+    # User plus system CPU of the given processes, from /proc/<pid>/stat
+    ticks = os.sysconf('SC_CLK_TCK')
+    total = 0.0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / ticks
+        except OSError:
+            continue
+    return total
+
+def latency_summary(latencies, errors, rows, elapsed, cpu):
+    latencies = np.asarray(latencies) * 1000
+    n = len(latencies)
+    if n == 0:
+        return {'requests': 0, 'errors': errors}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'requests': n,
+        'errors': errors,
+        'qps': n / elapsed,
+        'rows_per_second': rows / elapsed,
+        'mean_ms': float(latencies.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(latencies.max()),
+        'cpu_ms_per_request': cpu * 1000 / n if cpu is not None else None
+    }
+
+async def drive(client, mix, concurrency, batch_size, n_requests, duration, seed):
+    # Closed loop: each of `concurrency` clients sends its next request as soon as the previous one returns
+    kinds, weights = list(mix), list(mix.values())
+    samples = {kind: {'latencies': [], 'errors': 0, 'rows': 0} for kind in kinds}
+    issued = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def client_loop(client_id):
+        nonlocal issued
+        rng = np.random.default_rng(seed + client_id)
+        while True:
+            if n_requests is not None and issued >= n_requests:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            issued += 1
+            kind = kinds[rng.choice(len(kinds), p=weights)]
+            path, body, rows = make_request(kind, rng, batch_size)
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=body)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                samples[kind]['latencies'].append(time.perf_counter() - start)
+                samples[kind]['rows'] += rows
+            else:
+                samples[kind]['errors'] += 1
+
+    await asyncio.gather(*[client_loop(i) for i in range(concurrency)])
+    return samples
+
+def summarize_run(samples, elapsed, cpu):
+    # Overall figures plus one block per request kind; CPU is only measurable for the run as a whole
+    results = {'overall': latency_summary(
+        [latency for s in samples.values() for latency in s['latencies']],
+        sum(s['errors'] for s in samples.values()),
+        sum(s['rows'] for s in samples.values()),
+        elapsed, cpu)}
+    for kind, s in samples.items():
+        results[kind] = latency_summary(s['latencies'], s['errors'], s['rows'], elapsed, None)
+    return results
+
+async def run_in_process(mix, concurrency, batch_size, n_requests, duration, warmup, seed):
+    # Drive the ASGI app directly: no sockets, and the CPU measured is this process's (server plus client)
+    sys.path.insert(0, APPS_DIR)
+    import api
+    async with api.lifespan(api.app):
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+            if warmup:
+                await drive(client, mix, concurrency, batch_size, warmup, None, seed + 10000)
+            cpu_start, start = time.process_time(), time.perf_counter()
+            samples = await drive(client, mix, concurrency, batch_size, n_requests, duration, seed)
+            elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+            model = api.model_info
+    return samples, elapsed, cpu, model
+
+async def run_against_server(url, server_pids, mix, concurrency, batch_size, n_requests, duration, warmup, seed):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        if warmup:
+            await drive(client, mix, concurrency, batch_size, warmup, None, seed + 10000)
+
+        # Server CPU only, summed over the given processes and their children (uvicorn workers)
+        pids = sorted(set(server_pids) | {child for pid in server_pids for child in child_pids(pid)})
+        cpu_start, start = (cpu_seconds(pids) if pids else None), time.perf_counter()
+        samples = await drive(client, mix, concurrency, batch_size, n_requests, duration, seed)
+        elapsed = time.perf_counter() - start
+        cpu = cpu_seconds(pids) - cpu_start if pids else None
+        try:
+            # The admin endpoints only answer when the server has ADMIN_TOKEN set; otherwise no model info is reported
+            headers = {'X-Admin-Token': os.environ.get('ADMIN_TOKEN', '')}
+            model = (await client.get('/admin/model', headers=headers)).json().get('model', {})
+        except (httpx.HTTPError, ValueError):
+            model = {}
+    return samples, elapsed, cpu, model
+
+def launch_server(workers, port, extra_args):
+    command = [sys.executable, os.path.join(APPS_DIR, 'serve.py'), '--workers', str(workers), '--port', str(port)] + extra_args
+    launcher = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/metrics', timeout=1).status_code == 200:
+                return launcher
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    launcher.kill()
+    raise TimeoutError(f"Server on port {port} did not become ready")
+
+def compare_results(baseline, current, tolerance=0.1):
+    # Relative change per metric; a regression is a change in the bad direction beyond the tolerance
+    rows = []
+    for kind, metrics in current['results'].items():
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before = baseline['results'].get(kind, {}).get(metric)
+            after = metrics.get(metric)
+            if before is None or after is None or before == 0:
+                continue
+            change = (after - before) / before
+            regression = change < -tolerance if higher_is_better else change > tolerance
+            rows.append({'kind': kind, 'metric': metric, 'baseline': before, 'current': after, 'change': change, 'regression': regression})
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the scoring API and report throughput, tail latency and CPU per request.')
+    parser.add_argument('--mode', choices=['in-process', 'server'], default='in-process')
+    parser.add_argument('--url', default='http://127.0.0.1:8001', help='server to drive in server mode')
+    parser.add_argument('--server-pid', type=int, nargs='*', default=[], help='server processes to measure CPU for in server mode')
+    parser.add_argument('--launch-workers', type=int, default=None, help='start apps/serve.py with this many workers in server mode')
+    parser.add_argument('--serve-args', nargs=argparse.REMAINDER, default=[], help='extra arguments for apps/serve.py')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--mix', default='single:0.9,batch:0.1', help='request kinds and weights: single, batch, columns')
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=None, help='stop after this many requests')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to run when --requests is not given')
+    parser.add_argument('--warmup', type=int, default=100, help='requests sent before measuring')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='write the results as JSON')
+    parser.add_argument('--compare', default=None, help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='relative change that counts as a regression')
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    duration = None if args.requests is not None else args.duration
+    launcher = None
+    if args.mode == 'in-process':
+        samples, elapsed, cpu, model = asyncio.run(run_in_process(mix, args.concurrency, args.batch_size, args.requests, duration, args.warmup, args.seed))
+    else:
+        server_pids, url = list(args.server_pid), args.url
+        if args.launch_workers is not None:
+            port = int(url.rsplit(':', 1)[1])
+            launcher = launch_server(args.launch_workers, port, args.serve_args)
+            server_pids.append(launcher.pid)
+        try:
+            samples, elapsed, cpu, model = asyncio.run(run_against_server(url, server_pids, mix, args.concurrency, args.batch_size, args.requests, duration, args.warmup, args.seed))
+        finally:
+            if launcher is not None:
+                launcher.send_signal(signal.SIGINT)
+                launcher.wait(timeout=30)
+
+    report = {
+        'config': {
+            'mode': args.mode,
+            'url': args.url if args.mode == 'server' else None,
+            'workers': args.launch_workers,
+            'concurrency': args.concurrency,
+            'mix': mix,
+            'batch_size': args.batch_size,
+            'elapsed_seconds': elapsed,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'model': model
+        },
+        'results': summarize_run(samples, elapsed, cpu)
+    }
+
+    print("### API Benchmark ###")
+    for kind, result in report['results'].items():
+        if result['requests']:
+            cpu_text = f", CPU {result['cpu_ms_per_request']:.2f} ms/request" if result['cpu_ms_per_request'] is not None else ''
+            print(f"{kind:>8}: {result['requests']} requests, {result['errors']} errors, {result['qps']:.1f} QPS, "
+                  f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms{cpu_text}")
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Results saved to {args.output}")
+
+    # Exit non-zero on a regression so CI can gate on it
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        comparison = compare_results(baseline, report, args.tolerance)
+        for row in comparison:
+            flag = 'REGRESSION' if row['regression'] else 'ok'
+            print(f"{row['kind']:>8} {row['metric']:>18}: {row['baseline']:.2f} -> {row['current']:.2f} ({row['change']:+.1%}) {flag}")
+        if any(row['regression'] for row in comparison):
+            sys.exit(1)
+    return report
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
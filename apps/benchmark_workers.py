@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import pandas as pd
+import requests
+
+# Add the path to the scripts directory
+APPS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(APPS_DIR, '..', 'scripts'))
+
+from process_memory import child_pids, process_command, process_memory
+
+# Serving modes compared: launcher arguments for each
+MODES = {
+    'sklearn': ['--backend', 'sklearn', '--no-mmap'],
+    'compiled': ['--backend', 'compiled', '--no-mmap'],
+    'compiled-mmap': ['--backend', 'compiled']
+}
+
+SAMPLE_RECORD = {
+    'Amount': 100,
+    'Value': 200,
+    'total_transaction_amount': 300,
+    'average_transaction_amount': 50,
+    'transaction_count': 6,
+    'std_transaction_amount': 20
+}
+
+def wait_until_ready(base_url, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f'{base_url}/metrics', timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"Server at {base_url} did not become ready within {timeout}s")
+
+def worker_pids(launcher_pid, workers, timeout=60):
+    # uvicorn's supervisor is the launcher itself; its workers are spawned children (the resource tracker is not one)
+    deadline = time.monotonic() + timeout
+    while True:
+        pids = [pid for pid in child_pids(launcher_pid) if 'resource_tracker' not in process_command(pid)]
+        if len(pids) >= workers or time.monotonic() > deadline:
+            return pids
+        time.sleep(0.5)
+
+def measure_mode(mode, workers, port, model, warmup_requests, settle_seconds):
+    command = [sys.executable, os.path.join(APPS_DIR, 'serve.py'), '--workers', str(workers), '--port', str(port), '--model', model] + MODES[mode]
+    launcher = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_ready(base_url)
+        pids = worker_pids(launcher.pid, workers)
+
+        # Score enough requests that every worker has touched the model's pages, then let memory settle
+        with requests.Session() as session:
+            for _ in range(warmup_requests * workers):
+                session.post(f'{base_url}/predict', json=SAMPLE_RECORD)
+        time.sleep(settle_seconds)
+
+        rows = [{'mode': mode, 'pid': pid, **process_memory(pid)} for pid in pids]
+    finally:
+        # uvicorn shuts its workers down gracefully on SIGINT
+        launcher.send_signal(signal.SIGINT)
+        try:
+            launcher.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            launcher.kill()
+    return rows
+
+def summarize(per_worker):
+    summary = per_worker.groupby('mode', sort=False).agg(
+        workers=('pid', 'count'),
+        rss_per_worker_mb=('rss_mb', 'mean'),
+        pss_per_worker_mb=('pss_mb', 'mean'),
+        anon_per_worker_mb=('anon_mb', 'mean'),
+        total_rss_mb=('rss_mb', 'sum'),
+        total_pss_mb=('pss_mb', 'sum')
+    )
+    return summary.reset_index()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure per-worker memory of the multi-worker API for each model backend.')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8011)
+    parser.add_argument('--model', default=os.path.join(APPS_DIR, 'random_forest_model.pkl'))
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--warmup-requests', type=int, default=50, help='requests per worker before measuring')
+    parser.add_argument('--settle-seconds', type=float, default=1.0)
+    parser.add_argument('--output', default=None, help='write the per-worker measurements as JSON')
+    args = parser.parse_args(argv)
+
+    rows = []
+    for mode in args.modes:
+        print(f"Measuring {mode} with {args.workers} workers...")
+        rows.extend(measure_mode(mode, args.workers, args.port, args.model, args.warmup_requests, args.settle_seconds))
+    per_worker = pd.DataFrame(rows)
+
+    # PSS divides shared pages between the workers mapping them, so its total is the real footprint
+    summary = summarize(per_worker)
+    print("### Per-Worker Memory ###")
+    print(summary.to_string(index=False, float_format='%.1f'))
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({'per_worker': per_worker.to_dict(orient='records'), 'summary': summary.to_dict(orient='records')}, f, indent=2)
+    return summary
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+import argparse
+import math
+import os
+import shutil
+import sys
+import joblib
+
+# Add the path to the scripts directory
+APPS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(APPS_DIR, '..', 'scripts'))
+
+from compiled_forest import export_forest
+from model_registry import ModelRegistry
+
+# Each worker scores on a single core; native thread pools would otherwise oversubscribe the machine
+THREAD_LIMIT_VARIABLES = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS']
+
+def available_cpus():
+    # CPUs this process may run on, capped by a cgroup v2 CPU quota when running in a container
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+def worker_count(requested=None):
+    # One worker per available core unless a count is given
+    return requested if requested else available_cpus()
+
+def export_if_stale(model_path, compiled_dir):
+    # Export once, in the launcher, so every worker maps the same files
+    metadata_path = os.path.join(compiled_dir, 'metadata.json')
+    if os.path.exists(metadata_path) and os.path.getmtime(metadata_path) >= os.path.getmtime(model_path):
+        return compiled_dir
+
+    # Export next to the target and rename, so a worker never maps a half-written directory
+    staging_dir = f'{compiled_dir}.{os.getpid()}.tmp'
+    export_forest(joblib.load(model_path), staging_dir)
+    if os.path.exists(compiled_dir):
+        shutil.rmtree(compiled_dir)
+    os.rename(staging_dir, compiled_dir)
+    print(f"Compiled model exported to {compiled_dir}")
+    return compiled_dir
+
+def prepare_model(model_path, compiled_dir, registry_dir=None, name='random_forest'):
+    if registry_dir is not None:
+        # Registered versions are never modified: one without a compiled export becomes a new, compiled version
+        registry = ModelRegistry(registry_dir)
+        version = registry.register_compiled(name)
+        print(f"Serving compiled model {name} {version}")
+        return os.path.join(registry.version_dir(name, version), 'compiled')
+    return export_if_stale(model_path, compiled_dir)
+
+def serving_environment(backend='compiled', mmap=True, model_path=None, compiled_dir=None, registry_dir=None, name='random_forest', refresh_seconds=5):
+    env = {variable: '1' for variable in THREAD_LIMIT_VARIABLES}
+    env.update({'MODEL_BACKEND': backend, 'MODEL_PRELOAD': '1', 'MODEL_MMAP_MODE': 'r' if mmap else ''})
+    if registry_dir is not None:
+        # Workers pick up a version promoted through any one of them
+        env.update({'MODEL_REGISTRY_DIR': os.path.abspath(registry_dir), 'MODEL_NAME': name, 'MODEL_REFRESH_SECONDS': str(refresh_seconds)})
+    else:
+        if model_path is not None:
+            env['MODEL_PATH'] = os.path.abspath(model_path)
+        if compiled_dir is not None:
+            env['COMPILED_MODEL_DIR'] = os.path.abspath(compiled_dir)
+    return env
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the credit scoring API with several workers sharing one memory-mapped model.')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default: available cores)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--backend', choices=['compiled', 'sklearn'], default='compiled')
+    parser.add_argument('--no-mmap', action='store_true', help='load a private copy of the model in every worker')
+    parser.add_argument('--model', default='random_forest_model.pkl')
+    parser.add_argument('--compiled-dir', default=None, help='where to export the compiled model (default: next to --model)')
+    parser.add_argument('--registry-dir', default=None)
+    parser.add_argument('--model-name', default='random_forest')
+    args = parser.parse_args(argv)
+
+    compiled_dir = args.compiled_dir or f'{os.path.splitext(args.model)[0]}_compiled'
+    if args.backend == 'compiled':
+        compiled_dir = prepare_model(args.model, compiled_dir, args.registry_dir, args.model_name)
+    env = serving_environment(args.backend, not args.no_mmap, args.model, compiled_dir, args.registry_dir, args.model_name)
+    os.environ.update(env)
+
+    # api.py resolves the scripts directory and default model files relative to apps/
+    os.chdir(APPS_DIR)
+    workers = worker_count(args.workers)
+    print(f"Starting {workers} workers with the {args.backend} backend{'' if args.no_mmap else ' (memory-mapped)'}.")
+
+    import uvicorn
+    uvicorn.run('api:app', host=args.host, port=args.port, workers=workers)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
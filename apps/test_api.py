@@ -1,3 +1,4 @@
+import os
 import requests
 
 # Define the API endpoint
@@ -17,4 +18,31 @@ input_data = {
 response = requests.post(url, json=input_data)
 
 # Print the response
+print(response.json())
+
+# Define the batch API endpoint
+batch_url = 'http://127.0.0.1:8001/predict/batch'
+
+# Send the same record twice as a list of records
+response = requests.post(batch_url, json={'records': [input_data, input_data]})
+print(response.json())
+
+# Send the same records in columnar form, one list per feature
+columns = {feature: [value, value] for feature, value in input_data.items()}
+response = requests.post(batch_url, json={'columns': columns})
+print(response.json())
+
+# Score a customer known to the feature store from the live transaction only
+customer_url = 'http://127.0.0.1:8001/predict/customer/CustomerId_4406'
+response = requests.post(customer_url, json={'Amount': 100, 'Value': 100})
+print(response.json())
+
+# Show the served model version; the admin endpoints need ADMIN_TOKEN set on the server and sent as X-Admin-Token
+admin_url = 'http://127.0.0.1:8001/admin/model'
+admin_headers = {'X-Admin-Token': os.environ.get('ADMIN_TOKEN', '')}
+response = requests.get(admin_url, headers=admin_headers)
+print(response.json())
+
+# Reload the registry's current version without restarting the server
+response = requests.post(admin_url, json={}, headers=admin_headers)
 print(response.json())
\ No newline at end of file
@@ -2,26 +2,53 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from dtype_planner import numeric_columns, optimize_dtypes
+from instrumentation import instrument_class, report_error
+from plot_report import build_report, eda_sections
+from streaming_stats import profile_file
 
+@instrument_class
 class EDA:
-    def __init__(self, df):
+    def __init__(self, df=None, compact_dtypes=False, data_path=None, chunksize=100000, n_jobs=1):
         self.df = df
+        self.dtype_plan = None
+        self.profile = None
+
+        # Out-of-core mode: profile the file chunk by chunk, optionally over n_jobs processes, and keep only
+        # the merged statistics (moments, quantile sketches, distinct counts, covariance)
+        if data_path is not None:
+            self.profile = profile_file(data_path, chunksize, n_jobs=n_jobs)
+            return
+
+        # Optionally convert to categoricals, integer ID codes and narrower numerics before profiling
+        if compact_dtypes:
+            self.df, report = optimize_dtypes(df)
+            self.dtype_plan = report['plan']
 
     def overview_of_data(self):
         try:
+            if self.profile is not None:
+                shape, dtypes, missing_values = (self.profile.rows, len(self.profile.columns)), self.profile.dtypes, self.profile.missing_values()
+            else:
+                shape, dtypes, missing_values = self.df.shape, self.df.dtypes, self.df.isnull().sum()
             print("### Overview of Data ###")
-            print(f"Number of Rows: {self.df.shape[0]}")
-            print(f"Number of Columns: {self.df.shape[1]}")
-            print("\nData Types:\n", self.df.dtypes)
-            print("\nMissing Values:\n", self.df.isnull().sum())
-            return self.df.shape, self.df.dtypes, self.df.isnull().sum()
+            print(f"Number of Rows: {shape[0]}")
+            print(f"Number of Columns: {shape[1]}")
+            print("\nData Types:\n", dtypes)
+            print("\nMissing Values:\n", missing_values)
+            return shape, dtypes, missing_values
         except Exception as e:
-            print(f"An error occurred: {e}")
+            report_error("An error occurred", e)
 
     def summary_statistics(self):
         try:
-            numerical_summary = self.df.describe(include=['float64', 'int64'])
-            categorical_summary = self.df.describe(include=['object'])
+            if self.profile is not None:
+                # Quantiles come from the sketches; top and freq only for columns with exact counts
+                numerical_summary = self.profile.numerical_summary()
+                categorical_summary = self.profile.categorical_summary()
+            else:
+                numerical_summary = self.df[numeric_columns(self.df, self.dtype_plan)].describe()
+                categorical_summary = self.df.describe(include=['object', 'category'])
 
             print("### Summary Statistics for Numerical Data ###")
             print(numerical_summary)
@@ -31,28 +58,37 @@ class EDA:
 
             return numerical_summary, categorical_summary
         except Exception as e:
-            print(f"An error occurred: {e}")
+            report_error("An error occurred", e)
 
     def count_unique_values(self):
         try:
-            unique_counts = {col: self.df[col].nunique() for col in self.df.columns}
+            if self.profile is not None:
+                # Exact for low-cardinality columns, HyperLogLog estimates otherwise
+                unique_counts = self.profile.distinct_counts()
+            else:
+                unique_counts = {col: self.df[col].nunique() for col in self.df.columns}
             for col, count in unique_counts.items():
                 print(f"Unique values in {col}: {count}")
             return unique_counts
         except Exception as e:
-            print(f"An error occurred: {e}")
+            report_error("An error occurred", e)
 
     def find_unique_values(self, columns):
         try:
-            unique_values = {col: self.df[col].unique() for col in columns}
+            if self.profile is not None:
+                unique_values = {col: self.profile.unique_values(col) for col in columns}
+            else:
+                unique_values = {col: self.df[col].unique() for col in columns}
             for col, values in unique_values.items():
                 print(f"Unique values in {col}: {values}\n")
             return unique_values
         except Exception as e:
-            print(f"An error occurred: {e}")
+            report_error("An error occurred", e)
 
     def plot_numerical_features(self):
         try:
+            if self.profile is not None:
+                raise ValueError("Plotting distributions needs the data in memory; profile mode keeps only summary statistics")
             numerical_features = ['Amount', 'Value']
             categorical_like_numerical_features = ['CountryCode', 'PricingStrategy', 'FraudResult']
 
@@ -85,10 +121,12 @@ class EDA:
             plt.tight_layout()
             plt.show()
         except Exception as e:
-            print(f"An error occurred: {e}")
+            report_error("An error occurred", e)
 
     def plot_categorical_features(self):
         try:
+            if self.profile is not None:
+                raise ValueError("Plotting distributions needs the data in memory; profile mode keeps only summary statistics")
             categorical_features = ['CurrencyCode', 'ProviderId', 'ProductId', 'ProductCategory', 'ChannelId']
 
             fig, axs = plt.subplots(nrows=2, ncols=3, figsize=(18, 10))
@@ -110,12 +148,16 @@ class EDA:
             plt.tight_layout()
             plt.show()
         except Exception as e:
-            print(f"An error occurred: {e}")
+            report_error("An error occurred", e)
 
     def correlation_analysis(self):
         try:
-            numeric_data = self.df.select_dtypes(include=['float64', 'int64'])
-            correlation_matrix = numeric_data.corr()
+            if self.profile is not None:
+                # Pairwise-complete Pearson correlation from the merged co-moment sums
+                correlation_matrix = self.profile.correlation()
+            else:
+                numeric_data = self.df[numeric_columns(self.df, self.dtype_plan)]
+                correlation_matrix = numeric_data.corr()
             print("### Correlation Analysis ###")
             print("\nCorrelation Matrix:")
             print(correlation_matrix)
@@ -130,39 +172,44 @@ class EDA:
             
             return correlation_matrix
         except Exception as e:
-            print(f"An error occurred: {e}")
+            report_error("An error occurred", e)
 
     def identify_missing_values(self):
         try:
-            missing_values = self.df.isnull().sum()
+            missing_values = self.profile.missing_values() if self.profile is not None else self.df.isnull().sum()
             missing_values = missing_values[missing_values > 0]
             print("### Missing Values ###")
             print(missing_values)
             return missing_values
         except Exception as e:
-            print(f"An error occurred: {e}")
+            report_error("An error occurred", e)
 
     def detect_outliers_with_visualization(self):
         try:
-            numerical_cols = self.df.select_dtypes(include=['float64', 'int64']).columns
+            numerical_cols = self.profile.numeric if self.profile is not None else numeric_columns(self.df, self.dtype_plan)
             outliers_dict = {}
             
             fig, axs = plt.subplots(nrows=2, ncols=3, figsize=(18, 10), squeeze=False)
             axs = axs.flatten()
 
             for idx, col in enumerate(numerical_cols):
-                Q1 = self.df[col].quantile(0.25)
-                Q3 = self.df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers = self.df[(self.df[col] < lower_bound) | (self.df[col] > upper_bound)]
-                outliers_dict[col] = len(outliers)
-                
-                print(f"{len(outliers)} outliers detected in {col} using IQR method.")
+                if self.profile is not None:
+                    # Bounds and counts from the profile; the box is drawn from precomputed statistics
+                    outliers_dict[col] = self.profile.outliers(col)['count']
+                    axs[idx].bxp([self.profile.box_stats(col)], showfliers=False)
+                else:
+                    Q1, Q3 = self.df[col].quantile([0.25, 0.75])
+                    IQR = Q3 - Q1
+                    lower_bound = Q1 - 1.5 * IQR
+                    upper_bound = Q3 + 1.5 * IQR
+
+                    # Count in place instead of building a filtered copy of the frame
+                    values = self.df[col]
+                    outliers_dict[col] = int(((values < lower_bound) | (values > upper_bound)).sum())
+                    sns.boxplot(data=self.df, y=col, ax=axs[idx])
+
+                print(f"{outliers_dict[col]} outliers detected in {col} using IQR method.")
                 
-                sns.boxplot(data=self.df, y=col, ax=axs[idx])
                 axs[idx].set_title(f'Box Plot of {col}')
                 axs[idx].set_ylabel(col)
                 axs[idx].grid(True)
@@ -175,4 +222,14 @@ class EDA:
             
             return outliers_dict
         except Exception as e:
-            print(f"An error occurred: {e}")
\ No newline at end of file
+            report_error("An error occurred", e)
+
+    def generate_report(self, output_dir, n_jobs=None, bins=50):
+        try:
+            # Headless report: pre-aggregated figures rendered to PNG in a process pool, collected in one HTML file
+            sections = eda_sections(self.df, self.profile, self.dtype_plan, bins=bins)
+            report_path = build_report(sections, output_dir, title='Exploratory Data Analysis', n_jobs=n_jobs)
+            print(f"EDA report saved to {report_path}")
+            return report_path
+        except Exception as e:
+            report_error("An error occurred", e)
\ No newline at end of file
@@ -1,51 +1,129 @@
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder, MinMaxScaler, StandardScaler
+from aggregation import CustomerGrouping, aggregate_customers
+from feature_store import AGGREGATE_COLUMNS, FeatureStore
+from artifacts import load_artifact, save_artifact
+from data_preprocessing import Preprocessor
+from dtype_planner import optimize_dtypes
+from partitioned import run_partitioned
+from streaming import AGGREGATION_COLUMNS, stream_customer_aggregates
+from time_features import TIME_FEATURE_COLUMNS, calendar_features, epoch_nanoseconds, parse_column, rolling_window, seconds_since_previous
+from window_features import DEFAULT_WINDOWS, DISTINCT_COLUMNS, WindowFeatureEngine
+from instrumentation import instrument_class, report_error
 
+# Customer-local steps: each customer's rows give the same features whichever partition holds them
+PARTITIONED_STEPS = ['create_aggregate_features', 'extract_time_features', 'create_window_features']
+
+# The only columns those steps read, so the workers are sent nothing else
+PARTITIONED_COLUMNS = AGGREGATION_COLUMNS + DISTINCT_COLUMNS
+
+@instrument_class
 class FeatureEngineering:
-    def __init__(self, data_path):
+    def __init__(self, data_path, chunksize=None, compact_dtypes=False, columns=None, df=None):
+        # In streaming mode the file is read in chunks and only the per-customer aggregate table is kept
+        self.streaming = chunksize is not None
+
+        # Encodings and scaling fitted by label_encode and scale_numerical_features, for reuse at serve time
+        self.preprocessor = Preprocessor()
         try:
-            self.df = pd.read_csv(data_path)
+            if df is not None:
+                # An in-memory frame, e.g. one partition in a run_partitioned worker
+                self.df = df
+            elif self.streaming:
+                self.aggregator = stream_customer_aggregates(data_path, chunksize)
+                self.df = self.aggregator.aggregate_frame()
+            else:
+                self.df = load_artifact(data_path, columns=columns)
+                if compact_dtypes:
+                    # Categoricals, integer ID codes and narrower numerics; parses timestamps once
+                    self.df, self.dtype_report = optimize_dtypes(self.df)
             print("Data loaded successfully.")
         except Exception as e:
-            print(f"Error loading data: {e}")
+            report_error("Error loading data", e)
 
     def create_aggregate_features(self):
+        if self.streaming:
+            print("Aggregate features already computed while streaming.")
+            return self.df
         try:
-            agg_features = self.df.groupby('CustomerId').agg(
-                total_transaction_amount=('Amount', 'sum'),
-                average_transaction_amount=('Amount', 'mean'),
-                transaction_count=('TransactionId', 'count'),
-                std_transaction_amount=('Amount', 'std')
-            ).reset_index()
-
-            # Merge aggregate features back into the original dataframe
-            self.df = pd.merge(self.df, agg_features, on='CustomerId', how='left')
+            # Compute all per-customer aggregates in one factorized pass
+            grouping, agg_features = aggregate_customers(self.df)
+
+            # Broadcast aggregate features back onto the transactions through the customer codes
+            for col in AGGREGATE_COLUMNS:
+                self.df[col] = grouping.broadcast(agg_features[col])
             print("Aggregate features created successfully.")
         except Exception as e:
-            print(f"Error creating aggregate features: {e}")
+            report_error("Error creating aggregate features", e)
         return self.df
 
-    def extract_time_features(self):
+    def extract_time_features(self, since_previous=False, windows=()):
         try:
-            self.df['TransactionStartTime'] = pd.to_datetime(self.df['TransactionStartTime'])
-            self.df['transaction_hour'] = self.df['TransactionStartTime'].dt.hour
-            self.df['transaction_day'] = self.df['TransactionStartTime'].dt.day
-            self.df['transaction_month'] = self.df['TransactionStartTime'].dt.month
-            self.df['transaction_year'] = self.df['TransactionStartTime'].dt.year
+            # Parse once, with the fast path for the known format, and keep the parsed column for later stages
+            times = parse_column(self.df)
+
+            # Hour, day, month, year and weekday in integer arithmetic on the epoch nanoseconds
+            calendar = calendar_features(times)
+            for col in TIME_FEATURE_COLUMNS:
+                self.df[col] = calendar[col].to_numpy()
+
+            # Optional per-customer history: the gap to the previous transaction and trailing-window counts and sums
+            if since_previous or windows:
+                codes, ns = CustomerGrouping(self.df['CustomerId']).codes, epoch_nanoseconds(times)
+                if since_previous:
+                    self.df['seconds_since_previous'] = seconds_since_previous(codes, ns)
+                for window in windows:
+                    counts, sums = rolling_window(codes, ns, window, self.df['Amount'])
+                    self.df[f'transaction_count_{window}'] = counts
+                    self.df[f'transaction_amount_{window}'] = sums
             print("Time features extracted successfully.")
         except Exception as e:
-            print(f"Error extracting time features: {e}")
+            report_error("Error extracting time features", e)
+        return self.df
+
+    def create_window_features(self, windows=DEFAULT_WINDOWS, point_in_time=False):
+        if self.streaming:
+            print("Window features need the transactions, which streaming mode does not keep.")
+            return self.df
+        try:
+            # Sort once by (CustomerId, TransactionStartTime); every window is then binary searches and prefix-sum differences
+            self.window_engine = WindowFeatureEngine(self.df, windows)
+
+            # point_in_time: each transaction only sees strictly earlier ones, so features never leak its own outcome
+            features = self.window_engine.row_features(include_current=not point_in_time)
+            for col in features.columns:
+                self.df[col] = features[col].to_numpy()
+            print("Window features created successfully.")
+        except Exception as e:
+            report_error("Error creating window features", e)
+        return self.df
+
+    def run_partitioned(self, steps=PARTITIONED_STEPS, n_workers=None, n_partitions=None):
+        if self.streaming:
+            print("Partitioned runs need the transactions, which streaming mode does not keep.")
+            return self.df
+        try:
+            # Steps are method names or (method, kwargs) pairs; only customer-local ones can run per partition
+            steps = [(step, {}) if isinstance(step, str) else tuple(step) for step in steps]
+            unsupported = [method for method, _ in steps if method not in PARTITIONED_STEPS]
+            if unsupported:
+                raise ValueError(f"Steps {unsupported} are not customer-local; run them on the whole frame")
+
+            # Hash-partitioned by CustomerId across n_workers processes; rows come back in their original order
+            self.df, _ = run_partitioned(type(self), self.df, steps, n_workers, n_partitions, columns=PARTITIONED_COLUMNS)
+            print(f"Ran {len(steps)} steps on partitions of the transactions.")
+        except Exception as e:
+            report_error("Error running partitioned feature engineering", e)
         return self.df
 
     def label_encode(self, columns):
         try:
-            label_encoder = LabelEncoder()
-            for col in columns:
-                self.df[col] = label_encoder.fit_transform(self.df[col])
+            # One fitted lookup table per column
+            self.preprocessor.fit_categorical(self.df, columns)
+            self.df = self.preprocessor.transform(self.df, columns, copy=False)
             print("Label encoding completed successfully.")
         except Exception as e:
-            print(f"Error in label encoding: {e}")
+            report_error("Error in label encoding", e)
         return self.df
 
     def check_missing_values(self):
@@ -54,36 +132,54 @@ class FeatureEngineering:
             print("### Missing Values ###")
             print(missing_values)
         except Exception as e:
-            print(f"Error checking missing values: {e}")
+            report_error("Error checking missing values", e)
 
     def handle_missing_values(self):
         try:
             self.df.dropna(subset=['std_transaction_amount'], inplace=True)
             print("Missing values handled successfully.")
         except Exception as e:
-            print(f"Error handling missing values: {e}")
+            report_error("Error handling missing values", e)
         return self.df
 
     def scale_numerical_features(self, method='normalize'):
         try:
             numerical_columns = ['Amount', 'Value', 'total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']
-            
-            if method == 'normalize':
-                scaler = MinMaxScaler()
-            elif method == 'standardize':
-                scaler = StandardScaler()
-            else:
-                raise ValueError("Method must be 'normalize' or 'standardize'")
-            
-            self.df[numerical_columns] = scaler.fit_transform(self.df[numerical_columns])
+
+            # Keep the fitted scale and shift per column rather than discarding the scaler
+            self.preprocessor.fit_numerical(self.df, numerical_columns, method)
+            self.df = self.preprocessor.transform(self.df, numerical_columns, copy=False)
             print(f"Numerical features scaled using {method} method.")
         except Exception as e:
-            print(f"Error scaling numerical features: {e}")
+            report_error("Error scaling numerical features", e)
         return self.df
 
     def save_cleaned_data(self, output_path):
         try:
-            self.df.to_csv(output_path, index=False)
+            # The format follows the extension: .parquet / .feather are columnar, anything else is CSV
+            save_artifact(self.df, output_path)
             print(f"Cleaned data saved to {output_path}")
         except Exception as e:
-            print(f"Error saving cleaned data: {e}")
\ No newline at end of file
+            report_error("Error saving cleaned data", e)
+
+    def save_preprocessor(self, output_path):
+        try:
+            self.preprocessor.save(output_path)
+            print(f"Preprocessor saved to {output_path}")
+        except Exception as e:
+            report_error("Error saving preprocessor", e)
+
+    def save_feature_store(self, db_path):
+        try:
+            # Persist one row of aggregate features per customer for online lookup by CustomerId
+            customer_features = self.df.drop_duplicates('CustomerId')[['CustomerId'] + AGGREGATE_COLUMNS]
+
+            # The store holds raw aggregates, since the API applies the saved scaling itself; undo it if it has run
+            customer_features = self.preprocessor.inverse_transform(customer_features, AGGREGATE_COLUMNS)
+            customer_features['transaction_count'] = customer_features['transaction_count'].round()
+            store = FeatureStore(db_path)
+            count = store.write_features(customer_features)
+            store.close()
+            print(f"Feature store with {count} customers saved to {db_path}")
+        except Exception as e:
+            report_error("Error saving feature store", e)
\ No newline at end of file
@@ -1,44 +1,90 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from aggregation import CustomerGrouping, aggregate_customers
+from artifacts import load_artifact, save_artifact
+from dtype_planner import optimize_dtypes
+from partitioned import run_partitioned
+from labeling import broadcast_labels, customer_scores, label_scores, sweep_thresholds
+from plot_report import build_report, rfms_sections
+from streaming import stream_customer_aggregates
+from time_features import parse_column
+from instrumentation import instrument_class, report_error
 
+@instrument_class
 class RFMS:
-    def __init__(self, data_path):
+    def __init__(self, data_path, chunksize=None, compact_dtypes=False, df=None):
+        # In streaming mode the file is read in chunks and only the per-customer RFMS table is kept
+        self.streaming = chunksize is not None
         try:
-            self.df = pd.read_csv(data_path)
+            if df is not None:
+                # An in-memory frame, e.g. one partition in a run_partitioned worker
+                self.df = df
+            elif self.streaming:
+                self.aggregator = stream_customer_aggregates(data_path, chunksize)
+                self.df = self.aggregator.rfms_frame()
+            else:
+                self.df = load_artifact(data_path)
+                if compact_dtypes:
+                    # Categoricals, integer ID codes and narrower numerics; parses timestamps once
+                    self.df, self.dtype_report = optimize_dtypes(self.df)
             print("Data loaded successfully.")
         except Exception as e:
-            print(f"Error loading data: {e}")
+            report_error("Error loading data", e)
 
-    def calculate_rfms_features(self):
+    def calculate_rfms_features(self, reference_time=None, n_workers=None, n_partitions=None):
+        if self.streaming:
+            print("RFMS features already computed while streaming.")
+            return self.df
         try:
-            # Convert TransactionStartTime to datetime
-            self.df['TransactionStartTime'] = pd.to_datetime(self.df['TransactionStartTime'])
+            # Convert TransactionStartTime to datetime; a no-op when FeatureEngineering or the artifact already did
+            parse_column(self.df)
+
+            # Recency counts days up to the latest transaction overall, unless a reference time is given
+            if reference_time is None:
+                reference_time = self.df['TransactionStartTime'].max()
+
+            # With several workers the customers are hash-partitioned and scored in separate processes; every partition
+            # measures Recency from the same reference time, so each customer's row matches a serial run
+            if n_workers is not None and n_workers > 1:
+                steps = [('calculate_rfms_features', {'reference_time': reference_time})]
+                self.df, tables = run_partitioned(type(self), self.df, steps, n_workers, n_partitions, tables=['customer_rfms'])
+
+                # Per-customer table back in the grouping's customer order, as labels and threshold sweeps expect
+                self.grouping = CustomerGrouping(self.df['CustomerId'])
+                self.customer_rfms = tables['customer_rfms'].set_index('CustomerId').reindex(self.grouping.customers).rename_axis('CustomerId').reset_index()
+                self.rfms_df = self.df
+                print(f"RFMS features calculated successfully on partitions across {n_workers} workers.")
+                return self.df
             
+            # Compute the per-customer statistics in one factorized pass
+            grouping, customer_df = aggregate_customers(self.df, time_column='TransactionStartTime')
+            rfms_df = pd.DataFrame({'CustomerId': customer_df['CustomerId'], 'TransactionStartTime': customer_df['last_transaction_time']})
+
             # Calculate Recency: Days since the last transaction
-            recency_df = self.df.groupby('CustomerId')['TransactionStartTime'].max().reset_index()
-            recency_df['Recency'] = (self.df['TransactionStartTime'].max() - recency_df['TransactionStartTime']).dt.days
+            rfms_df['Recency'] = (reference_time - rfms_df['TransactionStartTime']).dt.days
             
             # Calculate Frequency: Number of transactions per customer
-            frequency_df = self.df.groupby('CustomerId')['TransactionId'].count().reset_index()
-            frequency_df.columns = ['CustomerId', 'Frequency']
+            rfms_df['Frequency'] = customer_df['transaction_count']
             
             # Calculate Monetary: Total transaction amount per customer
-            monetary_df = self.df.groupby('CustomerId')['Amount'].sum().reset_index()
-            monetary_df.columns = ['CustomerId', 'Monetary']
-            
-            # Merge RFMS features into the original dataframe
-            rfms_df = pd.merge(recency_df, frequency_df, on='CustomerId')
-            rfms_df = pd.merge(rfms_df, monetary_df, on='CustomerId')
+            rfms_df['Monetary'] = customer_df['total_transaction_amount']
             
             # Calculate Score: A simple combination of Recency, Frequency, and Monetary
             rfms_df['Score'] = rfms_df['Frequency'] * rfms_df['Monetary'] / (rfms_df['Recency'] + 1)
             
-            # Merge RFMS features back into the original dataframe
-            self.df = pd.merge(self.df, rfms_df, on='CustomerId', how='left')
+            # Broadcast RFMS features back onto the transactions through the customer codes, keeping the
+            # column names a merge on CustomerId would produce (TransactionStartTime_x / TransactionStartTime_y)
+            self.df = self.df.rename(columns={'TransactionStartTime': 'TransactionStartTime_x'})
+            self.df['TransactionStartTime_y'] = grouping.broadcast(rfms_df['TransactionStartTime'])
+            for col in ['Recency', 'Frequency', 'Monetary', 'Score']:
+                self.df[col] = grouping.broadcast(rfms_df[col])
+
+            # Kept so labels and threshold sweeps work on one row per customer, together with the frame they describe
+            self.grouping, self.customer_rfms, self.rfms_df = grouping, rfms_df, self.df
             print("RFMS features calculated successfully.")
         except Exception as e:
-            print(f"Error calculating RFMS features: {e}")
+            report_error("Error calculating RFMS features", e)
         return self.df
 
     def check_distribution(self):
@@ -55,7 +101,7 @@ class RFMS:
             plt.show()
             print("Distribution check completed successfully.")
         except Exception as e:
-            print(f"Error checking distribution: {e}")
+            report_error("Error checking distribution", e)
 
     def visualize_rfms(self):
         try:
@@ -69,16 +115,44 @@ class RFMS:
             plt.show()
             print("RFMS visualization completed successfully.")
         except Exception as e:
-            print(f"Error visualizing RFMS: {e}")
+            report_error("Error visualizing RFMS", e)
+
+    def cached_customer_rfms(self):
+        # The per-customer table, unless self.df has been replaced or filtered since it was computed
+        customer_rfms = getattr(self, 'customer_rfms', None)
+        if customer_rfms is None or getattr(self, 'rfms_df', None) is not self.df or len(self.grouping.codes) != len(self.df):
+            return None
+        return customer_rfms
 
     def assign_labels(self, threshold=0.5):
         try:
-            self.df['Label'] = self.df['Score'].apply(lambda x: 'Good' if x >= threshold else 'Bad')
+            # Labels are decided once per customer and broadcast to the transactions, as a Categorical of 'Bad'/'Good'
+            customer_rfms = self.cached_customer_rfms()
+            if customer_rfms is not None:
+                self.df['Label'] = broadcast_labels(self.grouping, customer_rfms['Score'], threshold)
+            else:
+                self.df['Label'] = label_scores(self.df['Score'], threshold)
             print("Labels assigned successfully.")
         except Exception as e:
-            print(f"Error assigning labels: {e}")
+            report_error("Error assigning labels", e)
         return self.df
 
+    def sweep_thresholds(self, thresholds=None, n_thresholds=200):
+        self.threshold_sweep = None
+        try:
+            # Customer-level scores weighted by Frequency, so the rates are also transaction-level rates
+            customer_rfms = self.cached_customer_rfms()
+            if customer_rfms is not None:
+                scores, weights = customer_rfms['Score'], customer_rfms['Frequency']
+            else:
+                weight_column = 'Frequency' if 'Frequency' in self.df.columns else None
+                _, scores, weights = customer_scores(self.df, weight_column=weight_column)
+            self.threshold_sweep = sweep_thresholds(scores, weights, thresholds=thresholds, n_thresholds=n_thresholds)
+            print(f"Threshold sweep completed over {len(self.threshold_sweep)} thresholds.")
+        except Exception as e:
+            report_error("Error sweeping thresholds", e)
+        return self.threshold_sweep
+
     def plot_labels(self):
         try:
             plt.figure(figsize=(10, 6))
@@ -90,11 +164,22 @@ class RFMS:
             plt.show()
             print("Label plot completed successfully.")
         except Exception as e:
-            print(f"Error plotting labels: {e}")
+            report_error("Error plotting labels", e)
+
+    def generate_report(self, output_dir, n_jobs=None, bins=50, grid=200):
+        try:
+            # Headless report: histograms, a binned RFMS space instead of a per-point scatter, and label counts
+            sections = rfms_sections(self.df, getattr(self, 'threshold_sweep', None), bins=bins, grid=grid)
+            report_path = build_report(sections, output_dir, title='RFMS Report', n_jobs=n_jobs)
+            print(f"RFMS report saved to {report_path}")
+            return report_path
+        except Exception as e:
+            report_error("Error generating RFMS report", e)
 
     def save_rfms_data(self, output_path):
         try:
-            self.df.to_csv(output_path, index=False)
+            # The format follows the extension: .parquet / .feather are columnar, anything else is CSV
+            save_artifact(self.df, output_path)
             print(f"RFMS data saved to {output_path}")
         except Exception as e:
-            print(f"Error saving RFMS data: {e}")
\ No newline at end of file
+            report_error("Error saving RFMS data", e)
\ No newline at end of file
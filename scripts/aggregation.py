@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+class CustomerGrouping:
+    def __init__(self, customer_ids):
+        # Factorize once; sorted codes give the same customer order as groupby('CustomerId')
+        self.codes, self.customers = pd.factorize(customer_ids, sort=True)
+        self.n_customers = len(self.customers)
+        self.valid = self.codes >= 0
+
+    def select(self, values):
+        # Rows with a customer and a non-missing value
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        mask = self.valid & values.notna().to_numpy()
+        return self.codes[mask], values, mask
+
+    def count(self, values):
+        codes, _, _ = self.select(values)
+        return np.bincount(codes, minlength=self.n_customers)
+
+    def sum(self, values):
+        codes, values, mask = self.select(values)
+        total = np.bincount(codes, weights=values.to_numpy(dtype=np.float64)[mask], minlength=self.n_customers)
+        if pd.api.types.is_integer_dtype(values):
+            return total.astype(np.int64)
+        return total
+
+    def mean(self, values):
+        n = self.count(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.sum(values) / np.where(n > 0, n, np.nan)
+
+    def std(self, values, ddof=1):
+        # Two-pass: deviations from the per-customer mean, gathered through the code array
+        codes, values, mask = self.select(values)
+        x = values.to_numpy(dtype=np.float64)[mask]
+        n = np.bincount(codes, minlength=self.n_customers)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.bincount(codes, weights=x, minlength=self.n_customers) / n
+            deviation = x - mean[codes]
+            m2 = np.bincount(codes, weights=deviation * deviation, minlength=self.n_customers)
+            return np.where(n > ddof, np.sqrt(m2 / (n - ddof)), np.nan)
+
+    def first_rows(self):
+        # Position of each customer's first row
+        rows = np.flatnonzero(self.valid)
+        _, first = np.unique(self.codes[self.valid], return_index=True)
+        return rows[first]
+
+    def extreme(self, values, ufunc, fill):
+        codes, values, mask = self.select(values)
+        out = np.full(self.n_customers, fill, dtype=np.float64)
+        ufunc.at(out, codes, values.to_numpy(dtype=np.float64)[mask])
+        return np.where(np.bincount(codes, minlength=self.n_customers) > 0, out, np.nan)
+
+    def min(self, values):
+        return self.extreme(values, np.minimum, np.inf)
+
+    def max(self, values):
+        return self.extreme(values, np.maximum, -np.inf)
+
+    def nunique(self, values):
+        # Distinct (customer, value) pairs counted per customer
+        codes, values, mask = self.select(values)
+        value_codes, uniques = pd.factorize(values[mask])
+        pairs = np.unique(codes.astype(np.int64) * len(uniques) + value_codes)
+        return np.bincount(pairs // max(len(uniques), 1), minlength=self.n_customers)
+
+    def max_time(self, times):
+        # Latest timestamp per customer on the int64 nanosecond view; NaT is the smallest int64 so it never wins
+        times = pd.Series(times)
+        values = times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        out = np.full(self.n_customers, np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(out, self.codes[self.valid], values[self.valid])
+        result = pd.to_datetime(out, unit='ns')
+        if times.dt.tz is not None:
+            result = result.tz_localize('UTC').tz_convert(times.dt.tz)
+        return result
+
+    def broadcast(self, per_customer):
+        # Map per-customer values back to rows through the code array; rows without a customer get missing values
+        series = pd.Series(per_customer)
+        values = series.array if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) else series.to_numpy()
+        if self.valid.all():
+            return values.take(self.codes)
+        return pd.api.extensions.take(values, self.codes, allow_fill=True)
+
+def aggregate_customers(df, time_column=None):
+    # Every per-customer statistic FeatureEngineering and RFMS need, from one factorization
+    grouping = CustomerGrouping(df['CustomerId'])
+    table = pd.DataFrame({'CustomerId': grouping.customers})
+    table['total_transaction_amount'] = grouping.sum(df['Amount'])
+    table['average_transaction_amount'] = grouping.mean(df['Amount'])
+    table['transaction_count'] = grouping.count(df['TransactionId'])
+    table['std_transaction_amount'] = grouping.std(df['Amount'])
+    if time_column is not None:
+        table['last_transaction_time'] = grouping.max_time(df[time_column])
+    return grouping, table
\ No newline at end of file
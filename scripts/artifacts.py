@@ -0,0 +1,74 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from time_features import parse_timestamps
+
+# Repetitive ID columns are stored dictionary-encoded
+DICTIONARY_COLUMNS = ['CustomerId', 'AccountId', 'SubscriptionId', 'CurrencyCode', 'ProviderId', 'ProductId', 'ProductCategory', 'ChannelId', 'Label']
+
+# Timestamp columns are stored as Arrow timestamps so later stages do not re-parse them
+DATETIME_COLUMNS = ['TransactionStartTime', 'TransactionStartTime_x', 'TransactionStartTime_y']
+
+FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather', '.arrow': 'feather', '.csv': 'csv'}
+
+def artifact_format(path):
+    extension = os.path.splitext(str(path))[1].lower()
+    return FORMATS.get(extension, 'csv')
+
+def prepare_frame(df):
+    # Apply the artifact schema conventions on the pandas side before conversion
+    df = df.reset_index(drop=True)
+    for col in DATETIME_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = parse_timestamps(df[col])
+    for col in DICTIONARY_COLUMNS:
+        if col in df.columns and (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+            df[col] = df[col].astype('category')
+    return df
+
+def artifact_schema(df):
+    # Arrow schema of an artifact: categoricals become dictionary<int32, ...> columns
+    return pa.Schema.from_pandas(prepare_frame(df), preserve_index=False)
+
+def save_artifact(df, path, compression='zstd'):
+    fmt = artifact_format(path)
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+        return path
+
+    frame = prepare_frame(df)
+    table = pa.Table.from_pandas(frame, schema=pa.Schema.from_pandas(frame, preserve_index=False), preserve_index=False)
+    if fmt == 'parquet':
+        pq.write_table(table, path, compression=compression)
+    else:
+        feather.write_feather(table, path, compression=compression)
+    return path
+
+def load_artifact(path, columns=None):
+    # Columnar formats read only the requested columns
+    fmt = artifact_format(path)
+    if fmt == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    if fmt == 'feather':
+        return pd.read_feather(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+def iter_artifact_batches(path, batch_size, columns=None):
+    # Stream a Parquet or Feather artifact batch_size rows at a time
+    if artifact_format(path) == 'parquet':
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    # Feather files are Arrow IPC files: memory-mapped and read one stored record batch at a time
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for start in range(0, batch.num_rows, batch_size):
+                yield batch.slice(start, batch_size).to_pandas()
\ No newline at end of file
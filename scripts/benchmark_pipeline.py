@@ -0,0 +1,212 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import time
+import tracemalloc
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from artifacts import load_artifact
+from credit_pipeline import CATEGORICAL_COLUMNS
+from EDA import EDA
+from Feature_Eng import FeatureEngineering
+from RFMS import RFMS
+from model import ModelTraining
+from process_memory import process_memory, reset_peak_rss
+from synthetic_data import write_transactions
+
+NO_ARGS = lambda paths, obj: ()
+
+# Each suite: the class, its constructor arguments and its public methods in pipeline order as
+# (method, arguments, kind). Arguments are built from the benchmark's file paths and the instance;
+# 'plot' and 'tuning' methods only run when asked for
+SUITES = {
+    'feature_engineering': (FeatureEngineering, lambda paths: (paths['raw'],), [
+        ('create_aggregate_features', NO_ARGS, None),
+        ('extract_time_features', NO_ARGS, None),
+        ('label_encode', lambda paths, obj: (CATEGORICAL_COLUMNS + ['FraudResult'],), None),
+        ('check_missing_values', NO_ARGS, None),
+        ('handle_missing_values', NO_ARGS, None),
+        ('scale_numerical_features', NO_ARGS, None),
+        ('save_cleaned_data', lambda paths, obj: (paths['featured'],), None),
+        ('save_feature_store', lambda paths, obj: (paths['feature_store'],), None)
+    ]),
+    'rfms': (RFMS, lambda paths: (paths['featured'],), [
+        ('calculate_rfms_features', NO_ARGS, None),
+        ('check_distribution', NO_ARGS, 'plot'),
+        ('visualize_rfms', NO_ARGS, 'plot'),
+        ('assign_labels', NO_ARGS, None),
+        ('sweep_thresholds', NO_ARGS, None),
+        ('plot_labels', NO_ARGS, 'plot'),
+        ('save_rfms_data', lambda paths, obj: (paths['rfms'],), None)
+    ]),
+    'eda': (EDA, lambda paths: (load_artifact(paths['raw']),), [
+        ('overview_of_data', NO_ARGS, None),
+        ('summary_statistics', NO_ARGS, None),
+        ('count_unique_values', NO_ARGS, None),
+        ('find_unique_values', lambda paths, obj: (['ProductCategory', 'ChannelId', 'ProviderId'],), None),
+        ('identify_missing_values', NO_ARGS, None),
+        ('correlation_analysis', NO_ARGS, 'plot'),
+        ('plot_numerical_features', NO_ARGS, 'plot'),
+        ('plot_categorical_features', NO_ARGS, 'plot'),
+        ('detect_outliers_with_visualization', NO_ARGS, 'plot')
+    ]),
+    'model': (ModelTraining, lambda paths: (paths['rfms'],), [
+        ('split_data', NO_ARGS, None),
+        ('train_logistic_regression', NO_ARGS, None),
+        ('train_random_forest', NO_ARGS, None),
+        ('hyperparameter_tuning_log_reg', NO_ARGS, 'tuning'),
+        ('hyperparameter_tuning_rf', NO_ARGS, 'tuning'),
+        ('evaluate_models', NO_ARGS, None),
+        ('save_model', lambda paths, obj: (obj.rf, paths['model']), None)
+    ])
+}
+
+# Later suites read the artifacts written by earlier ones
+SUITE_ORDER = ['feature_engineering', 'rfms', 'eda', 'model']
+
+def benchmark_paths(work_dir, n_rows, seed):
+    name = lambda stem, ext: os.path.join(work_dir, f'{stem}_{n_rows}_seed{seed}.{ext}')
+    return {
+        'raw': name('transactions', 'parquet'),
+        'featured': name('featured', 'parquet'),
+        'feature_store': name('feature_store', 'db'),
+        'rfms': name('rfms', 'parquet'),
+        'model': name('random_forest_model', 'pkl')
+    }
+
+def frame_rows(obj):
+    df = getattr(obj, 'df', None)
+    return len(df) if isinstance(df, pd.DataFrame) else None
+
+def measure(call, memory='rss'):
+    # Wall time, CPU time and the peak memory above the starting point of one call.
+    # 'rss' resets the kernel's high-water mark (Linux) so native allocations in NumPy, pandas and
+    # scikit-learn count; 'tracemalloc' only sees allocations made through Python's allocator
+    if memory == 'rss' and not reset_peak_rss():
+        memory = 'tracemalloc'
+    if memory == 'tracemalloc':
+        tracemalloc.start()
+    rss_before = process_memory()['rss_mb'] if memory == 'rss' else None
+    output = io.StringIO()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(output):
+        try:
+            result, error = call(), None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+    stats = {'wall_seconds': time.perf_counter() - wall_start, 'cpu_seconds': time.process_time() - cpu_start}
+    if memory == 'tracemalloc':
+        stats['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    else:
+        after = process_memory()
+        stats['peak_memory_mb'] = max(after['peak_rss_mb'] - rss_before, 0.0)
+        stats['rss_after_mb'] = after['rss_mb']
+
+    # The classes report failures by printing rather than raising
+    if error is None:
+        error = next((line for line in output.getvalue().splitlines() if line.startswith('Error') or 'error occurred' in line), None)
+    stats['status'] = 'ok' if error is None else 'error'
+    stats['error'] = error
+    return result, stats
+
+def run_suite(suite, paths, memory='rss', kinds=()):
+    cls, make_args, methods = SUITES[suite]
+    rows = []
+
+    instance, stats = measure(lambda: cls(*make_args(paths)), memory)
+    rows.append({'suite': suite, 'method': '__init__', 'rows_in': None, 'rows_out': frame_rows(instance), **stats})
+    if instance is None:
+        return rows
+
+    for method, method_args, kind in methods:
+        if kind is not None and kind not in kinds:
+            continue
+        rows_in = frame_rows(instance)
+        _, stats = measure(lambda: getattr(instance, method)(*method_args(paths, instance)), memory)
+        rows.append({'suite': suite, 'method': method, 'rows_in': rows_in, 'rows_out': frame_rows(instance), **stats})
+        plt.close('all')
+    return rows
+
+def run_benchmark(sizes, work_dir, suites=None, memory='rss', kinds=(), seed=0, skew=0.9, chunksize=1_000_000, regenerate=False):
+    suites = [suite for suite in SUITE_ORDER if suites is None or suite in suites]
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+    for n_rows in sizes:
+        paths = benchmark_paths(work_dir, n_rows, seed)
+
+        # Synthetic input is written once per size and seed and reused across runs
+        if regenerate or not os.path.exists(paths['raw']):
+            start = time.perf_counter()
+            write_transactions(paths['raw'], n_rows, chunksize=chunksize, skew=skew, seed=seed)
+            print(f"Generated {n_rows} transactions in {time.perf_counter() - start:.1f}s")
+
+        for suite in suites:
+            print(f"Benchmarking {suite} on {n_rows} rows...")
+            for row in run_suite(suite, paths, memory, kinds):
+                results.append({'rows': n_rows, **row})
+                if row['status'] == 'error':
+                    print(f"  {row['method']} failed: {row['error']}")
+    return pd.DataFrame(results)
+
+def scaling_exponents(results):
+    # Slope of log(wall time) against log(rows): about 1 for linear stages, above 1 for superlinear ones
+    exponents = {}
+    ok = results[(results['status'] == 'ok') & (results['wall_seconds'] > 0)]
+    for (suite, method), group in ok.groupby(['suite', 'method'], sort=False):
+        if group['rows'].nunique() < 2:
+            continue
+        slope, _ = np.polyfit(np.log(group['rows']), np.log(group['wall_seconds']), 1)
+        exponents[(suite, method)] = slope
+    index = pd.MultiIndex.from_tuples(list(exponents), names=['suite', 'method'])
+    return pd.Series(list(exponents.values()), index=index, name='scaling_exponent', dtype=float)
+
+def summary_table(results):
+    # One row per method, wall time and peak memory per size side by side
+    table = results.pivot_table(index=['suite', 'method'], columns='rows', values=['wall_seconds', 'peak_memory_mb'], sort=False)
+    table.columns = [f"{'wall_s' if value == 'wall_seconds' else 'peak_mb'}@{rows}" for value, rows in table.columns]
+    exponents = scaling_exponents(results)
+    if len(exponents):
+        table = table.join(exponents)
+    return table
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time and memory-profile each public method of the pipeline classes on synthetic data.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000], help='numbers of transactions to benchmark')
+    parser.add_argument('--work-dir', default='benchmark_data', help='where the synthetic data and stage artifacts are written')
+    parser.add_argument('--suites', nargs='+', choices=SUITE_ORDER, default=SUITE_ORDER)
+    parser.add_argument('--memory', choices=['rss', 'tracemalloc'], default='rss', help='how peak memory is measured')
+    parser.add_argument('--plots', action='store_true', help='also benchmark the plotting methods (rendered off-screen)')
+    parser.add_argument('--tuning', action='store_true', help='also benchmark the hyperparameter searches')
+    parser.add_argument('--skew', type=float, default=0.9, help='Zipf exponent of transactions per customer')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunksize', type=int, default=1_000_000, help='rows generated and written at a time')
+    parser.add_argument('--regenerate', action='store_true', help='rewrite the synthetic data even if it exists')
+    parser.add_argument('--output', default=None, help='write the per-method measurements as JSON')
+    args = parser.parse_args(argv)
+
+    kinds = [kind for kind, enabled in (('plot', args.plots), ('tuning', args.tuning)) if enabled]
+    results = run_benchmark(sorted(args.sizes), args.work_dir, args.suites, args.memory, kinds, args.seed, args.skew, args.chunksize, args.regenerate)
+
+    print("### Pipeline Benchmark ###")
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(summary_table(results).to_string(float_format='%.3f'))
+
+    if args.output is not None:
+        report = {
+            'config': {**vars(args), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+            'results': results.to_dict(orient='records')
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Results saved to {args.output}")
+    return results
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,103 @@
+import json
+import os
+import numpy as np
+
+ARRAY_NAMES = ['roots', 'feature', 'threshold', 'children_left', 'children_right', 'value']
+
+def flatten_forest(forest):
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    node_counts = np.array([tree.node_count for tree in trees])
+    offsets = np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+
+    features, thresholds, lefts, rights, values = [], [], [], [], []
+    for tree, offset in zip(trees, offsets):
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        # Leaves point back to themselves and always compare true, so every row can take the same number of steps
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+        # Normalise leaf values to class probabilities the same way DecisionTreeClassifier.predict_proba does
+        value = tree.value[:, 0, :forest.n_classes_]
+        normalizer = value.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        values.append(value / normalizer)
+
+    return {
+        'roots': offsets.astype(np.int32),
+        'feature': np.ascontiguousarray(np.concatenate(features), dtype=np.int32),
+        'threshold': np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+        'children_left': np.ascontiguousarray(np.concatenate(lefts), dtype=np.int32),
+        'children_right': np.ascontiguousarray(np.concatenate(rights), dtype=np.int32),
+        'value': np.ascontiguousarray(np.concatenate(values), dtype=np.float64)
+    }
+
+def export_forest(forest, output_dir):
+    # Write one .npy file per array plus a small JSON metadata file
+    os.makedirs(output_dir, exist_ok=True)
+    arrays = flatten_forest(forest)
+    for name in ARRAY_NAMES:
+        np.save(os.path.join(output_dir, f'{name}.npy'), arrays[name])
+
+    metadata = {
+        'classes': forest.classes_.tolist(),
+        'n_features': int(forest.n_features_in_),
+        'feature_names': forest.feature_names_in_.tolist() if hasattr(forest, 'feature_names_in_') else None,
+        'max_depth': int(max(estimator.tree_.max_depth for estimator in forest.estimators_)),
+        'n_trees': len(forest.estimators_)
+    }
+    with open(os.path.join(output_dir, 'metadata.json'), 'w') as f:
+        json.dump(metadata, f)
+    return output_dir
+
+class CompiledForest:
+    def __init__(self, arrays, metadata, chunk_size=4096):
+        for name in ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        self.classes_ = np.asarray(metadata['classes'])
+        self.n_features_in_ = metadata['n_features']
+        self.feature_names = metadata.get('feature_names')
+        self.max_depth = metadata['max_depth']
+        self.n_trees = metadata['n_trees']
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def load(cls, model_dir, mmap_mode=None):
+        with open(os.path.join(model_dir, 'metadata.json')) as f:
+            metadata = json.load(f)
+        arrays = {name: np.load(os.path.join(model_dir, f'{name}.npy'), mmap_mode=mmap_mode) for name in ARRAY_NAMES}
+        return cls(arrays, metadata)
+
+    def leaf_indices(self, X):
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+
+        # Walk all trees for all rows at once, one tree level per step
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected a 2D array with {self.n_features_in_} features, got shape {X.shape}")
+
+        proba = np.zeros((X.shape[0], len(self.classes_)), dtype=np.float64)
+        for start in range(0, X.shape[0], self.chunk_size):
+            leaves = self.leaf_indices(X[start:start + self.chunk_size])
+
+            # Accumulate tree by tree, in the same order as RandomForestClassifier.predict_proba
+            chunk_proba = proba[start:start + self.chunk_size]
+            for t in range(self.n_trees):
+                chunk_proba += self.value[leaves[:, t]]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
\ No newline at end of file
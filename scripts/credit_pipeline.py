@@ -0,0 +1,74 @@
+import os
+from aggregation import CustomerGrouping, aggregate_customers
+from artifacts import load_artifact, save_artifact
+from feature_store import AGGREGATE_COLUMNS
+from Feature_Eng import FeatureEngineering
+from RFMS import RFMS
+from model import ModelTraining
+from pipeline import Pipeline, Stage
+from streaming import AGGREGATION_COLUMNS
+from time_features import TIME_FEATURE_COLUMNS
+
+CATEGORICAL_COLUMNS = ['CurrencyCode', 'ProviderId', 'ProductId', 'ProductCategory', 'ChannelId', 'PricingStrategy']
+
+def aggregate_stage(raw_path, aggregates_path):
+    # Per-customer aggregate table, one row per customer
+    _, table = aggregate_customers(load_artifact(raw_path, columns=AGGREGATION_COLUMNS))
+    save_artifact(table, aggregates_path)
+
+def time_features_stage(raw_path, time_features_path):
+    # Time features in raw row order; runs alongside aggregate_stage
+    feature_eng = FeatureEngineering(raw_path, columns=['TransactionStartTime'])
+    feature_eng.extract_time_features()
+    save_artifact(feature_eng.df, time_features_path)
+
+def featured_stage(raw_path, aggregates_path, time_features_path, featured_path, preprocessor_path, scaling='normalize'):
+    feature_eng = FeatureEngineering(raw_path)
+
+    # Join the two branches back onto the transactions
+    grouping = CustomerGrouping(feature_eng.df['CustomerId'])
+    aggregates = load_artifact(aggregates_path)
+    aggregates = aggregates.set_index(aggregates['CustomerId'].astype(str)).reindex(grouping.customers.astype(str))
+    for col in AGGREGATE_COLUMNS:
+        feature_eng.df[col] = grouping.broadcast(aggregates[col].to_numpy())
+    time_features = load_artifact(time_features_path)
+    for col in ['TransactionStartTime'] + TIME_FEATURE_COLUMNS:
+        feature_eng.df[col] = time_features[col].to_numpy()
+
+    feature_eng.label_encode(CATEGORICAL_COLUMNS)
+    feature_eng.label_encode(['FraudResult'])
+    feature_eng.handle_missing_values()
+    feature_eng.scale_numerical_features(method=scaling)
+    feature_eng.save_cleaned_data(featured_path)
+    feature_eng.save_preprocessor(preprocessor_path)
+
+def rfms_stage(featured_path, rfms_path, threshold=0.5):
+    rfms = RFMS(featured_path)
+    rfms.calculate_rfms_features()
+    rfms.assign_labels(threshold=threshold)
+    rfms.save_rfms_data(rfms_path)
+
+def train_stage(rfms_path, preprocessor_path, model_path):
+    model_training = ModelTraining(rfms_path)
+    model_training.split_data()
+    model_training.train_random_forest()
+    model_training.save_model(model_training.rf, model_path, preprocessor=preprocessor_path)
+
+def build_credit_pipeline(raw_path, work_dir, threshold=0.5, scaling='normalize', max_workers=2, executor='process'):
+    # FeatureEngineering -> RFMS -> ModelTraining, with aggregation and time features as parallel branches
+    artifact = lambda name: os.path.join(work_dir, name)
+    stages = [
+        Stage('aggregate_features', aggregate_stage,
+              inputs={'raw_path': raw_path}, outputs={'aggregates_path': artifact('aggregates.parquet')}),
+        Stage('time_features', time_features_stage,
+              inputs={'raw_path': raw_path}, outputs={'time_features_path': artifact('time_features.parquet')}),
+        Stage('feature_engineering', featured_stage,
+              inputs={'raw_path': raw_path, 'aggregates_path': artifact('aggregates.parquet'), 'time_features_path': artifact('time_features.parquet')},
+              outputs={'featured_path': artifact('featured.parquet'), 'preprocessor_path': artifact('preprocessor.pkl')}, params={'scaling': scaling}),
+        Stage('rfms', rfms_stage,
+              inputs={'featured_path': artifact('featured.parquet')}, outputs={'rfms_path': artifact('rfms.parquet')}, params={'threshold': threshold}),
+        Stage('train_model', train_stage,
+              inputs={'rfms_path': artifact('rfms.parquet'), 'preprocessor_path': artifact('preprocessor.pkl')},
+              outputs={'model_path': artifact('random_forest_model.pkl')})
+    ]
+    return Pipeline(stages, cache_dir=artifact('.pipeline_cache'), max_workers=max_workers, executor=executor)
\ No newline at end of file
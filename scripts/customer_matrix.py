@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import GroupShuffleSplit
+from aggregation import CustomerGrouping
+
+# Columns that are constant within a customer once aggregates have been broadcast; these are the model features
+CUSTOMER_COLUMNS = ['total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']
+
+# RFMS columns the Label is computed from (Label = Score >= threshold): kept on the matrix, never used as features
+LABEL_INPUT_COLUMNS = ['Recency', 'Frequency', 'Monetary', 'Score']
+
+# Optional per-customer transaction summaries: (output column, source column, statistic)
+SUMMARY_COLUMNS = [
+    ('min_amount', 'Amount', 'min'),
+    ('max_amount', 'Amount', 'max'),
+    ('total_value', 'Value', 'sum'),
+    ('average_value', 'Value', 'mean'),
+    ('fraud_count', 'FraudResult', 'sum'),
+    ('distinct_providers', 'ProviderId', 'nunique'),
+    ('distinct_products', 'ProductId', 'nunique'),
+    ('distinct_channels', 'ChannelId', 'nunique')
+]
+
+def build_customer_matrix(df, summaries=True):
+    # One row per CustomerId instead of the customer's features repeated on every transaction
+    grouping = CustomerGrouping(df['CustomerId'])
+    first = grouping.first_rows()
+    customer_df = pd.DataFrame({'CustomerId': grouping.customers})
+    for col in CUSTOMER_COLUMNS + LABEL_INPUT_COLUMNS + ['Label']:
+        if col in df.columns:
+            customer_df[col] = df[col].iloc[first].reset_index(drop=True)
+
+    # Single-transaction customers have no spread
+    if 'std_transaction_amount' in customer_df.columns:
+        customer_df['std_transaction_amount'] = customer_df['std_transaction_amount'].fillna(0)
+
+    if summaries:
+        for name, source, statistic in SUMMARY_COLUMNS:
+            if source in df.columns and (statistic == 'nunique' or pd.api.types.is_numeric_dtype(df[source])):
+                customer_df[name] = getattr(grouping, statistic)(df[source])
+    return customer_df
+
+def customer_feature_columns(customer_df):
+    # Every numeric model feature the matrix has, in a fixed order; the label inputs are left out so the model can't
+    # learn its own target
+    candidates = CUSTOMER_COLUMNS + [name for name, _, _ in SUMMARY_COLUMNS]
+    return [col for col in candidates if col in customer_df.columns]
+
+def grouped_train_test_split(X, y, groups, test_size=0.2, random_state=42):
+    # Every transaction of a customer lands on the same side of the split
+    splitter = GroupShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+    train_idx, test_idx = next(splitter.split(X, y, groups))
+    return X.iloc[train_idx], X.iloc[test_idx], y.iloc[train_idx], y.iloc[test_idx], np.asarray(groups)[train_idx]
\ No newline at end of file
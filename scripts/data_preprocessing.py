@@ -0,0 +1,104 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+
+def preprocessor_path(model_path):
+    # Where a preprocessor saved alongside a single model file lives: random_forest_model.pkl -> random_forest_model.preprocessor.pkl
+    return f'{os.path.splitext(model_path)[0]}.preprocessor.pkl'
+
+class Preprocessor:
+    # Fitted label encodings and numeric scaling, kept as plain arrays so transform is a few NumPy operations:
+    # scaled = x * scale + shift per column, and one hash lookup per categorical column
+    def __init__(self):
+        self.numerical_columns = []
+        self.method = None
+        self.scale = np.zeros(0)
+        self.shift = np.zeros(0)
+        self.categories = {}
+        self.layouts = {}
+
+    def fit_categorical(self, df, columns):
+        # Codes are positions in the sorted distinct values, as LabelEncoder assigns them; refitting a column replaces it
+        for col in columns:
+            values = df[col].dropna()
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.cat.remove_unused_categories().cat.categories.to_series()
+            self.categories[col] = pd.Index(np.unique(values.to_numpy()))
+        return self
+
+    def fit_numerical(self, df, columns, method='normalize'):
+        # Same statistics as MinMaxScaler / StandardScaler, ignoring missing values; constant columns get a scale of 1
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if method == 'normalize':
+            low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+            span = high - low
+            self.scale = 1.0 / np.where(span == 0, 1.0, span)
+            self.shift = -low * self.scale
+        elif method == 'standardize':
+            mean, std = np.nanmean(values, axis=0), np.nanstd(values, axis=0)
+            self.scale = 1.0 / np.where(std == 0, 1.0, std)
+            self.shift = -mean * self.scale
+        else:
+            raise ValueError("Method must be 'normalize' or 'standardize'")
+        self.numerical_columns = list(columns)
+        self.method = method
+        self.layouts = {}
+        return self
+
+    def encode(self, col, values):
+        # Unseen values and missing values map to -1
+        categories = self.categories[col]
+        if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+            # Look up each category once, then index the result with the codes
+            lookup = np.append(categories.get_indexer(values.cat.categories), -1)
+            return lookup[values.cat.codes.to_numpy()]
+        return categories.get_indexer(np.asarray(values))
+
+    def transform(self, df, columns=None, copy=True):
+        # Encodes and scales the fitted columns present in df (or only those in columns), leaving the rest as they are
+        if copy:
+            df = df.copy()
+        for col in self.categories:
+            if col in df.columns and (columns is None or col in columns):
+                df[col] = self.encode(col, df[col])
+        numerical = [col for col in self.numerical_columns if col in df.columns and (columns is None or col in columns)]
+        if numerical:
+            positions = [self.numerical_columns.index(col) for col in numerical]
+            df[numerical] = df[numerical].to_numpy(dtype=np.float64, na_value=np.nan) * self.scale[positions] + self.shift[positions]
+        return df
+
+    def inverse_transform(self, df, columns=None, copy=True):
+        # Undoes the numeric scaling of the fitted columns present in df (or only those in columns); encodings are kept
+        if copy:
+            df = df.copy()
+        numerical = [col for col in self.numerical_columns if col in df.columns and (columns is None or col in columns)]
+        if numerical:
+            positions = [self.numerical_columns.index(col) for col in numerical]
+            df[numerical] = (df[numerical].to_numpy(dtype=np.float64, na_value=np.nan) - self.shift[positions]) / self.scale[positions]
+        return df
+
+    def affine(self, columns):
+        # Full-width scale and shift vectors for one column layout (1 and 0 where a column isn't scaled), built once per layout
+        key = tuple(columns)
+        if key not in self.layouts:
+            scale, shift = np.ones(len(columns)), np.zeros(len(columns))
+            for position, col in enumerate(self.numerical_columns):
+                if col in columns:
+                    scale[columns.index(col)] = self.scale[position]
+                    shift[columns.index(col)] = self.shift[position]
+            self.layouts[key] = (scale, shift)
+        return self.layouts[key]
+
+    def transform_matrix(self, matrix, columns):
+        # Serving path: one multiply-add over an (n_rows, n_columns) array laid out as columns
+        scale, shift = self.affine(columns)
+        return np.asarray(matrix, dtype=np.float64) * scale + shift
+
+    def save(self, path):
+        joblib.dump(self, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        return joblib.load(path)
\ No newline at end of file
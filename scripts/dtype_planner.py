@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from time_features import parse_timestamps
+
+TIMESTAMP_COLUMNS = ['TransactionStartTime', 'TransactionStartTime_x', 'TransactionStartTime_y']
+
+def smallest_integer_dtype(min_value, max_value):
+    for dtype in [np.int8, np.int16, np.int32, np.int64]:
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return np.dtype(dtype).name
+    return 'int64'
+
+def split_id_prefix(series):
+    # 'CustomerId_4406' -> ('CustomerId', 4406) when every value shares one prefix followed by digits. Suffixes
+    # with a leading zero ('X_007' would come back as 'X_7') or more than 18 digits (past int64) don't round-trip
+    parts = series.str.rpartition('_')
+    prefixes = parts[0].unique()
+    if len(prefixes) != 1 or prefixes[0] == '' or not parts[2].str.fullmatch(r'0|[1-9][0-9]{0,17}').all():
+        return None, None
+    return prefixes[0], parts[2].astype(np.int64)
+
+def plan_column(series, category_ratio, strip_prefix_columns):
+    name = series.name
+
+    # Timestamps are parsed once here instead of in every stage
+    if name in TIMESTAMP_COLUMNS and not pd.api.types.is_datetime64_any_dtype(series):
+        return {'kind': 'datetime'}
+
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        if series.isna().any():
+            return {'kind': 'category'}
+        ratio = series.nunique() / max(len(series), 1)
+
+        # High-cardinality IDs like TransactionId_123 become integer codes; the prefix is kept to restore them
+        if ratio > category_ratio or name in strip_prefix_columns:
+            prefix, codes = split_id_prefix(series)
+            if prefix is not None:
+                return {'kind': 'id_code', 'prefix': prefix, 'dtype': smallest_integer_dtype(codes.min(), codes.max())}
+        if ratio <= category_ratio or name in strip_prefix_columns:
+            return {'kind': 'category'}
+        return {'kind': 'keep'}
+
+    if pd.api.types.is_bool_dtype(series):
+        return {'kind': 'keep'}
+
+    if pd.api.types.is_integer_dtype(series) and len(series) > 0:
+        dtype = smallest_integer_dtype(series.min(), series.max())
+        return {'kind': 'numeric', 'dtype': dtype} if dtype != series.dtype.name else {'kind': 'keep'}
+
+    # Floats are narrowed only when every value survives the round trip
+    if pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        with np.errstate(over='ignore', invalid='ignore'):
+            lossless = np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True)
+        if lossless:
+            return {'kind': 'numeric', 'dtype': 'float32'}
+
+    return {'kind': 'keep'}
+
+def plan_dtypes(df, category_ratio=0.5, strip_prefix_columns=()):
+    return {col: plan_column(df[col], category_ratio, strip_prefix_columns) for col in df.columns}
+
+def apply_dtype_plan(df, plan):
+    df = df.copy()
+    for col, step in plan.items():
+        if col not in df.columns or step['kind'] == 'keep':
+            continue
+        if step['kind'] == 'datetime':
+            df[col] = parse_timestamps(df[col])
+        elif step['kind'] == 'category':
+            df[col] = df[col].astype('category')
+        elif step['kind'] == 'id_code':
+            df[col] = df[col].str.rpartition('_')[2].astype(step['dtype'])
+        elif step['kind'] == 'numeric':
+            df[col] = df[col].astype(step['dtype'])
+    return df
+
+def restore_ids(series, step):
+    # Inverse of an id_code step: 4406 -> 'CustomerId_4406'
+    return step['prefix'] + '_' + series.astype(str)
+
+def optimize_dtypes(df, category_ratio=0.5, strip_prefix_columns=(), verbose=True):
+    plan = plan_dtypes(df, category_ratio, strip_prefix_columns)
+    before = int(df.memory_usage(deep=True).sum())
+    optimized = apply_dtype_plan(df, plan)
+    after = int(optimized.memory_usage(deep=True).sum())
+    report = {
+        'plan': plan,
+        'memory_before_bytes': before,
+        'memory_after_bytes': after,
+        'reduction_ratio': before / after if after else float('nan')
+    }
+    if verbose:
+        print(f"Memory usage reduced from {before / 1e6:.2f} MB to {after / 1e6:.2f} MB ({report['reduction_ratio']:.1f}x).")
+    return optimized, report
+
+def numeric_columns(df, plan=None):
+    # Numeric columns for statistics, leaving out integer-coded IDs
+    columns = df.select_dtypes(include='number').columns
+    if plan:
+        columns = [col for col in columns if plan.get(col, {}).get('kind') != 'id_code']
+    return list(columns)
\ No newline at end of file
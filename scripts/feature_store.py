@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+import numpy as np
+from aggregation import aggregate_customers
+
+AGGREGATE_COLUMNS = ['total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']
+
+class FeatureStore:
+    def __init__(self, db_path, read_only=False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.lock = threading.Lock()
+
+        # Serving processes open the store read-only so a missing file is an error rather than a new empty database
+        if read_only:
+            self.conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS customer_features ('
+                'CustomerId TEXT PRIMARY KEY, '
+                'total_transaction_amount REAL, '
+                'average_transaction_amount REAL, '
+                'transaction_count INTEGER, '
+                'std_transaction_amount REAL'
+                ') WITHOUT ROWID'
+            )
+            self.conn.commit()
+
+    def write_features(self, features_df):
+        # Upsert one row per customer; CustomerId is the clustered primary key
+        rows = zip(
+            features_df['CustomerId'].astype(str),
+            *(features_df[col].astype(float).where(features_df[col].notna(), None) for col in AGGREGATE_COLUMNS)
+        )
+        rows = [(customer_id, total, average, int(count), std) for customer_id, total, average, count, std in rows]
+        with self.lock:
+            self.conn.executemany('INSERT OR REPLACE INTO customer_features VALUES (?, ?, ?, ?, ?)', rows)
+            self.conn.commit()
+        return len(rows)
+
+    def build_from_transactions(self, df):
+        # Same aggregates as FeatureEngineering.create_aggregate_features, one row per customer
+        _, features_df = aggregate_customers(df)
+        return self.write_features(features_df)
+
+    def get_features(self, customer_id):
+        # A single primary-key probe
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT total_transaction_amount, average_transaction_amount, transaction_count, std_transaction_amount '
+                'FROM customer_features WHERE CustomerId = ?',
+                (str(customer_id),)
+            ).fetchone()
+        if row is None:
+            return None
+        return {col: (np.nan if value is None else value) for col, value in zip(AGGREGATE_COLUMNS, row)}
+
+    def customer_count(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM customer_features').fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
\ No newline at end of file
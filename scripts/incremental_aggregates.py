@@ -0,0 +1,186 @@
+import joblib
+import numpy as np
+import pandas as pd
+from time_features import parse_timestamps
+
+NAT = np.iinfo(np.int64).min
+
+class IncrementalAggregator:
+    def __init__(self, exact=True):
+        # exact=True reproduces the groupby sums, means and standard deviations bit for bit; exact=False merges each
+        # batch in one vectorised step, which is much faster on skewed batches but agrees only to rounding
+        self.exact = exact
+        self.index = pd.Index([])
+        self.count = np.zeros(0, dtype=np.int64)
+        self.nobs = np.zeros(0, dtype=np.int64)
+        self.sum = np.zeros(0, dtype=np.float64)
+        self.compensation = np.zeros(0, dtype=np.float64)
+        self.mean = np.zeros(0, dtype=np.float64)
+        self.m2 = np.zeros(0, dtype=np.float64)
+        self.last_time = np.zeros(0, dtype=np.int64)
+        self.max_time = NAT
+        self.time_zone = None
+        self.amount_is_integer = None
+        self.rows_seen = 0
+
+    def customer_codes(self, customer_ids):
+        # Map each row to its customer's state slot, appending slots for customers seen for the first time
+        codes = self.index.get_indexer(customer_ids)
+        is_new = codes == -1
+        if is_new.any():
+            new_customers = pd.unique(customer_ids[is_new])
+            self.index = pd.Index(new_customers) if len(self.index) == 0 else self.index.append(pd.Index(new_customers))
+            n_new = len(new_customers)
+            self.count = np.concatenate([self.count, np.zeros(n_new, dtype=np.int64)])
+            self.nobs = np.concatenate([self.nobs, np.zeros(n_new, dtype=np.int64)])
+            self.sum = np.concatenate([self.sum, np.zeros(n_new)])
+            self.compensation = np.concatenate([self.compensation, np.zeros(n_new)])
+            self.mean = np.concatenate([self.mean, np.zeros(n_new)])
+            self.m2 = np.concatenate([self.m2, np.zeros(n_new)])
+            self.last_time = np.concatenate([self.last_time, np.full(n_new, NAT, dtype=np.int64)])
+            codes = self.index.get_indexer(customer_ids)
+        return codes
+
+    def update_amounts(self, codes, amounts):
+        if getattr(self, 'exact', True):
+            self.update_amounts_exact(codes, amounts)
+        else:
+            self.update_amounts_merged(codes, amounts)
+
+    def update_amounts_exact(self, codes, amounts):
+        # Rank each row within its customer; round k updates every customer's k-th new row at once.
+        # Within a customer the rows are applied in arrival order, which reproduces the sequential
+        # Kahan sum and Welford variance updates pandas' groupby kernels run, bit for bit. The number of
+        # rounds is the busiest customer's row count in the batch
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        group_start = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        group_sizes = np.diff(np.r_[group_start, len(sorted_codes)])
+        rank = np.arange(len(sorted_codes)) - np.repeat(group_start, group_sizes)
+
+        by_rank = order[np.argsort(rank, kind='stable')]
+        round_sizes = np.bincount(rank)
+        round_ends = np.cumsum(round_sizes)
+        for end, size in zip(round_ends, round_sizes):
+            rows = by_rank[end - size:end]
+            c = codes[rows]
+            val = amounts[rows]
+
+            # Kahan-compensated sum
+            y = val - self.compensation[c]
+            t = self.sum[c] + y
+            comp = t - self.sum[c] - y
+            self.compensation[c] = np.where(np.isnan(comp), 0.0, comp)
+            self.sum[c] = t
+
+            # Welford mean and sum of squared deviations
+            self.nobs[c] += 1
+            old_mean = self.mean[c]
+            self.mean[c] = old_mean + (val - old_mean) / self.nobs[c]
+            self.m2[c] += (val - self.mean[c]) * (val - old_mean)
+
+    def update_amounts_merged(self, codes, amounts):
+        # Count, sum and sum of squared deviations per customer over the batch in three bincount passes, then one
+        # vectorised Chan et al. merge into the running state: O(batch rows) however skewed the customers are
+        n_customers = len(self.index)
+        batch_nobs = np.bincount(codes, minlength=n_customers)
+        batch_sum = np.bincount(codes, weights=amounts, minlength=n_customers)
+        c = np.flatnonzero(batch_nobs)
+        batch_mean = np.zeros(n_customers)
+        batch_mean[c] = batch_sum[c] / batch_nobs[c]
+        batch_m2 = np.bincount(codes, weights=(amounts - batch_mean[codes]) ** 2, minlength=n_customers)
+
+        # Kahan-compensated running sum, adding one batch total per customer
+        y = batch_sum[c] - self.compensation[c]
+        t = self.sum[c] + y
+        comp = t - self.sum[c] - y
+        self.compensation[c] = np.where(np.isnan(comp), 0.0, comp)
+        self.sum[c] = t
+
+        # Pairwise merge of the mean and the sum of squared deviations
+        nobs = self.nobs[c] + batch_nobs[c]
+        delta = batch_mean[c] - self.mean[c]
+        self.m2[c] += batch_m2[c] + delta ** 2 * self.nobs[c] * batch_nobs[c] / nobs
+        self.mean[c] += delta * batch_nobs[c] / nobs
+        self.nobs[c] = nobs
+
+    def update(self, batch):
+        # Fold an append-only batch of transactions into the running per-customer state in O(batch rows)
+        batch = batch[batch['CustomerId'].notna()]
+        if batch.empty:
+            return self
+
+        customer_ids = batch['CustomerId'].to_numpy()
+        codes = self.customer_codes(customer_ids)
+
+        # Transaction count, as groupby count of TransactionId
+        has_id = batch['TransactionId'].notna().to_numpy()
+        self.count += np.bincount(codes[has_id], minlength=len(self.index))
+
+        # Amount statistics skip missing amounts, like the groupby reductions
+        amount = batch['Amount']
+        if self.amount_is_integer is None:
+            self.amount_is_integer = pd.api.types.is_integer_dtype(amount)
+        else:
+            self.amount_is_integer = self.amount_is_integer and pd.api.types.is_integer_dtype(amount)
+        amount = amount.to_numpy(dtype=np.float64, na_value=np.nan)
+        has_amount = ~np.isnan(amount)
+        self.update_amounts(codes[has_amount], amount[has_amount])
+
+        # Latest transaction time per customer
+        if 'TransactionStartTime' in batch.columns:
+            times = parse_timestamps(batch['TransactionStartTime'])
+            if self.time_zone is None and times.dt.tz is not None:
+                self.time_zone = str(times.dt.tz)
+            times = times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+            np.maximum.at(self.last_time, codes, times)
+            self.max_time = max(self.max_time, int(times.max()))
+
+        self.rows_seen += len(batch)
+        return self
+
+    def to_datetime(self, values):
+        times = pd.to_datetime(values, unit='ns')
+        if self.time_zone is not None:
+            times = times.tz_localize('UTC').tz_convert(self.time_zone)
+        return times
+
+    def aggregate_frame(self):
+        # Same columns and values as FeatureEngineering.create_aggregate_features' groupby, sorted by CustomerId
+        total = self.sum.astype(np.int64) if self.amount_is_integer else self.sum.copy()
+        nobs = np.where(self.nobs > 0, self.nobs, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = np.where(self.nobs > 1, self.m2 / (self.nobs - 1), np.nan)
+        frame = pd.DataFrame({
+            'CustomerId': self.index,
+            'total_transaction_amount': total,
+            'average_transaction_amount': self.sum / nobs,
+            'transaction_count': self.count,
+            'std_transaction_amount': np.sqrt(variance)
+        })
+        return frame.sort_values('CustomerId', kind='stable').reset_index(drop=True)
+
+    def rfms_frame(self):
+        # Same columns and values as the RFMS.calculate_rfms_features per-customer table, sorted by CustomerId
+        last_time = self.to_datetime(self.last_time)
+        recency = (self.to_datetime([self.max_time])[0] - last_time).days
+
+        # Customers without a parsed timestamp have no Recency: NaN in a float column, as the batch computation gives
+        if not recency.isna().any():
+            recency = recency.astype(np.int64)
+        frame = pd.DataFrame({
+            'CustomerId': self.index,
+            'TransactionStartTime': last_time,
+            'Recency': recency,
+            'Frequency': self.count,
+            'Monetary': self.sum.astype(np.int64) if self.amount_is_integer else self.sum.copy()
+        })
+        frame['Score'] = frame['Frequency'] * frame['Monetary'] / (frame['Recency'] + 1)
+        return frame.sort_values('CustomerId', kind='stable').reset_index(drop=True)
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path):
+        return joblib.load(path)
\ No newline at end of file
@@ -0,0 +1,284 @@
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+import numpy as np
+import pandas as pd
+from process_memory import process_memory, reset_peak_rss
+
+# INSTRUMENTATION_LOG=events.jsonl appends every event to that file.
+# INSTRUMENTATION_PROFILE=cprofile,tracemalloc adds a profile of each outermost call, written to
+# INSTRUMENTATION_PROFILE_DIR, and the top allocation sites
+INSTRUMENTATION_LOG = os.environ.get('INSTRUMENTATION_LOG')
+INSTRUMENTATION_PROFILE = {mode.strip() for mode in os.environ.get('INSTRUMENTATION_PROFILE', '').split(',') if mode.strip()}
+INSTRUMENTATION_PROFILE_DIR = os.environ.get('INSTRUMENTATION_PROFILE_DIR', 'profiles')
+
+# Functions and allocation sites listed in a profiled event
+PROFILE_TOP = 10
+
+# Error messages kept per thread; the count of reported errors keeps growing, the messages don't
+ERROR_HISTORY = 100
+
+class MemorySink:
+    # Keeps events in memory, optionally only the most recent max_events
+    def __init__(self, max_events=None):
+        self.max_events = max_events
+        self.events = []
+        self.lock = threading.Lock()
+
+    def write(self, event):
+        with self.lock:
+            self.events.append(event)
+            if self.max_events is not None and len(self.events) > self.max_events:
+                del self.events[:len(self.events) - self.max_events]
+
+    def frame(self):
+        with self.lock:
+            return pd.DataFrame(self.events)
+
+    def clear(self):
+        with self.lock:
+            self.events = []
+
+class JsonLinesSink:
+    # Appends one JSON object per line; several processes can share the file since each line is one append
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def write(self, event):
+        line = json.dumps(event, default=str) + '\n'
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(line)
+
+class SummarySink:
+    # Running count, error count and latency percentiles per (component, method), over the last `window` calls
+    def __init__(self, window=10000):
+        self.window = window
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def write(self, event):
+        key = (event['component'], event['method'])
+        with self.lock:
+            stats = self.stats.setdefault(key, {'calls': 0, 'errors': 0, 'rows': 0, 'cpu_seconds': None, 'wall': np.zeros(self.window)})
+            stats['wall'][stats['calls'] % self.window] = event['wall_seconds']
+            stats['calls'] += 1
+            stats['errors'] += event['status'] != 'ok'
+            stats['rows'] += event.get('rows_in') or 0
+            if event.get('cpu_seconds') is not None:
+                stats['cpu_seconds'] = (stats['cpu_seconds'] or 0.0) + event['cpu_seconds']
+
+    def summary(self, component=None):
+        summary = {}
+        with self.lock:
+            for (event_component, method), stats in self.stats.items():
+                if component is not None and event_component != component:
+                    continue
+                wall = stats['wall'][:min(stats['calls'], self.window)] * 1000
+                p50, p95, p99 = np.percentile(wall, [50, 95, 99])
+                summary[method if component is not None else f'{event_component}.{method}'] = {
+                    'calls': stats['calls'],
+                    'errors': stats['errors'],
+                    'rows': stats['rows'],
+                    'mean_ms': float(wall.mean()),
+                    'p50_ms': float(p50),
+                    'p95_ms': float(p95),
+                    'p99_ms': float(p99),
+                    'max_ms': float(wall.max()),
+                    'cpu_seconds': stats['cpu_seconds']
+                }
+        return summary
+
+    def clear(self):
+        with self.lock:
+            self.stats = {}
+
+# Every event goes to all registered sinks; with none registered, instrumented methods run unmeasured
+sinks = []
+if INSTRUMENTATION_LOG:
+    sinks.append(JsonLinesSink(INSTRUMENTATION_LOG))
+
+def add_sink(sink):
+    sinks.append(sink)
+    return sink
+
+def remove_sink(sink):
+    if sink in sinks:
+        sinks.remove(sink)
+
+def emit(event):
+    for sink in list(sinks):
+        sink.write(event)
+
+# Calls in progress on this thread, innermost last
+local = threading.local()
+
+def active_calls():
+    if not hasattr(local, 'stack'):
+        local.stack = []
+    return local.stack
+
+def error_count():
+    # Errors reported on this thread so far; pipeline stages compare it before and after a call for swallowed failures
+    return getattr(local, 'error_count', 0)
+
+def errors_since(count):
+    # Messages of the errors reported on this thread since error_count() returned count, oldest first (at most
+    # the last ERROR_HISTORY)
+    n_new = error_count() - count
+    return list(getattr(local, 'recent_errors', ()))[-n_new:] if n_new > 0 else []
+
+def report_error(message, error):
+    # Print as the classes always have, and mark the call in progress as failed
+    print(f"{message}: {error}")
+    if not hasattr(local, 'recent_errors'):
+        local.recent_errors = deque(maxlen=ERROR_HISTORY)
+    local.recent_errors.append(f"{message}: {error}")
+    local.error_count = error_count() + 1
+    stack = active_calls()
+    if stack:
+        stack[-1]['error'] = f"{type(error).__name__}: {error}"
+
+def frame_rows(value):
+    df = getattr(value, 'df', value)
+    return len(df) if isinstance(df, (pd.DataFrame, pd.Series, np.ndarray)) else None
+
+def peak_rss_mb():
+    try:
+        return process_memory()['peak_rss_mb']
+    except OSError:
+        return None
+
+def profile_summary(profiler):
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    rows = []
+    for (filename, line, function), (_, calls, _, cumulative, _) in stats.stats.items():
+        rows.append({'function': f'{os.path.basename(filename)}:{line}({function})', 'calls': calls, 'cumulative_seconds': cumulative})
+    return sorted(rows, key=lambda row: row['cumulative_seconds'], reverse=True)[:PROFILE_TOP]
+
+def allocation_summary(snapshot):
+    return [{'site': str(stat.traceback), 'size_mb': stat.size / 2**20, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:PROFILE_TOP]]
+
+class InstrumentedCall:
+    # Context manager timing one call. Peak memory is the RSS high-water mark above the RSS at entry
+    # (Linux); nested calls pass their peaks up so the outer call still sees them
+    def __init__(self, component, method, rows_in=None, profile=None):
+        self.component = component
+        self.method = method
+        self.rows_in = rows_in
+        self.profile = INSTRUMENTATION_PROFILE if profile is None else set(profile)
+        self.rows_out = None
+
+        # Set on exit: the RSS high-water mark during the call and its rise over the RSS at entry, in MB
+        self.peak_mb = None
+        self.peak_memory_delta_mb = None
+
+    def __enter__(self):
+        stack = active_calls()
+        self.call = {'error': None, 'child_peak_mb': None}
+        if stack:
+            # Hand the parent the peak reached so far before resetting the mark for this call
+            peak = peak_rss_mb()
+            parent = stack[-1]
+            if peak is not None:
+                parent['child_peak_mb'] = max(parent['child_peak_mb'] or 0.0, peak)
+        self.outermost = not stack
+        stack.append(self.call)
+
+        self.profiler = None
+        if 'cprofile' in self.profile and self.outermost:
+            self.profiler = cProfile.Profile()
+        self.tracing = 'tracemalloc' in self.profile and self.outermost and not tracemalloc.is_tracing()
+        if self.tracing:
+            tracemalloc.start()
+
+        self.rss_reset = reset_peak_rss()
+        memory = process_memory() if self.rss_reset else None
+        self.rss_before = memory['rss_mb'] if memory else None
+        self.started_at = time.time()
+        self.wall_start, self.cpu_start = time.perf_counter(), time.process_time()
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profiler is not None:
+            self.profiler.disable()
+        wall, cpu = time.perf_counter() - self.wall_start, time.process_time() - self.cpu_start
+        stack = active_calls()
+        stack.pop()
+
+        peak = peak_rss_mb() if self.rss_reset else None
+        if peak is not None and self.call['child_peak_mb'] is not None:
+            peak = max(peak, self.call['child_peak_mb'])
+        if peak is not None and stack:
+            stack[-1]['child_peak_mb'] = max(stack[-1]['child_peak_mb'] or 0.0, peak)
+
+        self.peak_mb = peak
+        if peak is not None and self.rss_before is not None:
+            self.peak_memory_delta_mb = max(peak - self.rss_before, 0.0)
+
+        error = self.call['error']
+        if exc is not None:
+            error = f"{exc_type.__name__}: {exc}"
+        event = {
+            'event': 'call',
+            'component': self.component,
+            'method': self.method,
+            'started_at': self.started_at,
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'peak_memory_delta_mb': self.peak_memory_delta_mb,
+            'status': 'ok' if error is None else 'error',
+            'error': error,
+            'depth': len(stack),
+            'pid': os.getpid()
+        }
+
+        if self.profiler is not None:
+            os.makedirs(INSTRUMENTATION_PROFILE_DIR, exist_ok=True)
+            path = os.path.join(INSTRUMENTATION_PROFILE_DIR, f'{self.component}.{self.method}.{os.getpid()}.{int(self.started_at * 1000)}.prof')
+            self.profiler.dump_stats(path)
+            event['profile_path'] = path
+            event['top_functions'] = profile_summary(self.profiler)
+        if self.tracing:
+            event['tracemalloc_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+            event['top_allocations'] = allocation_summary(tracemalloc.take_snapshot())
+            tracemalloc.stop()
+
+        emit(event)
+        return False
+
+def instrumented(method, component=None):
+    # Method decorator: rows are len(self.df) before and after the call (or the result's length)
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not sinks:
+            return method(self, *args, **kwargs)
+        rows_in = frame_rows(self) if method.__name__ != '__init__' else frame_rows(args[0] if args else None)
+        with InstrumentedCall(component or type(self).__name__, method.__name__, rows_in) as call:
+            result = method(self, *args, **kwargs)
+            rows_out = frame_rows(self)
+            call.rows_out = rows_out if rows_out is not None else frame_rows(result)
+        return result
+    wrapper.instrumented = True
+    return wrapper
+
+def instrument_class(cls):
+    # Class decorator: instruments __init__ and every public method defined on the class
+    for name, value in list(vars(cls).items()):
+        if callable(value) and (name == '__init__' or not name.startswith('_')) and not getattr(value, 'instrumented', False):
+            setattr(cls, name, instrumented(value, cls.__name__))
+    return cls
\ No newline at end of file
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from aggregation import CustomerGrouping
+
+LABELS = ['Bad', 'Good']
+
+def label_codes(scores, threshold):
+    # 1 ('Good') at or above the threshold; missing scores compare False and are 0 ('Bad'), as with the scalar rule
+    scores = np.asarray(scores, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        return (scores >= threshold).astype(np.int8)
+
+def label_scores(scores, threshold):
+    # Categorical built from the codes, avoiding a Python string object per row
+    return pd.Categorical.from_codes(label_codes(scores, threshold), categories=LABELS)
+
+def customer_scores(df, score_column='Score', weight_column=None):
+    # One score per customer, taken from its first row; Score is constant within a customer after RFMS
+    grouping = CustomerGrouping(df['CustomerId'])
+    codes = grouping.codes[grouping.valid]
+    rows = np.flatnonzero(grouping.valid)
+    _, first = np.unique(codes, return_index=True)
+    scores = df[score_column].to_numpy(dtype=np.float64)[rows[first]]
+
+    # Rows per customer, or an explicit per-customer weight such as Frequency, for transaction-level rates
+    if weight_column is None:
+        weights = np.bincount(codes, minlength=grouping.n_customers).astype(np.float64)
+    else:
+        weights = df[weight_column].to_numpy(dtype=np.float64)[rows[first]]
+    return grouping, scores, weights
+
+def broadcast_labels(grouping, scores, threshold):
+    # Label each customer once and map the codes to its transactions; rows without a customer are 'Bad'
+    codes = label_codes(scores, threshold).take(np.where(grouping.valid, grouping.codes, 0))
+    codes[~grouping.valid] = 0
+    return pd.Categorical.from_codes(codes, categories=LABELS)
+
+def sweep_thresholds(scores, weights=None, thresholds=None, n_thresholds=200):
+    # Sort once; every threshold is then a binary search plus a lookup in the cumulative counts
+    scores = np.asarray(scores, dtype=np.float64)
+    weights = np.ones(len(scores)) if weights is None else np.asarray(weights, dtype=np.float64)
+    missing = np.isnan(scores)
+    order = np.argsort(scores[~missing], kind='stable')
+    sorted_scores = scores[~missing][order]
+    cumulative_weights = np.concatenate([[0.0], np.cumsum(weights[~missing][order])])
+
+    # Default candidates are evenly spaced quantiles of the observed scores
+    if thresholds is None:
+        thresholds = np.unique(np.quantile(sorted_scores, np.linspace(0, 1, n_thresholds))) if len(sorted_scores) else np.array([])
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    # Scores strictly below the threshold are 'Bad'; missing scores are always 'Bad'
+    n_below = np.searchsorted(sorted_scores, thresholds, side='left')
+    n_total, weight_total = len(scores), weights.sum()
+    good_customers = len(sorted_scores) - n_below
+    good_weight = cumulative_weights[-1] - cumulative_weights[n_below]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sweep = pd.DataFrame({
+            'threshold': thresholds,
+            'good_customers': good_customers,
+            'bad_customers': n_total - good_customers,
+            'good_customer_rate': good_customers / n_total,
+            'good_transactions': good_weight,
+            'bad_transactions': weight_total - good_weight,
+            'good_transaction_rate': good_weight / weight_total
+        })
+
+    # Minority-class share at transaction level: the base rate the model is trained on
+    sweep['minority_rate'] = np.minimum(sweep['good_transaction_rate'], 1 - sweep['good_transaction_rate'])
+    return sweep
\ No newline at end of file
@@ -1,26 +1,72 @@
 import pandas as pd
-from sklearn.model_selection import train_test_split, GridSearchCV, RandomizedSearchCV
+from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
 import joblib
-
+from compiled_forest import export_forest
+from data_preprocessing import Preprocessor, preprocessor_path
+from customer_matrix import build_customer_matrix, customer_feature_columns, grouped_train_test_split
+from model_registry import ModelRegistry
+from artifacts import load_artifact
+from dtype_planner import optimize_dtypes
+from streaming import read_projected
+from tuning import TuningEngine
+from woe_binning import WoEBinning, woe_binning_path
+from instrumentation import instrument_class, report_error
+
+FEATURE_COLUMNS = ['Amount', 'Value', 'total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']
+
+# Explicit dtypes for the columns split_data uses
+TRAINING_DTYPES = {
+    'Amount': 'float64',
+    'Value': 'float64',
+    'total_transaction_amount': 'float64',
+    'average_transaction_amount': 'float64',
+    'transaction_count': 'float64',
+    'std_transaction_amount': 'float64',
+    'Label': 'category'
+}
+
+@instrument_class
 class ModelTraining:
-    def __init__(self, data_path):
+    def __init__(self, data_path, chunksize=None, compact_dtypes=False):
         try:
-            self.df = pd.read_csv(data_path)
+            if chunksize is not None:
+                # Streaming mode: read only the model columns, chunk by chunk, with explicit dtypes
+                self.df = read_projected(data_path, chunksize, usecols=list(TRAINING_DTYPES), dtype=TRAINING_DTYPES)
+            else:
+                self.df = load_artifact(data_path)
+                if compact_dtypes:
+                    # Categoricals, integer ID codes and narrower numerics; parses timestamps once
+                    self.df, self.dtype_report = optimize_dtypes(self.df)
             print("Data loaded successfully.")
         except Exception as e:
-            print(f"Error loading data: {e}")
+            report_error("Error loading data", e)
 
-    def split_data(self):
+    def split_data(self, level='transaction', grouped=False, summaries=True):
         try:
-            # Define features and target variable
-            self.X = self.df[['Amount', 'Value', 'total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']]
-            self.y = self.df['Label']
-
-            # Split the data into training and testing sets
-            self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(self.X, self.y, test_size=0.2, random_state=42)
+            self.groups_train = None
+
+            # Fresh splits hold the raw feature values until woe_binning(apply=True) transforms them
+            self.woe_applied = False
+            if level == 'customer':
+                # One row per customer: aggregate and RFMS features plus per-customer transaction summaries
+                self.customer_df = build_customer_matrix(self.df, summaries=summaries)
+                self.X = self.customer_df[customer_feature_columns(self.customer_df)]
+                self.y = self.customer_df['Label']
+                self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(self.X, self.y, test_size=0.2, random_state=42)
+            else:
+                # Define features and target variable
+                self.X = self.df[FEATURE_COLUMNS]
+                self.y = self.df['Label']
+
+                if grouped:
+                    # Keep each customer's transactions on one side so repeated aggregates don't leak into the test set
+                    self.X_train, self.X_test, self.y_train, self.y_test, self.groups_train = grouped_train_test_split(self.X, self.y, self.df['CustomerId'], test_size=0.2, random_state=42)
+                else:
+                    # Split the data into training and testing sets
+                    self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(self.X, self.y, test_size=0.2, random_state=42)
 
             # Display the shapes of the training and testing sets
             print(f"X_train shape: {self.X_train.shape}")
@@ -28,7 +74,30 @@ class ModelTraining:
             print(f"y_train shape: {self.y_train.shape}")
             print(f"y_test shape: {self.y_test.shape}")
         except Exception as e:
-            print(f"Error splitting data: {e}")
+            report_error("Error splitting data", e)
+
+    def woe_binning(self, features=None, max_bins=20, min_bin_share=0.05, n_jobs=-1, apply=False, save_path=None):
+        try:
+            # Fit on the training split only, so the test set's labels don't shape the bins
+            features = features or [col for col in FEATURE_COLUMNS if col in self.X_train.columns]
+            self.woe = WoEBinning(max_bins=max_bins, min_bin_share=min_bin_share, n_jobs=n_jobs).fit(self.X_train, self.y_train, features)
+
+            # Optionally train the models on WoE values instead of the raw features
+            if apply:
+                self.X_train = self.woe.transform(self.X_train)
+                self.X_test = self.woe.transform(self.X_test)
+                self.woe_applied = True
+
+            # The fitted bins are what the API needs to apply the same transform
+            if save_path is not None:
+                self.woe.save(save_path)
+                print(f"WoE binning saved successfully as {save_path}")
+
+            print("Information Value by feature:")
+            print(self.woe.iv_)
+            return self.woe.iv_
+        except Exception as e:
+            report_error("Error in WoE binning", e)
 
     def train_logistic_regression(self):
         try:
@@ -40,7 +109,7 @@ class ModelTraining:
             self.y_pred_log_reg = self.log_reg.predict(self.X_test)
             print("Logistic Regression model trained successfully.")
         except Exception as e:
-            print(f"Error training Logistic Regression model: {e}")
+            report_error("Error training Logistic Regression model", e)
 
     def train_random_forest(self):
         try:
@@ -52,9 +121,9 @@ class ModelTraining:
             self.y_pred_rf = self.rf.predict(self.X_test)
             print("Random Forest model trained successfully.")
         except Exception as e:
-            print(f"Error training Random Forest model: {e}")
+            report_error("Error training Random Forest model", e)
 
-    def hyperparameter_tuning_log_reg(self):
+    def hyperparameter_tuning_log_reg(self, n_jobs=1, cache_dir=None):
         try:
             # Define the parameter grid for Logistic Regression
             param_grid_log_reg = {
@@ -62,17 +131,19 @@ class ModelTraining:
                 'solver': ['liblinear', 'lbfgs']
             }
 
-            # Initialize Grid Search
-            grid_search_log_reg = GridSearchCV(LogisticRegression(random_state=42), param_grid_log_reg, cv=5, scoring='accuracy')
-            grid_search_log_reg.fit(self.X_train, self.y_train)
+            # Search the full grid across a process pool with successive halving
+            self.log_reg_tuning = TuningEngine(LogisticRegression(random_state=42), param_grid_log_reg, cv=5, scoring='accuracy', n_jobs=n_jobs, cache_dir=cache_dir)
+            self.log_reg_tuning.fit(self.X_train, self.y_train, groups=getattr(self, 'groups_train', None))
+            self.best_log_reg = self.log_reg_tuning.best_estimator_
 
             # Best parameters and score
-            print(f"Best parameters for Logistic Regression: {grid_search_log_reg.best_params_}")
-            print(f"Best score for Logistic Regression: {grid_search_log_reg.best_score_}")
+            print(f"Best parameters for Logistic Regression: {self.log_reg_tuning.best_params_}")
+            print(f"Best score for Logistic Regression: {self.log_reg_tuning.best_score_}")
+            return self.log_reg_tuning.results_
         except Exception as e:
-            print(f"Error in hyperparameter tuning for Logistic Regression: {e}")
+            report_error("Error in hyperparameter tuning for Logistic Regression", e)
 
-    def hyperparameter_tuning_rf(self):
+    def hyperparameter_tuning_rf(self, n_jobs=1, cache_dir=None):
         try:
             # Define the parameter grid for Random Forest
             param_grid_rf = {
@@ -82,15 +153,17 @@ class ModelTraining:
                 'min_samples_leaf': [1, 2, 4]
             }
 
-            # Initialize Random Search
-            random_search_rf = RandomizedSearchCV(RandomForestClassifier(random_state=42), param_grid_rf, n_iter=10, cv=5, scoring='accuracy', random_state=42)
-            random_search_rf.fit(self.X_train, self.y_train)
+            # Sample 10 candidates and race them across a process pool with successive halving
+            self.rf_tuning = TuningEngine(RandomForestClassifier(random_state=42), param_grid_rf, n_candidates=10, cv=5, scoring='accuracy', n_jobs=n_jobs, cache_dir=cache_dir)
+            self.rf_tuning.fit(self.X_train, self.y_train, groups=getattr(self, 'groups_train', None))
+            self.best_rf = self.rf_tuning.best_estimator_
 
             # Best parameters and score
-            print(f"Best parameters for Random Forest: {random_search_rf.best_params_}")
-            print(f"Best score for Random Forest: {random_search_rf.best_score_}")
+            print(f"Best parameters for Random Forest: {self.rf_tuning.best_params_}")
+            print(f"Best score for Random Forest: {self.rf_tuning.best_score_}")
+            return self.rf_tuning.results_
         except Exception as e:
-            print(f"Error in hyperparameter tuning for Random Forest: {e}")
+            report_error("Error in hyperparameter tuning for Random Forest", e)
 
     def evaluate_models(self):
         try:
@@ -116,13 +189,48 @@ class ModelTraining:
             })
 
             # Display the results
+            self.evaluation_results = results
             print(results)
         except Exception as e:
-            print(f"Error evaluating models: {e}")
+            report_error("Error evaluating models", e)
 
-    def save_model(self, model, filename):
+    def save_model(self, model, filename, compiled_dir=None, registry_dir=None, name='random_forest', preprocessor=None, woe_binning=None):
         try:
-            joblib.dump(model, filename)
-            print(f"Model saved successfully as {filename}")
+            # The preprocessor fitted by FeatureEngineering, or the path it was saved to
+            if isinstance(preprocessor, str):
+                preprocessor = Preprocessor.load(preprocessor)
+
+            # The WoE bins the model's inputs go through: given explicitly, or the ones woe_binning(apply=True)
+            # transformed the training data with
+            if isinstance(woe_binning, str):
+                woe_binning = WoEBinning.load(woe_binning)
+            elif woe_binning is None and getattr(self, 'woe_applied', False):
+                woe_binning = self.woe
+
+            if filename is not None:
+                joblib.dump(model, filename)
+                print(f"Model saved successfully as {filename}")
+
+                # Saved next to the model so the API finds it from MODEL_PATH
+                if preprocessor is not None:
+                    preprocessor.save(preprocessor_path(filename))
+                    print(f"Preprocessor saved successfully as {preprocessor_path(filename)}")
+                if woe_binning is not None:
+                    woe_binning.save(woe_binning_path(filename))
+                    print(f"WoE binning saved successfully as {woe_binning_path(filename)}")
+
+            # Optionally export a random forest as flat NumPy arrays for the fast inference path
+            if compiled_dir is not None:
+                export_forest(model, compiled_dir)
+                print(f"Compiled model exported successfully to {compiled_dir}")
+
+            # Optionally register a new version, with its training context, and make it the current one
+            if registry_dir is not None:
+                metadata = {'feature_columns': list(self.X_train.columns) if hasattr(self, 'X_train') else None,
+                            'training_rows': len(self.X_train) if hasattr(self, 'X_train') else None}
+                if hasattr(self, 'evaluation_results'):
+                    metadata['evaluation'] = self.evaluation_results.set_index('Metric').to_dict()
+                version = ModelRegistry(registry_dir).register(model, name=name, metadata=metadata, compiled=compiled_dir is not None, preprocessor=preprocessor, woe_binning=woe_binning)
+                print(f"Model registered as {name} {version} in {registry_dir}")
         except Exception as e:
-            print(f"Error saving model: {e}")
\ No newline at end of file
+            report_error("Error saving model", e)
\ No newline at end of file
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import joblib
+import sklearn
+from compiled_forest import CompiledForest, export_forest
+from data_preprocessing import Preprocessor
+from woe_binning import WoEBinning
+
+# metadata.json fields register() fills in itself; the rest is the caller's training context
+GENERATED_FIELDS = ['name', 'version', 'created_at', 'model_class', 'classes', 'feature_names', 'n_features', 'sklearn_version',
+                    'sha256', 'compiled', 'preprocessor', 'woe_binning']
+
+def is_version(version):
+    return isinstance(version, str) and version.isascii() and version.startswith('v') and version[1:].isdigit()
+
+class ModelRegistry:
+    def __init__(self, root):
+        # Layout: <root>/<name>/<version>/{model.pkl, metadata.json, compiled/, preprocessor.pkl, woe_binning.pkl} plus <root>/<name>/current.json
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def model_dir(self, name):
+        return os.path.join(self.root, name)
+
+    def version_dir(self, name, version):
+        # Versions are v<digits>; anything else (e.g. '../x' from a request) never becomes a path
+        if not is_version(version):
+            raise KeyError(f"Model {name} has no version {version}")
+        return os.path.join(self.model_dir(name), version)
+
+    def versions(self, name):
+        if not os.path.isdir(self.model_dir(name)):
+            return []
+        return sorted(entry for entry in os.listdir(self.model_dir(name)) if is_version(entry))
+
+    def resolve_version(self, name, version=None):
+        # The requested version when it is registered, or the current one; unknown versions are never loaded
+        version = version or self.current_version(name)
+        if version not in self.versions(name):
+            raise KeyError(f"Model {name} has no version {version}")
+        return version
+
+    def next_version(self, name):
+        versions = self.versions(name)
+        return f'v{int(versions[-1][1:]) + 1:04d}' if versions else 'v0001'
+
+    def register(self, model, name='random_forest', metadata=None, compiled=False, promote=True, preprocessor=None, woe_binning=None):
+        os.makedirs(self.model_dir(name), exist_ok=True)
+
+        # Build the version in a scratch directory next to its final place, then rename it in one step
+        staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=self.model_dir(name))
+        try:
+            # Uncompressed so the arrays inside can be memory-mapped on load
+            model_path = os.path.join(staging_dir, 'model.pkl')
+            joblib.dump(model, model_path)
+            if compiled:
+                export_forest(model, os.path.join(staging_dir, 'compiled'))
+
+            # The fitted preprocessing travels with the model it was trained with
+            if preprocessor is not None:
+                preprocessor.save(os.path.join(staging_dir, 'preprocessor.pkl'))
+            if woe_binning is not None:
+                woe_binning.save(os.path.join(staging_dir, 'woe_binning.pkl'))
+
+            with open(model_path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            info = {
+                'name': name,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'model_class': type(model).__name__,
+                'classes': model.classes_.tolist() if hasattr(model, 'classes_') else None,
+                'feature_names': model.feature_names_in_.tolist() if hasattr(model, 'feature_names_in_') else None,
+                'n_features': int(model.n_features_in_) if hasattr(model, 'n_features_in_') else None,
+                'sklearn_version': sklearn.__version__,
+                'sha256': digest,
+                'compiled': compiled,
+                'preprocessor': preprocessor is not None,
+                'woe_binning': woe_binning is not None,
+                **(metadata or {})
+            }
+
+            # Another writer may take a version number first; retry with the next one
+            while True:
+                version = self.next_version(name)
+                info['version'] = version
+                with open(os.path.join(staging_dir, 'metadata.json'), 'w') as f:
+                    json.dump(info, f, indent=2, default=str)
+                try:
+                    os.rename(staging_dir, self.version_dir(name, version))
+                    break
+                except OSError:
+                    if not os.path.exists(self.version_dir(name, version)):
+                        raise
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        if promote:
+            self.promote(name, version)
+        return version
+
+    def promote(self, name, version):
+        if version not in self.versions(name):
+            raise KeyError(f"Model {name} has no version {version}")
+
+        # Write then rename so readers never see a half-written pointer
+        pointer = os.path.join(self.model_dir(name), 'current.json')
+        tmp_path = f'{pointer}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': version}, f)
+        os.replace(tmp_path, pointer)
+
+    def current_version(self, name):
+        # The promoted version, or the newest one when nothing has been promoted
+        pointer = os.path.join(self.model_dir(name), 'current.json')
+        if os.path.exists(pointer):
+            with open(pointer) as f:
+                return json.load(f)['version']
+        versions = self.versions(name)
+        if not versions:
+            raise KeyError(f"No versions registered for model {name}")
+        return versions[-1]
+
+    def metadata(self, name, version=None):
+        version = self.resolve_version(name, version)
+        with open(os.path.join(self.version_dir(name, version), 'metadata.json')) as f:
+            return json.load(f)
+
+    def load(self, name, version=None, mmap_mode=None, backend='sklearn'):
+        # mmap_mode='r' maps the stored arrays read-only, so processes loading the same version share their pages
+        version = self.resolve_version(name, version)
+        path = self.version_dir(name, version)
+        if backend == 'compiled':
+            model = CompiledForest.load(os.path.join(path, 'compiled'), mmap_mode=mmap_mode)
+        else:
+            model = joblib.load(os.path.join(path, 'model.pkl'), mmap_mode=mmap_mode)
+        return model, self.metadata(name, version)
+
+    def load_preprocessor(self, name, version=None):
+        # None for versions registered without one
+        version = self.resolve_version(name, version)
+        path = os.path.join(self.version_dir(name, version), 'preprocessor.pkl')
+        return Preprocessor.load(path) if os.path.exists(path) else None
+
+    def load_woe_binning(self, name, version=None):
+        # The WoE bins of a model trained on WoE values; None for versions trained on the raw features
+        version = self.resolve_version(name, version)
+        path = os.path.join(self.version_dir(name, version), 'woe_binning.pkl')
+        return WoEBinning.load(path) if os.path.exists(path) else None
+
+    def register_compiled(self, name, version=None):
+        # Versions never change once renamed into place, so a version without a compiled export is registered again
+        # as a new version with one, carrying its preprocessing and metadata, and promoted if it was the current one
+        version = self.resolve_version(name, version)
+        info = self.metadata(name, version)
+        if info.get('compiled'):
+            return version
+        model, _ = self.load(name, version)
+        metadata = {key: value for key, value in info.items() if key not in GENERATED_FIELDS}
+        metadata['compiled_from'] = version
+        return self.register(model, name=name, metadata=metadata, compiled=True, promote=version == self.current_version(name),
+                             preprocessor=self.load_preprocessor(name, version), woe_binning=self.load_woe_binning(name, version))
\ No newline at end of file
@@ -0,0 +1,100 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from instrumentation import error_count, errors_since
+
+# Column carrying each row's position in the input, so partition outputs can be put back in input order
+ROW_COLUMN = '__row'
+
+def partition_ids(customer_ids, n_partitions):
+    # Stable hash of the customer ID: the same customer always lands in the same partition, in every process and run
+    hashes = pd.util.hash_pandas_object(pd.Series(customer_ids).astype(str), index=False).to_numpy()
+    return (hashes % np.uint64(n_partitions)).astype(np.int64)
+
+def shared_directory():
+    # Partitions are exchanged as Arrow IPC files; on Linux /dev/shm keeps them in memory and workers map them
+    return '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+def write_table(table, path):
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+def read_table(path):
+    # Memory-mapped: the Arrow buffers point straight into the shared file
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+def write_frame(df, path):
+    return write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+
+def write_partitions(df, partitions, n_partitions, directory):
+    # One Arrow conversion of the whole frame, then one gather per partition; rows keep their input order within a partition
+    frame = df.reset_index(drop=True)
+    frame[ROW_COLUMN] = np.arange(len(frame))
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    order = np.argsort(partitions, kind='stable')
+    bounds = np.searchsorted(partitions[order], np.arange(n_partitions + 1))
+    paths = []
+    for k in range(n_partitions):
+        if bounds[k + 1] > bounds[k]:
+            paths.append(write_table(table.take(order[bounds[k]:bounds[k + 1]]), os.path.join(directory, f'input_{k}.arrow')))
+    return paths
+
+def run_partition(cls, input_path, steps, tables=()):
+    # Runs in a worker: rebuild the frame from the shared file, run the steps, write the results back as Arrow files
+    df = read_table(input_path).to_pandas()
+    instance = cls(None, df=df)
+
+    # The class methods log and swallow their exceptions through report_error; a step that logged one has failed,
+    # and raising here hands the failure to the parent instead of a partition with missing or NaN columns
+    for method, kwargs in steps:
+        n_errors = error_count()
+        getattr(instance, method)(**kwargs)
+        if error_count() > n_errors:
+            raise RuntimeError(f"Step '{method}' failed on partition {os.path.basename(input_path)}: {errors_since(n_errors)}")
+    output_path = input_path.replace('input_', 'output_')
+    outputs = {'df': write_frame(instance.df, output_path)}
+    for name in tables:
+        outputs[name] = write_frame(getattr(instance, name), output_path.replace('.arrow', f'_{name}.arrow'))
+    return outputs
+
+def concat_outputs(paths):
+    # Columns are widened where partitions differ (int64 in one, float64 with NaN in another), and categoricals
+    # come back with per-partition dictionaries, unified so the concatenated columns stay categorical
+    return pa.concat_tables([read_table(path) for path in paths], promote_options='permissive').unify_dictionaries().to_pandas()
+
+def run_partitioned(cls, df, steps, n_workers=None, n_partitions=None, tables=(), columns=None):
+    # Hash-partitions df by CustomerId and runs cls's methods on each partition in a process pool. Only
+    # customer-local steps belong here: their partition outputs are complete and are simply concatenated.
+    # Rows come back in input order whatever the number of workers or partitions
+    n_workers = n_workers or os.cpu_count()
+    n_partitions = n_partitions or n_workers
+    partitions = partition_ids(df['CustomerId'], n_partitions)
+
+    # columns: only these are shipped to the workers; the other columns of df are kept as they are
+    shipped = df if columns is None else df[[col for col in columns if col in df.columns]]
+
+    with tempfile.TemporaryDirectory(prefix='partitions-', dir=shared_directory()) as directory:
+        input_paths = write_partitions(shipped, partitions, n_partitions, directory)
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(input_paths)) or 1) as executor:
+            futures = [executor.submit(run_partition, cls, path, steps, tables) for path in input_paths]
+            outputs = [future.result() for future in futures]
+
+        result = concat_outputs([output['df'] for output in outputs])
+        positions = result.pop(ROW_COLUMN).to_numpy()
+        result = result.take(np.argsort(positions, kind='stable'))
+        result.index = df.index[np.sort(positions)]
+        extra = {name: concat_outputs([output[name] for output in outputs]) for name in tables}
+
+    if columns is not None:
+        # New and rewritten columns go onto df where serial steps would have put them
+        merged = df.copy(deep=False)
+        for col in result.columns:
+            merged[col] = result[col].array
+        result = merged
+    return result, extra
\ No newline at end of file
@@ -0,0 +1,238 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import pandas as pd
+from instrumentation import InstrumentedCall, error_count, errors_since
+
+# tracemalloc is process-global, so thread-mode stages that measure memory take turns
+TRACEMALLOC_LOCK = threading.Lock()
+
+def file_digest(path):
+    # Content hash of a file, or of every file under a directory
+    digest = hashlib.blake2b(digest_size=16)
+    paths = [path]
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    for file_path in paths:
+        digest.update(os.path.relpath(file_path, path).encode())
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+def module_files(func):
+    # Source files of the function's module and of every module it reaches through module globals, kept to the
+    # function's own directory: the project code it calls, not the installed packages
+    root = os.path.dirname(os.path.abspath(inspect.getfile(func)))
+    files, pending = {}, [sys.modules.get(func.__module__)]
+    while pending:
+        module = pending.pop()
+        path = getattr(module, '__file__', None)
+        if path is None or module.__name__ in files or os.path.dirname(os.path.abspath(path)) != root:
+            continue
+        files[module.__name__] = path
+        for value in vars(module).values():
+            pending.append(value if inspect.ismodule(value) else sys.modules.get(getattr(value, '__module__', None) or ''))
+    return [files[name] for name in sorted(files)]
+
+def measured_call(func, kwargs, measure_memory):
+    # Runs the stage and reports wall time, CPU time and peak memory. The scripts/ classes log and swallow their
+    # exceptions through report_error, so a stage that logged one has failed even though it returned
+    n_errors = error_count()
+    if measure_memory == 'tracemalloc':
+        tracemalloc.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        if measure_memory == 'rss':
+            # The same RSS high-water mark the instrumented classes reset and read, so the stage is the outermost
+            # call and the peaks of the instrumented methods inside it are passed up to it (Linux)
+            with InstrumentedCall('pipeline', func.__name__, profile=()) as call:
+                func(**kwargs)
+        else:
+            func(**kwargs)
+        stats = {
+            'wall_seconds': time.perf_counter() - wall_start,
+            'cpu_seconds': time.process_time() - cpu_start,
+            'peak_memory_mb': None
+        }
+        if measure_memory == 'tracemalloc':
+            stats['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+        elif measure_memory == 'rss':
+            stats['peak_memory_mb'] = call.peak_mb
+            stats['peak_memory_increase_mb'] = call.peak_memory_delta_mb
+    finally:
+        if measure_memory == 'tracemalloc':
+            tracemalloc.stop()
+    if error_count() > n_errors:
+        raise RuntimeError(f"Stage reported errors: {errors_since(n_errors)}")
+    return stats
+
+def run_stage_function(func, kwargs, measure_memory):
+    # Runs in the worker; thread-mode stages measuring with tracemalloc run one at a time so peaks don't mix
+    if measure_memory == 'tracemalloc':
+        with TRACEMALLOC_LOCK:
+            return measured_call(func, kwargs, measure_memory)
+    return measured_call(func, kwargs, measure_memory)
+
+class Stage:
+    def __init__(self, name, func, inputs=None, outputs=None, params=None):
+        # inputs and outputs map the function's keyword arguments to file paths
+        self.name = name
+        self.func = func
+        self.inputs = inputs or {}
+        self.outputs = outputs or {}
+        self.params = params or {}
+
+    def source_hash(self):
+        # The stage function's source plus every project module it calls into, so editing FeatureEngineering,
+        # RFMS or ModelTraining invalidates the stages that use them
+        try:
+            source = inspect.getsource(self.func)
+            files = module_files(self.func)
+        except (OSError, TypeError):
+            source, files = f'{self.func.__module__}.{self.func.__qualname__}', []
+        digest = hashlib.blake2b(source.encode(), digest_size=16)
+        for path in files:
+            digest.update(file_digest(path).encode())
+        return digest.hexdigest()
+
+class Pipeline:
+    def __init__(self, stages, cache_dir, max_workers=2, executor='process', measure_memory=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.executor = executor
+
+        # None measures each stage's peak RSS in process mode, where every stage has its own worker, and leaves thread
+        # stages unmeasured so independent ones overlap. True also measures thread stages, with tracemalloc, which is
+        # process-global and so runs them one at a time. False never measures
+        self.measure_memory = measure_memory
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # A stage depends on every stage that produces one of its inputs
+        producers = {path: stage.name for stage in stages for path in stage.outputs.values()}
+        self.dependencies = {
+            stage.name: sorted({producers[path] for path in stage.inputs.values() if path in producers} - {stage.name})
+            for stage in stages
+        }
+        self.check_acyclic()
+
+    def check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a dependency cycle through stage '{name}'")
+            visiting.add(name)
+            for dependency in self.dependencies[name]:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def manifest_path(self, name):
+        return os.path.join(self.cache_dir, f'{name}.json')
+
+    def fingerprint(self, stage):
+        # Inputs by content, plus parameters and the stage function's source
+        for path in stage.inputs.values():
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Stage '{stage.name}' input not found: {path}")
+        payload = json.dumps({
+            'stage': stage.name,
+            'function': stage.source_hash(),
+            'params': {k: repr(v) for k, v in sorted(stage.params.items())},
+            'inputs': {k: file_digest(path) for k, path in sorted(stage.inputs.items())},
+            'outputs': sorted(stage.outputs.items())
+        }, sort_keys=True)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def is_cached(self, stage, fingerprint):
+        if not os.path.exists(self.manifest_path(stage.name)):
+            return False
+        with open(self.manifest_path(stage.name)) as f:
+            manifest = json.load(f)
+        if manifest.get('fingerprint') != fingerprint:
+            return False
+
+        # Outputs must still be there and unchanged since the stage wrote them
+        for path, digest in manifest.get('outputs', {}).items():
+            if not os.path.exists(path) or file_digest(path) != digest:
+                return False
+        return True
+
+    def record(self, stage, fingerprint):
+        missing = [path for path in stage.outputs.values() if not os.path.exists(path)]
+        if missing:
+            raise RuntimeError(f"Stage '{stage.name}' did not produce {missing}")
+        manifest = {'fingerprint': fingerprint, 'outputs': {path: file_digest(path) for path in stage.outputs.values()}}
+        with open(self.manifest_path(stage.name), 'w') as f:
+            json.dump(manifest, f)
+
+    def make_executor(self):
+        if self.executor == 'thread':
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+        # One fresh process per stage keeps each stage's peak RSS separate
+        return ProcessPoolExecutor(max_workers=self.max_workers, max_tasks_per_child=1)
+
+    def run(self, force=False):
+        measure_memory = None
+        if self.executor == 'thread':
+            measure_memory = 'tracemalloc' if self.measure_memory else None
+        elif self.measure_memory is not False:
+            measure_memory = 'rss'
+        remaining = dict(self.dependencies)
+        finished = set()
+        running = {}
+        report = []
+
+        with self.make_executor() as pool:
+            while remaining or running:
+                # Start every stage whose dependencies have finished
+                ready = [name for name, deps in remaining.items() if all(dep in finished for dep in deps)]
+                for name in ready:
+                    del remaining[name]
+                    stage = self.stages[name]
+                    fingerprint = self.fingerprint(stage)
+                    if not force and self.is_cached(stage, fingerprint):
+                        report.append({'stage': name, 'status': 'cached', 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_memory_mb': None})
+                        finished.add(name)
+                        continue
+                    # Drop the old manifest first so a stage that fails part-way is never taken as cached
+                    if os.path.exists(self.manifest_path(name)):
+                        os.remove(self.manifest_path(name))
+                    kwargs = {**stage.params, **stage.inputs, **stage.outputs}
+                    future = pool.submit(run_stage_function, stage.func, kwargs, measure_memory)
+                    running[future] = (name, fingerprint)
+
+                if ready and not running:
+                    # Cached stages may have unblocked others without anything running
+                    continue
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, fingerprint = running.pop(future)
+                    try:
+                        stats = future.result()
+                    except Exception as e:
+                        raise RuntimeError(f"Stage '{name}' failed: {e}") from e
+                    self.record(self.stages[name], fingerprint)
+                    report.append({'stage': name, 'status': 'ran', **stats})
+                    finished.add(name)
+
+        self.report_ = pd.DataFrame(report)
+        print("### Pipeline Report ###")
+        print(self.report_.to_string(index=False))
+        return self.report_
\ No newline at end of file
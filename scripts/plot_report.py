@@ -0,0 +1,211 @@
+import base64
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from dtype_planner import numeric_columns
+
+# Figures are described by small specs holding pre-aggregated data (bin counts, count tables, 2D grids),
+# so workers receive kilobytes instead of the rows, and rendered off-screen with the Agg canvas
+
+EDA_NUMERICAL_FEATURES = ['Amount', 'Value']
+EDA_COUNT_FEATURES = ['CountryCode', 'PricingStrategy', 'FraudResult']
+EDA_CATEGORICAL_FEATURES = ['CurrencyCode', 'ProviderId', 'ProductId', 'ProductCategory', 'ChannelId']
+RFMS_COLUMNS = ['Recency', 'Frequency', 'Monetary', 'Score']
+
+def histogram_table(values, bins=50, weights=None):
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    counts, edges = np.histogram(values[present], bins=bins, weights=None if weights is None else np.asarray(weights)[present])
+    return counts, edges
+
+def count_table(series):
+    counts = series.value_counts(dropna=True)
+    counts = counts[counts > 0].sort_index()
+    return [str(label) for label in counts.index], counts.to_numpy()
+
+def box_stats(values, label, whisker=1.5):
+    # Box plot statistics for Axes.bxp from one quantile call, with the outlier count
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    lower, upper = q1 - whisker * (q3 - q1), q3 + whisker * (q3 - q1)
+    inside = values[(values >= lower) & (values <= upper)]
+    outliers = int(len(values) - len(inside))
+    return {'label': label, 'med': median, 'q1': q1, 'q3': q3, 'whislo': inside.min(), 'whishi': inside.max(), 'fliers': []}, outliers
+
+def density_grid(x, y, bins=200, values=None):
+    # Datashader-style binning: point counts per cell and, with values, their mean per cell
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    present = ~(np.isnan(x) | np.isnan(y))
+    counts, xedges, yedges = np.histogram2d(x[present], y[present], bins=bins)
+    means = None
+    if values is not None:
+        totals, _, _ = np.histogram2d(x[present], y[present], bins=[xedges, yedges], weights=np.asarray(values, dtype=np.float64)[present])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, totals / counts, np.nan)
+    return counts, means, xedges, yedges
+
+def draw_figure(spec):
+    figure = Figure(figsize=spec.get('figsize', (8, 5)))
+    ax = figure.subplots()
+    kind = spec['kind']
+    if kind == 'histogram':
+        edges = spec['edges']
+        ax.bar(edges[:-1], spec['counts'], width=np.diff(edges), align='edge', color='skyblue', edgecolor='black')
+    elif kind == 'counts':
+        ax.bar(np.arange(len(spec['labels'])), spec['counts'], color='#8fbcd4', edgecolor='black')
+        ax.set_xticks(np.arange(len(spec['labels'])), spec['labels'], rotation=45, ha='right')
+    elif kind == 'density':
+        # Empty cells stay blank; colour is the mean value per cell, or the log point count
+        grid = spec['means'] if spec.get('means') is not None else np.log1p(spec['counts'])
+        grid = np.ma.masked_where(spec['counts'] == 0, grid)
+        xedges, yedges = spec['xedges'], spec['yedges']
+        image = ax.imshow(grid.T, origin='lower', aspect='auto', cmap='coolwarm', interpolation='nearest',
+                          extent=[xedges[0], xedges[-1], yedges[0], yedges[-1]])
+        figure.colorbar(image, ax=ax, label=spec.get('colorbar', 'log(1 + count)'))
+    elif kind == 'heatmap':
+        matrix = spec['matrix']
+        image = ax.imshow(matrix, cmap='Blues', vmin=-1, vmax=1)
+        ax.set_xticks(np.arange(len(spec['labels'])), spec['labels'], rotation=45, ha='right')
+        ax.set_yticks(np.arange(len(spec['labels'])), spec['labels'])
+        for i in range(matrix.shape[0]):
+            for j in range(matrix.shape[1]):
+                ax.text(j, i, f'{matrix[i, j]:.2f}', ha='center', va='center', fontsize=8)
+        figure.colorbar(image, ax=ax, shrink=0.8)
+    elif kind == 'box':
+        ax.bxp(spec['stats'], showfliers=False)
+    else:
+        raise ValueError(f"Unknown figure kind '{kind}'")
+    ax.set_title(spec['title'])
+    ax.set_xlabel(spec.get('xlabel', ''))
+    ax.set_ylabel(spec.get('ylabel', ''))
+    if kind in ('histogram', 'counts', 'box'):
+        ax.grid(True)
+    figure.tight_layout()
+    return figure
+
+def render_figure(spec, path, dpi=100):
+    # Runs in a worker process; Figure draws through the Agg canvas without touching pyplot state
+    draw_figure(spec).savefig(path, dpi=dpi)
+    return path
+
+def render_figures(specs, figure_dir, n_jobs=None, dpi=100):
+    os.makedirs(figure_dir, exist_ok=True)
+    paths = [os.path.join(figure_dir, f"{i:02d}_{spec['name']}.png") for i, spec in enumerate(specs)]
+    n_jobs = n_jobs or os.cpu_count()
+    if n_jobs == 1 or len(specs) <= 1:
+        return [render_figure(spec, path, dpi) for spec, path in zip(specs, paths)]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(specs))) as executor:
+        return list(executor.map(render_figure, specs, paths, [dpi] * len(specs)))
+
+def write_html(sections, paths, html_path, title):
+    # One self-contained file: figures are embedded as base64 PNGs next to the section tables
+    parts = [f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>",
+             "<style>body{font-family:sans-serif;margin:2em;max-width:1200px} img{max-width:100%} "
+             "table{border-collapse:collapse;font-size:0.85em;margin:1em 0} td,th{border:1px solid #ccc;padding:2px 6px}</style>",
+             f"</head><body><h1>{html.escape(title)}</h1>"]
+    paths = iter(paths)
+    for section in sections:
+        parts.append(f"<h2>{html.escape(section['title'])}</h2>")
+        for name, table in section.get('tables', {}).items():
+            parts.append(f"<h3>{html.escape(name)}</h3>")
+            parts.append(table.to_html(float_format=lambda value: f'{value:.4g}'))
+        for spec in section.get('figures', []):
+            with open(next(paths), 'rb') as f:
+                encoded = base64.b64encode(f.read()).decode('ascii')
+            parts.append(f"<figure><img src='data:image/png;base64,{encoded}' alt='{html.escape(spec['title'])}'></figure>")
+    parts.append("</body></html>")
+    with open(html_path, 'w') as f:
+        f.write('\n'.join(parts))
+    return html_path
+
+def build_report(sections, output_dir, title='Report', n_jobs=None, dpi=100):
+    # Renders every figure in a process pool, then writes report.html with the figures in section order
+    specs = [spec for section in sections for spec in section.get('figures', [])]
+    paths = render_figures(specs, os.path.join(output_dir, 'figures'), n_jobs, dpi)
+    return write_html(sections, paths, os.path.join(output_dir, 'report.html'), title)
+
+def profile_histogram(profile, col, bins=50):
+    # Histogram from the quantile sketch: each retained item stands for its weight in rows
+    items, cumulative = profile.sketches[col].weighted_items()
+    return histogram_table(items, bins, np.diff(cumulative, prepend=0.0))
+
+def eda_sections(df=None, profile=None, dtype_plan=None, bins=50):
+    # Sections for EDA: from the frame, or from a DataProfile when the data was profiled out of core
+    if profile is not None:
+        columns, numeric = profile.columns, profile.numeric
+        numerical_summary, categorical_summary = profile.numerical_summary(), profile.categorical_summary()
+        missing, correlation = profile.missing_values(), profile.correlation()
+    else:
+        columns, numeric = list(df.columns), numeric_columns(df, dtype_plan)
+        numerical_summary, categorical_summary = df[numeric].describe(), df.describe(include=['object', 'category'])
+        missing, correlation = df.isnull().sum(), df[numeric].corr()
+
+    def counts_for(col):
+        if profile is None:
+            return count_table(df[col])
+        counts = profile.value_counts[col].counts
+        if counts is None:
+            return None
+        counts = counts.sort_index()
+        return [str(label) for label in counts.index], counts.to_numpy()
+
+    distributions = []
+    for col in [col for col in EDA_NUMERICAL_FEATURES if col in numeric]:
+        counts, edges = profile_histogram(profile, col, bins) if profile is not None else histogram_table(df[col], bins)
+        distributions.append({'kind': 'histogram', 'name': f'hist_{col}', 'title': f'Distribution of {col}', 'xlabel': col, 'ylabel': 'Frequency', 'counts': counts, 'edges': edges})
+    categorical = []
+    for target, features in ((distributions, EDA_COUNT_FEATURES), (categorical, EDA_CATEGORICAL_FEATURES)):
+        for col in [col for col in features if col in columns]:
+            table = counts_for(col)
+            if table is not None:
+                target.append({'kind': 'counts', 'name': f'counts_{col}', 'title': f'Distribution of {col} (Unique values: {len(table[0])})',
+                               'xlabel': col, 'ylabel': 'Count', 'labels': table[0], 'counts': table[1]})
+
+    boxes, outlier_counts = [], {}
+    for col in numeric:
+        if profile is not None:
+            stats, outlier_counts[col] = profile.box_stats(col), profile.outliers(col)['count']
+        else:
+            stats, outlier_counts[col] = box_stats(df[col], col)
+        boxes.append({'kind': 'box', 'name': f'box_{col}', 'title': f'Box Plot of {col} ({outlier_counts[col]} outliers)', 'ylabel': col, 'stats': [stats], 'figsize': (4, 5)})
+
+    return [
+        {'title': 'Overview', 'tables': {
+            'Summary Statistics for Numerical Data': numerical_summary,
+            'Summary Statistics for Categorical Data': categorical_summary,
+            'Missing Values': missing[missing > 0].to_frame('missing')}},
+        {'title': 'Numerical Features', 'figures': distributions},
+        {'title': 'Categorical Features', 'figures': categorical},
+        {'title': 'Correlation Analysis', 'figures': [{
+            'kind': 'heatmap', 'name': 'correlation', 'title': 'Correlation Heatmap', 'matrix': correlation.to_numpy(),
+            'labels': list(correlation.columns), 'figsize': (9, 8)}]},
+        {'title': 'Outliers', 'tables': {'Outliers (IQR method)': pd.Series(outlier_counts, dtype='int64').to_frame('outliers')}, 'figures': boxes}
+    ]
+
+def rfms_sections(df, threshold_sweep=None, bins=50, grid=200):
+    # Sections for RFMS: per-column histograms, a binned Recency x Frequency map coloured by mean Score, and label counts
+    distributions = []
+    for col in [col for col in RFMS_COLUMNS if col in df.columns]:
+        counts, edges = histogram_table(df[col], bins)
+        distributions.append({'kind': 'histogram', 'name': f'hist_{col}', 'title': f'Distribution of {col}', 'xlabel': col, 'ylabel': 'Count', 'counts': counts, 'edges': edges})
+
+    sections = [{'title': 'RFMS Distributions', 'tables': {'Summary': df[[col for col in RFMS_COLUMNS if col in df.columns]].describe()}, 'figures': distributions}]
+    if {'Recency', 'Frequency', 'Score'} <= set(df.columns):
+        counts, means, xedges, yedges = density_grid(df['Recency'], df['Frequency'], grid, df['Score'])
+        sections.append({'title': 'RFMS Space', 'figures': [
+            {'kind': 'density', 'name': 'rfms_space', 'title': 'RFMS Space (mean Score per cell)', 'xlabel': 'Recency', 'ylabel': 'Frequency',
+             'counts': counts, 'means': means, 'xedges': xedges, 'yedges': yedges, 'colorbar': 'Score'},
+            {'kind': 'density', 'name': 'rfms_density', 'title': 'RFMS Space (transactions per cell)', 'xlabel': 'Recency', 'ylabel': 'Frequency',
+             'counts': counts, 'xedges': xedges, 'yedges': yedges}]})
+    if 'Label' in df.columns:
+        labels, counts = count_table(df['Label'])
+        section = {'title': 'Labels', 'figures': [{'kind': 'counts', 'name': 'labels', 'title': 'Number of Customers by Label',
+                                                   'xlabel': 'Label', 'ylabel': 'Number of Customers', 'labels': labels, 'counts': counts}]}
+        if threshold_sweep is not None:
+            section['tables'] = {'Threshold Sweep': threshold_sweep.iloc[::max(1, len(threshold_sweep) // 20)]}
+        sections.append(section)
+    return sections
\ No newline at end of file
@@ -0,0 +1,52 @@
+import os
+
+# Fields read from /proc/<pid>/status and /proc/<pid>/smaps_rollup (Linux), reported in MB
+STATUS_FIELDS = {'VmRSS': 'rss_mb', 'VmHWM': 'peak_rss_mb', 'RssAnon': 'anon_mb', 'RssFile': 'file_mb', 'RssShmem': 'shmem_mb'}
+
+def read_kb_fields(path, fields):
+    values = {}
+    with open(path) as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in fields:
+                values[fields[key]] = int(rest.split()[0]) / 1024
+    return values
+
+def process_memory(pid=None):
+    # RSS counts shared pages in full for every process; PSS splits them between the processes mapping them
+    pid = os.getpid() if pid is None else pid
+    memory = read_kb_fields(f'/proc/{pid}/status', STATUS_FIELDS)
+    try:
+        memory.update(read_kb_fields(f'/proc/{pid}/smaps_rollup', {'Pss': 'pss_mb'}))
+    except OSError:
+        memory['pss_mb'] = None
+    return memory
+
+def reset_peak_rss():
+    # Writing 5 to clear_refs resets VmHWM to the current RSS, so the next peak is measured from here
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def process_command(pid):
+    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+        return f.read().replace(b'\0', b' ').decode(errors='replace').strip()
+
+def child_pids(pid):
+    # Direct children, found through the parent pid field of every /proc/<pid>/stat
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name is in parentheses and may contain spaces; fields after it are fixed
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return sorted(children)
\ No newline at end of file
@@ -0,0 +1,52 @@
+import pandas as pd
+from artifacts import artifact_format, iter_artifact_batches, load_artifact
+from incremental_aggregates import IncrementalAggregator
+
+# Explicit dtypes for the Xente transaction file so chunks are parsed without type inference
+TRANSACTION_DTYPES = {
+    'TransactionId': 'object',
+    'BatchId': 'object',
+    'AccountId': 'object',
+    'SubscriptionId': 'object',
+    'CustomerId': 'object',
+    'CurrencyCode': 'category',
+    'CountryCode': 'int16',
+    'ProviderId': 'category',
+    'ProductId': 'category',
+    'ProductCategory': 'category',
+    'ChannelId': 'category',
+    'Amount': 'float64',
+    'Value': 'float64',
+    'TransactionStartTime': 'object',
+    'PricingStrategy': 'int8',
+    'FraudResult': 'int8'
+}
+
+# Columns needed to fold transactions into per-customer aggregates
+AGGREGATION_COLUMNS = ['CustomerId', 'TransactionId', 'Amount', 'TransactionStartTime']
+
+def iter_chunks(data_path, chunksize, usecols=None, dtype=None):
+    # Parquet and Feather artifacts carry their own schema and are streamed by record batch
+    if artifact_format(data_path) in ('parquet', 'feather'):
+        return iter_artifact_batches(data_path, chunksize, columns=usecols)
+
+    # Read only the requested columns, with explicit dtypes where known
+    dtype = TRANSACTION_DTYPES if dtype is None else dtype
+    if usecols is not None:
+        dtype = {col: dtype[col] for col in usecols if col in dtype}
+    return pd.read_csv(data_path, chunksize=chunksize, usecols=usecols, dtype=dtype)
+
+def stream_customer_aggregates(data_path, chunksize=100000, aggregator=None):
+    # Fold each chunk into running per-customer state; memory is bounded by the number of customers
+    aggregator = IncrementalAggregator() if aggregator is None else aggregator
+    for chunk in iter_chunks(data_path, chunksize, usecols=AGGREGATION_COLUMNS):
+        aggregator.update(chunk)
+    return aggregator
+
+def read_projected(data_path, chunksize, usecols, dtype=None):
+    # Columnar artifacts are projected on read directly
+    if artifact_format(data_path) != 'csv':
+        return load_artifact(data_path, columns=usecols)
+
+    # Read only the projected columns chunk by chunk and concatenate them once
+    return pd.concat(iter_chunks(data_path, chunksize, usecols=usecols, dtype=dtype), ignore_index=True)
\ No newline at end of file
@@ -0,0 +1,474 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from artifacts import artifact_format
+from dtype_planner import numeric_columns
+from streaming import iter_chunks
+
+# Every partial result below is mergeable: profiling chunks separately and merging gives the same
+# moments, covariance and distinct-count registers as one pass, and quantiles within the sketch's error
+
+def bit_length(values):
+    # Bit length of uint64 values from the float exponent; off by one only for values within 2**-53 below
+    # a power of two, which is negligible next to HyperLogLog's own error
+    return np.frexp(values.astype(np.float64))[1].astype(np.int64)
+
+class StreamingMoments:
+    # Count, mean, min, max and central moment sums up to the fourth per column (Chan/Pébay pairwise updates)
+    def __init__(self, n_columns):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.m3 = np.zeros(n_columns)
+        self.m4 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def update(self, values):
+        # values is a (rows, columns) float array with NaN for missing entries
+        mask = ~np.isnan(values)
+        batch = StreamingMoments(values.shape[1])
+        batch.count = mask.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            batch.mean = np.where(batch.count > 0, np.where(mask, values, 0.0).sum(axis=0) / batch.count, 0.0)
+        centered = np.where(mask, values - batch.mean, 0.0)
+        squared = centered * centered
+        batch.m2 = squared.sum(axis=0)
+        batch.m3 = (squared * centered).sum(axis=0)
+        batch.m4 = (squared * squared).sum(axis=0)
+        batch.min = np.where(mask, values, np.inf).min(axis=0)
+        batch.max = np.where(mask, values, -np.inf).max(axis=0)
+        return self.merge(batch)
+
+    def merge(self, other):
+        na, nb = self.count, other.count
+        n = na + nb
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            mean = np.where(n > 0, self.mean + delta * nb / n, 0.0)
+            m2 = self.m2 + other.m2 + delta ** 2 * na * nb / n
+            m3 = (self.m3 + other.m3 + delta ** 3 * na * nb * (na - nb) / n ** 2
+                  + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+            m4 = (self.m4 + other.m4 + delta ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / n ** 3
+                  + 6 * delta ** 2 * (na ** 2 * other.m2 + nb ** 2 * self.m2) / n ** 2
+                  + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        empty = n == 0
+        self.count, self.mean = n, mean
+        self.m2, self.m3, self.m4 = [np.where(empty, 0.0, m) for m in (m2, m3, m4)]
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+    def variance(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    def skew(self):
+        # Adjusted Fisher-Pearson coefficient, as pandas' skew()
+        n = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g1 = np.sqrt(n) * self.m3 / self.m2 ** 1.5
+            return np.where((n > 2) & (self.m2 > 0), np.sqrt(n * (n - 1)) / (n - 2) * g1, np.nan)
+
+    def kurtosis(self):
+        # Unbiased excess kurtosis, as pandas' kurt()
+        n = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g2 = n * self.m4 / self.m2 ** 2 - 3
+            return np.where((n > 3) & (self.m2 > 0), ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3)), np.nan)
+
+class StreamingCovariance:
+    # Pairwise-complete co-moment sums, shifted by a per-column reference to avoid cancellation.
+    # For columns i, j over the rows where both are present: n[i, j], sx[i, j] = sum(x_i),
+    # sxx[i, j] = sum(x_i ** 2) and sxy[i, j] = sum(x_i * x_j)
+    def __init__(self, n_columns):
+        self.shift = None
+        self.n = np.zeros((n_columns, n_columns))
+        self.sx = np.zeros((n_columns, n_columns))
+        self.sxx = np.zeros((n_columns, n_columns))
+        self.sxy = np.zeros((n_columns, n_columns))
+
+    def update(self, values):
+        mask = ~np.isnan(values)
+        if self.shift is None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.shift = np.nan_to_num(np.where(mask, values, 0.0).sum(axis=0) / mask.sum(axis=0))
+        x = np.where(mask, values - self.shift, 0.0)
+        present = mask.astype(np.float64)
+        self.n += present.T @ present
+        self.sx += x.T @ present
+        self.sxx += (x * x).T @ present
+        self.sxy += x.T @ x
+        return self
+
+    def merge(self, other):
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift
+        # Re-express the other sums around this shift: x + d with d = other.shift - self.shift
+        d = other.shift - self.shift
+        di, dj = d[:, None], d[None, :]
+        sx = other.sx + di * other.n
+        self.sxx += other.sxx + 2 * di * other.sx + di ** 2 * other.n
+        self.sxy += other.sxy + dj * other.sx + di * other.sx.T + di * dj * other.n
+        self.sx += sx
+        self.n += other.n
+        return self
+
+    def covariance(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n > 1, (self.sxy - self.sx * self.sx.T / self.n) / (self.n - 1), np.nan)
+
+    def correlation(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = (self.sxx - self.sx ** 2 / self.n) / (self.n - 1)
+            correlation = self.covariance() / np.sqrt(variance * variance.T)
+        return np.clip(correlation, -1.0, 1.0)
+
+class KLLSketch:
+    # Mergeable quantile sketch: level h holds items of weight 2**h; a full level is sorted and every
+    # other item (random offset) is promoted. Rank error is about 1.7 / k of the count
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.compress()
+        return self
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self.capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                # An odd item stays behind so total weight is preserved exactly
+                kept, items = items[len(items) - len(items) % 2:], items[:len(items) - len(items) % 2]
+                self.levels[level] = kept
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[self.rng.integers(2)::2]])
+            level += 1
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+        return self
+
+    def weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.count == 0:
+            return np.full(len(q), np.nan)
+        items, cumulative = self.weighted_items()
+        index = np.searchsorted(cumulative, q * cumulative[-1], side='left').clip(0, len(items) - 1)
+        result = items[index]
+        result[q <= 0], result[q >= 1] = self.min, self.max
+        return result
+
+    def rank(self, values, inclusive=True):
+        # Approximate number of items below (or at most) each value
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        if self.count == 0:
+            return np.zeros(len(values))
+        items, cumulative = self.weighted_items()
+        index = np.searchsorted(items, values, side='right' if inclusive else 'left')
+        weight = np.where(index > 0, cumulative[np.maximum(index - 1, 0)], 0.0)
+        return weight * self.count / cumulative[-1]
+
+class HyperLogLog:
+    # Distinct count from 2**p registers of the longest run of leading zeros; standard error 1.04 / sqrt(2**p)
+    def __init__(self, p=14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, series):
+        # pandas' stable 64-bit hash: the same value hashes the same in every chunk and process
+        series = series.dropna()
+        if len(series):
+            self.update_hashes(pd.util.hash_pandas_object(series, index=False).to_numpy())
+        return self
+
+    def update_hashes(self, hashes):
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes << np.uint64(self.p)
+        rank = np.minimum(64 - bit_length(rest) + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        # Linear counting is more accurate while many registers are still empty
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+class ValueCounts:
+    # Exact value counts for low-cardinality columns; gives up once there are more than `limit` values
+    def __init__(self, limit=1000):
+        self.limit = limit
+        self.counts = pd.Series(dtype='int64')
+        self.overflowed = False
+
+    def update(self, series, distinct_estimate=None):
+        if self.overflowed:
+            return self
+        # Skip counting a chunk that is already clearly over the limit
+        if distinct_estimate is not None and distinct_estimate > 2 * self.limit:
+            self.overflow()
+            return self
+        counts = series.value_counts(dropna=True)
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+        self.counts = self.counts.add(counts, fill_value=0).astype('int64')
+        if len(self.counts) > self.limit:
+            self.overflow()
+        return self
+
+    def overflow(self):
+        self.overflowed = True
+        self.counts = None
+
+    def merge(self, other):
+        if other.overflowed or self.overflowed:
+            self.overflow()
+        else:
+            self.counts = self.counts.add(other.counts, fill_value=0).astype('int64')
+            if len(self.counts) > self.limit:
+                self.overflow()
+        return self
+
+class DataProfile:
+    # One-pass profile of a table: moments, quantile sketches and covariance for the numeric columns,
+    # distinct counts (exact while small, HyperLogLog beyond) and missing counts for every column
+    def __init__(self, k=200, p=14, max_exact_values=1000):
+        self.k = k
+        self.p = p
+        self.max_exact_values = max_exact_values
+        self.columns = None
+        self.rows = 0
+
+    def initialize(self, chunk):
+        self.columns = list(chunk.columns)
+        self.dtypes = chunk.dtypes
+        self.numeric = numeric_columns(chunk)
+        self.moments = StreamingMoments(len(self.numeric))
+        self.covariance = StreamingCovariance(len(self.numeric))
+        self.sketches = {col: KLLSketch(self.k, seed=i) for i, col in enumerate(self.numeric)}
+        self.distinct = {col: HyperLogLog(self.p) for col in self.columns}
+        self.value_counts = {col: ValueCounts(self.max_exact_values) for col in self.columns}
+        self.missing = pd.Series(0, index=self.columns, dtype='int64')
+
+    def update(self, chunk):
+        if self.columns is None:
+            self.initialize(chunk)
+        chunk = chunk[self.columns]
+
+        # Numeric columns as one float matrix; missing values become NaN
+        values = chunk[self.numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.moments.update(values)
+        self.covariance.update(values)
+        for i, col in enumerate(self.numeric):
+            self.sketches[col].update(values[:, i])
+
+        for col in self.columns:
+            self.distinct[col].update(chunk[col])
+            self.value_counts[col].update(chunk[col], self.distinct[col].estimate())
+        self.missing += chunk.isnull().sum()
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other):
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        self.moments.merge(other.moments)
+        self.covariance.merge(other.covariance)
+        for col in self.numeric:
+            self.sketches[col].merge(other.sketches[col])
+        for col in self.columns:
+            self.distinct[col].merge(other.distinct[col])
+            self.value_counts[col].merge(other.value_counts[col])
+        self.missing += other.missing
+        self.rows += other.rows
+        return self
+
+    def numerical_summary(self, percentiles=(0.25, 0.5, 0.75)):
+        # Laid out like DataFrame.describe(), with skew and kurtosis added
+        moments = self.moments
+        summary = {
+            'count': moments.count,
+            'mean': np.where(moments.count > 0, moments.mean, np.nan),
+            'std': np.sqrt(moments.variance()),
+            'min': np.where(moments.count > 0, moments.min, np.nan)
+        }
+        quantiles = np.array([self.quantiles(col, list(percentiles)) for col in self.numeric]).reshape(len(self.numeric), len(percentiles))
+        for i, q in enumerate(percentiles):
+            summary[f'{q:.0%}'] = quantiles[:, i]
+        summary['max'] = np.where(moments.count > 0, moments.max, np.nan)
+        summary['skew'] = moments.skew()
+        summary['kurtosis'] = moments.kurtosis()
+        return pd.DataFrame(summary, index=self.numeric).T
+
+    def categorical_summary(self):
+        # count, unique, top and freq as describe(include='object'); top and freq need exact counts
+        columns = [col for col in self.columns if col not in self.numeric]
+        summary = {}
+        for col in columns:
+            counts = self.value_counts[col].counts
+            top = counts.idxmax() if counts is not None and len(counts) else np.nan
+            summary[col] = {
+                'count': self.rows - self.missing[col],
+                'unique': self.distinct_count(col),
+                'top': top,
+                'freq': counts.max() if counts is not None and len(counts) else np.nan
+            }
+        return pd.DataFrame(summary, index=['count', 'unique', 'top', 'freq'], columns=columns, dtype=object)
+
+    def distinct_count(self, col):
+        counts = self.value_counts[col].counts
+        return len(counts) if counts is not None else int(round(self.distinct[col].estimate()))
+
+    def distinct_counts(self):
+        return {col: self.distinct_count(col) for col in self.columns}
+
+    def unique_values(self, col):
+        counts = self.value_counts[col].counts
+        if counts is None:
+            raise ValueError(f"{col} has more than {self.max_exact_values} distinct values; only an estimate is kept")
+        return counts.index.to_numpy()
+
+    def correlation(self):
+        return pd.DataFrame(self.covariance.correlation(), index=self.numeric, columns=self.numeric)
+
+    def exact_counts(self, col):
+        # Sorted values and their counts, when the column has few enough distinct values to count exactly
+        counts = self.value_counts[col].counts
+        if counts is None or len(counts) == 0:
+            return None
+        counts = counts.set_axis(counts.index.astype(np.float64)).sort_index()
+        return counts.index.to_numpy(), counts.to_numpy()
+
+    def quantiles(self, col, q):
+        # Exact (linear interpolation, as pandas) for low-cardinality columns, from the sketch otherwise
+        exact = self.exact_counts(col)
+        if exact is None:
+            return self.sketches[col].quantile(q)
+        values, counts = exact
+        position = np.atleast_1d(np.asarray(q, dtype=np.float64)) * (counts.sum() - 1)
+        ends = np.cumsum(counts)
+        lower = values[np.searchsorted(ends, np.floor(position), side='right')]
+        upper = values[np.searchsorted(ends, np.ceil(position), side='right')]
+        return lower + (upper - lower) * (position - np.floor(position))
+
+    def outliers(self, col, whisker=1.5):
+        # IQR bounds and the number of values outside them: exact for low-cardinality columns,
+        # approximate (from the sketch ranks) otherwise
+        q1, median, q3 = self.quantiles(col, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        lower, upper = q1 - whisker * iqr, q3 + whisker * iqr
+        exact = self.exact_counts(col)
+        if exact is not None:
+            values, counts = exact
+            count = counts[(values < lower) | (values > upper)].sum()
+        else:
+            sketch = self.sketches[col]
+            count = sketch.rank(lower, inclusive=False)[0] + sketch.count - sketch.rank(upper, inclusive=True)[0]
+        return {'q1': q1, 'median': median, 'q3': q3, 'lower_bound': lower, 'upper_bound': upper, 'count': int(round(count))}
+
+    def box_stats(self, col, whisker=1.5):
+        # Box plot statistics for Axes.bxp: whiskers at the most extreme values inside the IQR bounds
+        stats = self.outliers(col, whisker)
+        exact = self.exact_counts(col)
+        items = exact[0] if exact is not None else self.sketches[col].weighted_items()[0]
+        inside = items[(items >= stats['lower_bound']) & (items <= stats['upper_bound'])]
+        return {
+            'label': col,
+            'med': stats['median'],
+            'q1': stats['q1'],
+            'q3': stats['q3'],
+            'whislo': inside.min() if len(inside) else stats['q1'],
+            'whishi': inside.max() if len(inside) else stats['q3'],
+            'fliers': []
+        }
+
+    def missing_values(self):
+        return self.missing.copy()
+
+def profile_frame(df, **kwargs):
+    return DataProfile(**kwargs).update(df)
+
+def profile_chunks(chunks, **kwargs):
+    profile = DataProfile(**kwargs)
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
+
+def profile_row_groups(data_path, row_groups, columns=None, **kwargs):
+    # Runs in a worker: reads and profiles its own share of a Parquet file's row groups
+    parquet_file = pq.ParquetFile(data_path)
+    profile = DataProfile(**kwargs)
+    for group in row_groups:
+        profile.update(parquet_file.read_row_group(group, columns=columns).to_pandas())
+    return profile
+
+def profile_file(data_path, chunksize=100000, columns=None, n_jobs=1, **kwargs):
+    # Profile a file larger than memory. Parquet row groups are split between n_jobs processes that read
+    # their own partitions; CSV chunks are parsed here and profiled by the workers. Partials merge in order
+    if n_jobs == 1:
+        return profile_chunks(iter_chunks(data_path, chunksize, usecols=columns), **kwargs)
+
+    profile = DataProfile(**kwargs)
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        if artifact_format(data_path) == 'parquet':
+            groups = np.array_split(np.arange(pq.ParquetFile(data_path).num_row_groups), n_jobs)
+            futures = [executor.submit(profile_row_groups, data_path, part.tolist(), columns, **kwargs) for part in groups if len(part)]
+            for future in futures:
+                profile.merge(future.result())
+        else:
+            # Keep a bounded number of chunks in flight so memory stays at a few chunks per worker
+            pending = []
+            for chunk in iter_chunks(data_path, chunksize, usecols=columns):
+                pending.append(executor.submit(profile_frame, chunk, **kwargs))
+                if len(pending) >= 2 * n_jobs:
+                    profile.merge(pending.pop(0).result())
+            for future in pending:
+                profile.merge(future.result())
+    return profile
\ No newline at end of file
@@ -0,0 +1,124 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from artifacts import artifact_format, prepare_frame
+
+# ProductId_n -> ProductCategory, with most products in the airtime and financial services categories as in the Xente data
+PRODUCT_CATEGORIES = ['airtime'] * 8 + ['financial_services'] * 8 + ['utility_bill'] * 3 + ['data_bundles'] * 3 + ['tv', 'ticket', 'movies', 'transport', 'other']
+PRODUCT_WEIGHTS = np.linspace(3, 0.2, len(PRODUCT_CATEGORIES))
+PROVIDER_WEIGHTS = np.array([0.05, 0.02, 0.35, 0.35, 0.18, 0.05])
+CHANNEL_WEIGHTS = np.array([0.02, 0.40, 0.56, 0.01, 0.01])
+PRICING_STRATEGIES = np.array([0, 1, 2, 4])
+PRICING_WEIGHTS = np.array([0.05, 0.02, 0.83, 0.10])
+
+# Transactions cluster in the daytime
+HOUR_WEIGHTS = np.array([1, 1, 1, 1, 1, 2, 4, 6, 8, 9, 10, 10, 10, 10, 10, 10, 10, 9, 8, 7, 6, 4, 3, 2], dtype=float)
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+def normalized(weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+def customer_profiles(n_customers, skew=0.9, seed=0):
+    # Zipf-like activity: a few customers make most transactions and most customers make a handful
+    rng = np.random.default_rng(seed)
+    activity = rng.permutation(1.0 / np.arange(1, n_customers + 1) ** skew)
+    return {
+        'weights': normalized(activity),
+        'amount_scale': rng.lognormal(mean=7.5, sigma=1.2, size=n_customers),
+        'credit_share': rng.beta(2, 3, size=n_customers)
+    }
+
+def id_column(prefix, codes, offset=1):
+    # 'CustomerId_17' style strings as a categorical over the distinct codes present
+    uniques, inverse = np.unique(codes, return_inverse=True)
+    categories = pd.Index(uniques + offset).astype(str)
+    return pd.Categorical.from_codes(inverse, categories=prefix + '_' + categories)
+
+def generate_chunk(first_row, n_rows, profiles, rng, start, end, fraud_rate=0.002):
+    n_customers = len(profiles['weights'])
+    customers = rng.choice(n_customers, size=n_rows, p=profiles['weights'])
+
+    # Debits are positive; credits (refunds, top-ups) are negative. Value is the absolute amount
+    amount = np.round(rng.lognormal(0, 0.8, n_rows) * profiles['amount_scale'][customers], -1)
+    is_credit = rng.random(n_rows) < profiles['credit_share'][customers] * 0.6
+    amount = np.where(is_credit, -amount, amount)
+
+    # A small share of fraud, concentrated in large transactions
+    fraud_score = rng.random(n_rows) * (1 + np.log1p(np.abs(amount)) / 5)
+    fraud = (fraud_score > np.quantile(fraud_score, 1 - fraud_rate)).astype(np.int64) if n_rows else np.zeros(0, dtype=np.int64)
+
+    # Sorted times inside the window: a random day plus a daytime-weighted hour
+    days = rng.uniform(start.value, end.value, n_rows).astype(np.int64) // 86_400_000_000_000 * 86_400_000_000_000
+    seconds = rng.choice(24, size=n_rows, p=normalized(HOUR_WEIGHTS)) * 3600 + rng.integers(0, 3600, n_rows)
+    times = np.sort(days + seconds * 1_000_000_000)
+    times = np.clip(times, start.value, end.value - 1)
+
+    products = rng.choice(len(PRODUCT_CATEGORIES), size=n_rows, p=normalized(PRODUCT_WEIGHTS))
+
+    # Accounts and subscriptions follow the customer one to one
+    customer_ids = id_column('CustomerId', customers)
+    same_codes = lambda prefix: customer_ids.rename_categories(customer_ids.categories.str.replace('CustomerId', prefix, regex=False))
+    row_ids = np.arange(first_row, first_row + n_rows) + 1
+    return pd.DataFrame({
+        'TransactionId': 'TransactionId_' + pd.Series(row_ids).astype(str),
+        'BatchId': 'BatchId_' + pd.Series(row_ids // 3 + 1).astype(str),
+        'AccountId': same_codes('AccountId'),
+        'SubscriptionId': same_codes('SubscriptionId'),
+        'CustomerId': customer_ids,
+        'CurrencyCode': pd.Categorical(np.repeat('UGX', n_rows)),
+        'CountryCode': np.full(n_rows, 256, dtype=np.int64),
+        'ProviderId': id_column('ProviderId', rng.choice(len(PROVIDER_WEIGHTS), size=n_rows, p=PROVIDER_WEIGHTS)),
+        'ProductId': id_column('ProductId', products),
+        'ProductCategory': pd.Categorical(np.asarray(PRODUCT_CATEGORIES)[products]),
+        'ChannelId': id_column('ChannelId', rng.choice(len(CHANNEL_WEIGHTS), size=n_rows, p=CHANNEL_WEIGHTS)),
+        'Amount': amount,
+        'Value': np.abs(amount).astype(np.int64),
+        'TransactionStartTime': pd.to_datetime(times, utc=True),
+        'PricingStrategy': rng.choice(PRICING_STRATEGIES, size=n_rows, p=PRICING_WEIGHTS),
+        'FraudResult': fraud
+    })
+
+def iter_transaction_chunks(n_rows, chunksize=1_000_000, n_customers=None, skew=0.9, seed=0, start='2018-11-15', days=90):
+    # Chunk k covers the k-th slice of the time range, so the concatenated chunks are in time order
+    n_customers = n_customers or max(1, n_rows // 25)
+    profiles = customer_profiles(n_customers, skew, seed)
+    start = pd.Timestamp(start, tz='UTC')
+    span = pd.Timedelta(days=days)
+    n_chunks = max(1, -(-n_rows // chunksize))
+    for k in range(n_chunks):
+        rng = np.random.default_rng([seed, k])
+        first_row = k * chunksize
+        size = min(chunksize, n_rows - first_row)
+        yield generate_chunk(first_row, size, profiles, rng, start + span * k / n_chunks, start + span * (k + 1) / n_chunks)
+
+def generate_transactions(n_rows, n_customers=None, skew=0.9, seed=0, start='2018-11-15', days=90):
+    # In-memory frame with the Xente transaction schema
+    chunks = list(iter_transaction_chunks(n_rows, n_rows or 1, n_customers, skew, seed, start, days))
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+def write_transactions(path, n_rows, chunksize=1_000_000, n_customers=None, skew=0.9, seed=0, start='2018-11-15', days=90):
+    # Stream chunks to disk so 100M rows never have to fit in memory; the format follows the extension
+    fmt = artifact_format(path)
+    writer = None
+    if os.path.exists(path):
+        os.remove(path)
+    try:
+        for chunk in iter_transaction_chunks(n_rows, chunksize, n_customers, skew, seed, start, days):
+            if fmt == 'csv':
+                chunk.to_csv(path, mode='a', header=writer is None, index=False, date_format=TIMESTAMP_FORMAT)
+                writer = True
+            elif fmt == 'parquet':
+                table = pa.Table.from_pandas(prepare_frame(chunk), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+                writer.write_table(table)
+            else:
+                raise ValueError(f"Streaming writes support CSV and Parquet, not {fmt}")
+    finally:
+        if writer is not None and writer is not True:
+            writer.close()
+    return path
\ No newline at end of file
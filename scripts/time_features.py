@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Layout of TransactionStartTime in the Xente files, e.g. 2018-11-15T02:18:49Z
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+TIME_FEATURE_COLUMNS = ['transaction_hour', 'transaction_day', 'transaction_month', 'transaction_year', 'transaction_weekday']
+
+def parse_timestamps(values, format=TIMESTAMP_FORMAT):
+    # Already parsed columns are returned as they are and int64 columns are read as epoch nanoseconds (UTC).
+    # Strings in the known format are parsed by Arrow in one pass; anything else falls back to pandas' ISO 8601 parser
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Each distinct string is parsed once
+        categories = parse_timestamps(values.cat.categories.to_series(), format)
+        times = pd.Series(categories.array.take(values.cat.codes.to_numpy(), allow_fill=True), index=values.index, name=values.name)
+        return times
+    if pd.api.types.is_integer_dtype(values):
+        return pd.Series(pd.to_datetime(values.to_numpy(dtype=np.int64), unit='ns', utc=True), index=values.index, name=values.name)
+    try:
+        strings = pa.array(values.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+        parsed = pc.strptime(strings, format=format, unit='ns').cast(pa.int64())
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pd.to_datetime(values, format='ISO8601')
+
+    # Missing strings become NaT, the smallest int64
+    parsed = pc.fill_null(parsed, np.iinfo(np.int64).min).to_numpy()
+    return pd.Series(pd.to_datetime(parsed, unit='ns', utc=True), index=values.index, name=values.name)
+
+def parse_column(df, column='TransactionStartTime'):
+    # Parse in place so every later consumer of the frame finds datetimes and skips parsing
+    df[column] = parse_timestamps(df[column])
+    return df[column]
+
+def epoch_nanoseconds(times, wall_clock=False):
+    # Nanoseconds since 1970-01-01 UTC; wall_clock counts local time instead, so tz-aware columns give the local
+    # hour and day as .dt does
+    times = pd.Series(times)
+    if wall_clock and times.dt.tz is not None:
+        times = times.dt.tz_localize(None)
+    return times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+def civil_from_days(days):
+    # Year, month and day of the month from days since 1970-01-01 in integer arithmetic (proleptic Gregorian calendar)
+    z = days + 719_468
+    era = np.floor_divide(z, 146_097)
+    day_of_era = z - era * 146_097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36_524 - day_of_era // 146_096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    shifted_month = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * shifted_month + 2) // 5 + 1
+    month = np.where(shifted_month < 10, shifted_month + 3, shifted_month - 9)
+    year = year_of_era + era * 400 + (month <= 2)
+    return year, month, day
+
+def calendar_features(times):
+    # Hour, day, month, year and weekday (Monday=0) without going through the .dt accessors
+    ns = epoch_nanoseconds(times, wall_clock=True)
+    missing = ns == np.iinfo(np.int64).min
+    days = np.floor_divide(ns, NS_PER_DAY)
+    hour = (ns - days * NS_PER_DAY) // (3600 * NS_PER_SECOND)
+    year, month, day = civil_from_days(days)
+
+    # 1970-01-01 was a Thursday
+    weekday = (days + 3) % 7
+    features = {'transaction_hour': hour, 'transaction_day': day, 'transaction_month': month, 'transaction_year': year, 'transaction_weekday': weekday}
+
+    # Same dtypes as the .dt accessors: int32, or float with NaN where the timestamp is missing
+    for name, values in features.items():
+        features[name] = np.where(missing, np.nan, values) if missing.any() else values.astype(np.int32)
+    return pd.DataFrame(features, index=pd.Series(times).index)
+
+def customer_time_order(codes, ns):
+    # Rows sorted by customer, then time; a stable sort keeps equal timestamps in row order
+    return np.lexsort((ns, codes))
+
+def valid_rows(codes, ns):
+    # Rows with a customer and a timestamp; the others get no history
+    return np.flatnonzero((codes >= 0) & (ns != np.iinfo(np.int64).min))
+
+def seconds_since_previous(codes, ns):
+    # Seconds since the same customer's previous transaction; NaN for a customer's first one
+    rows = valid_rows(codes, ns)
+    order = rows[customer_time_order(codes[rows], ns[rows])]
+    sorted_codes, sorted_ns = codes[order], ns[order]
+    gaps = np.full(len(order), np.nan)
+    same_customer = sorted_codes[1:] == sorted_codes[:-1]
+    gaps[1:][same_customer] = (sorted_ns[1:] - sorted_ns[:-1])[same_customer] / NS_PER_SECOND
+    result = np.full(len(codes), np.nan)
+    result[order] = gaps
+    return result
+
+def sorted_positions(sorted_codes, sorted_ns, codes, ns, side='right'):
+    # For each query (customer, t), the number of (customer, time)-sorted rows before it: the rows of earlier customers
+    # and the customer's rows at or before t ('right') or strictly before t ('left'). One merge places all the queries
+    n = len(sorted_codes)
+    rows_first = side == 'right'
+    ties = np.concatenate([np.full(n, not rows_first, dtype=np.int8), np.full(len(codes), rows_first, dtype=np.int8)])
+    merged = np.lexsort((ties, np.concatenate([sorted_ns, ns]), np.concatenate([sorted_codes, codes])))
+    is_row = merged < n
+    rows_before = np.cumsum(is_row) - is_row
+    positions = np.empty(len(codes), dtype=np.int64)
+    positions[merged[~is_row] - n] = rows_before[~is_row]
+    return positions
+
+def window_starts(sorted_codes, sorted_ns, window_ns, side='right'):
+    # For each row of a (customer, time)-sorted array, the first row of the same customer inside (t - window, t]
+    # ('right'), or inside [t - window, t) ('left')
+    return sorted_positions(sorted_codes, sorted_ns, sorted_codes, sorted_ns - window_ns, side)
+
+def rolling_window(codes, ns, window, values=None):
+    # Transactions (and the sum of values) per customer over the trailing window, in the original row order;
+    # rows without a customer or timestamp get 0
+    window_ns = pd.Timedelta(window).value
+    rows = valid_rows(codes, ns)
+    order = rows[customer_time_order(codes[rows], ns[rows])]
+    starts = window_starts(codes[order], ns[order], window_ns)
+    counts = np.zeros(len(codes), dtype=np.int64)
+    counts[order] = np.arange(len(order)) - starts + 1
+    if values is None:
+        return counts, None
+    cumulative = np.concatenate([[0.0], np.cumsum(np.nan_to_num(np.asarray(values, dtype=np.float64)[order]))])
+    sums = np.zeros(len(codes))
+    sums[order] = cumulative[1:] - cumulative[starts]
+    return counts, sums
\ No newline at end of file
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import math
+import os
+import time
+import numpy as np
+import pandas as pd
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedGroupKFold, StratifiedKFold, train_test_split
+
+def take_rows(data, indices):
+    return data.iloc[indices] if hasattr(data, 'iloc') else data[indices]
+
+def fit_and_score(estimator, params, X, y, train_idx, test_idx, scoring):
+    # Runs in a worker process. Like sklearn's error_score, an estimator that fails to fit (e.g. on invalid
+    # parameters) scores NaN and its error is returned; anything else, including running out of memory, raises
+    start = time.perf_counter()
+    model = clone(estimator).set_params(**params)
+    try:
+        model.fit(take_rows(X, train_idx), take_rows(y, train_idx))
+    except MemoryError:
+        raise
+    except Exception as e:
+        return float('nan'), time.perf_counter() - start, f'{type(e).__name__}: {e}'
+    score = float(get_scorer(scoring)(model, take_rows(X, test_idx), take_rows(y, test_idx)))
+    return score, time.perf_counter() - start, None
+
+class FoldScoreCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, estimator, params, fold_fingerprint, n_resources, scoring):
+        payload = json.dumps({
+            'estimator': type(estimator).__name__,
+            'base_params': {k: repr(v) for k, v in sorted(estimator.get_params(deep=False).items())},
+            'params': {k: repr(v) for k, v in sorted(params.items())},
+            'fold': fold_fingerprint,
+            'n_resources': int(n_resources),
+            'scoring': scoring
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key):
+        if self.cache_dir is None:
+            return None
+        path = os.path.join(self.cache_dir, f'{key}.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def put(self, key, entry):
+        if self.cache_dir is None:
+            return
+        # Write then rename so an interrupted run never leaves a partial entry
+        path = os.path.join(self.cache_dir, f'{key}.json')
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+class TuningEngine:
+    def __init__(self, estimator, param_space, n_candidates=None, cv=5, scoring='accuracy', n_jobs=-1,
+                 halving_factor=3, min_resources=50, cache_dir=None, random_state=42):
+        self.estimator = estimator
+        self.param_space = param_space
+        self.n_candidates = n_candidates
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.halving_factor = halving_factor
+        self.min_resources = min_resources
+        self.cache = FoldScoreCache(cache_dir)
+        self.random_state = random_state
+
+    def candidates(self):
+        # Full grid when n_candidates is None, otherwise a seeded random sample of it
+        if self.n_candidates is None:
+            return list(ParameterGrid(self.param_space))
+        return list(ParameterSampler(self.param_space, n_iter=self.n_candidates, random_state=self.random_state))
+
+    def resource_schedule(self, n_candidates, n_train):
+        # Successive halving: keep 1/factor of the candidates per round and give them factor times more rows
+        if self.halving_factor is None or self.halving_factor <= 1:
+            return [n_train]
+        n_rounds, remaining = 1, n_candidates
+        while remaining >= self.halving_factor:
+            remaining = int(math.ceil(remaining / self.halving_factor))
+            n_rounds += 1
+        while n_rounds > 1 and n_train / self.halving_factor ** (n_rounds - 1) < self.min_resources:
+            n_rounds -= 1
+        return [int(n_train / self.halving_factor ** (n_rounds - 1 - i)) for i in range(n_rounds)]
+
+    def subsample(self, y, train_idx, n_resources):
+        if n_resources >= len(train_idx):
+            return train_idx
+        try:
+            subset, _ = train_test_split(train_idx, train_size=n_resources, stratify=take_rows(y, train_idx), random_state=self.random_state)
+        except ValueError:
+            subset = np.random.default_rng(self.random_state).permutation(train_idx)[:n_resources]
+        return np.sort(subset)
+
+    def fit(self, X, y, groups=None):
+        # With groups (e.g. CustomerId) no group is split across a fold's train and validation rows
+        if groups is None:
+            folds = list(StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state).split(X, y))
+        else:
+            folds = list(StratifiedGroupKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state).split(X, y, groups))
+        candidates = self.candidates()
+        schedule = self.resource_schedule(len(candidates), min(len(train) for train, _ in folds))
+        surviving = list(range(len(candidates)))
+        rows = []
+
+        for round_idx, n_resources in enumerate(schedule):
+            # Fingerprint exactly the rows each fold fits and scores on. A fold fits on every other fold's rows, so any
+            # changed training row changes every fingerprint: the cache skips work when the same data is searched again
+            # (re-runs, added candidates, interrupted runs), not after the data changes
+            fold_inputs = []
+            for train_idx, test_idx in folds:
+                sub_train = train_idx if round_idx == len(schedule) - 1 else self.subsample(y, train_idx, n_resources)
+                fingerprint = joblib.hash((take_rows(X, sub_train), take_rows(y, sub_train), take_rows(X, test_idx), take_rows(y, test_idx)))
+                fold_inputs.append((sub_train, test_idx, fingerprint))
+
+            # Look every (candidate, fold) up in the cache and only fit the misses
+            scores, fit_times, errors, pending = {}, {}, {}, []
+            for c in surviving:
+                for f, (sub_train, test_idx, fingerprint) in enumerate(fold_inputs):
+                    key = self.cache.key(self.estimator, candidates[c], fingerprint, n_resources, self.scoring)
+                    entry = self.cache.get(key)
+                    if entry is None:
+                        pending.append((c, f, key))
+                    else:
+                        scores[c, f], fit_times[c, f], errors[c, f] = entry['score'], entry['fit_time'], None
+
+            results = Parallel(n_jobs=self.n_jobs)(
+                delayed(fit_and_score)(self.estimator, candidates[c], X, y, fold_inputs[f][0], fold_inputs[f][1], self.scoring)
+                for c, f, _ in pending
+            )
+            for (c, f, key), (score, fit_time, error) in zip(pending, results):
+                scores[c, f], fit_times[c, f], errors[c, f] = score, fit_time, error
+
+                # Failed fits are retried on the next run rather than cached as NaN
+                if error is None:
+                    self.cache.put(key, {'score': score, 'fit_time': fit_time})
+
+            misses = {c: sum(1 for pc, _, _ in pending if pc == c) for c in surviving}
+            for c in surviving:
+                fold_scores = [scores[c, f] for f in range(len(folds))]
+                rows.append({
+                    'round': round_idx,
+                    'n_resources': n_resources,
+                    'candidate': c,
+                    'params': candidates[c],
+                    'mean_score': np.mean(fold_scores),
+                    'std_score': np.std(fold_scores),
+                    'fold_scores': fold_scores,
+                    'mean_fit_time': np.mean([fit_times[c, f] for f in range(len(folds))]),
+                    'cached_folds': len(folds) - misses[c],
+                    'fit_errors': [errors[c, f] for f in range(len(folds)) if errors[c, f] is not None]
+                })
+
+            # Keep the best 1/factor of the candidates for the next round; NaN scores rank last
+            if round_idx < len(schedule) - 1:
+                round_rows = sorted(rows[-len(surviving):], key=lambda r: -np.nan_to_num(r['mean_score'], nan=-np.inf))
+                keep = max(1, int(math.ceil(len(surviving) / self.halving_factor)))
+                surviving = sorted(r['candidate'] for r in round_rows[:keep])
+
+        self.results_ = pd.DataFrame(rows)
+        final_round = self.results_[self.results_['round'] == len(schedule) - 1]
+        best = final_round.loc[final_round['mean_score'].fillna(-np.inf).idxmax()]
+        self.best_params_ = best['params']
+        self.best_score_ = best['mean_score']
+
+        # Refit the winner on all the data
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+        return self
\ No newline at end of file
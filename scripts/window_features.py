@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from aggregation import CustomerGrouping
+from time_features import NS_PER_DAY, customer_time_order, epoch_nanoseconds, parse_timestamps, sorted_positions, valid_rows, window_starts
+
+DEFAULT_WINDOWS = ['7D', '30D', '90D']
+
+# Distinct values per window are counted for these columns
+DISTINCT_COLUMNS = ['ProviderId', 'ProductId']
+
+def cumulative_sum(values):
+    # Prefix sums with a leading 0, so the total over rows [start, end) is cumulative[end] - cumulative[start]
+    return np.concatenate([[0], np.cumsum(values)])
+
+def previous_occurrences(codes, values):
+    # For each (customer, time)-sorted row, the previous row of the same customer with the same value, or -1.
+    # Rows without a value point at themselves, so no window counts them
+    rows = np.arange(len(codes))
+    order = np.lexsort((values, codes))
+    same = (codes[order[1:]] == codes[order[:-1]]) & (values[order[1:]] == values[order[:-1]])
+    previous = np.full(len(codes), -1, dtype=np.int64)
+    previous[order[1:][same]] = order[:-1][same]
+    previous[values < 0] = rows[values < 0]
+    return previous
+
+def distinct_counts(previous, starts, ends):
+    # Distinct values in each window [start, end) = rows j in it whose previous occurrence is before start.
+    # The windows of one engine form a chain (sorted by start, their ends are sorted too), so row j counts in the
+    # windows q with previous[j] < start_q <= j < end_q, one contiguous run of them: the runs are found by binary
+    # search and summed with a difference array
+    order = np.lexsort((ends, starts))
+    sorted_starts, sorted_ends = starts[order], ends[order]
+    rows = np.arange(len(previous))
+    first = np.maximum(np.searchsorted(sorted_starts, previous, side='right'), np.searchsorted(sorted_ends, rows, side='right'))
+    last = np.searchsorted(sorted_starts, rows, side='right')
+    runs = first < last
+    n_windows = len(starts)
+    changes = np.bincount(first[runs], minlength=n_windows + 1) - np.bincount(last[runs], minlength=n_windows + 1)
+    counts = np.empty(n_windows, dtype=np.int64)
+    counts[order] = np.cumsum(changes)[:n_windows]
+    return counts
+
+class WindowFeatureEngine:
+    # Trailing-window features per customer. Rows are sorted once by (customer, time); every window edge is then
+    # placed by one merge of the queries into the rows and every windowed total is a difference of prefix sums
+    def __init__(self, df, windows=DEFAULT_WINDOWS, amount_column='Amount', distinct_columns=DISTINCT_COLUMNS):
+        self.windows = list(windows)
+        self.window_ns = [pd.Timedelta(window).value for window in self.windows]
+        self.n_rows = len(df)
+        self.grouping = CustomerGrouping(df['CustomerId'])
+        ns = epoch_nanoseconds(parse_timestamps(df['TransactionStartTime']))
+        rows = valid_rows(self.grouping.codes, ns)
+        self.order = rows[customer_time_order(self.grouping.codes[rows], ns[rows])]
+        self.codes, self.ns = self.grouping.codes[self.order], ns[self.order]
+
+        amount = np.nan_to_num(df[amount_column].to_numpy(dtype=np.float64, na_value=np.nan)[self.order])
+        self.amount = cumulative_sum(amount)
+        self.spend = cumulative_sum(np.maximum(amount, 0.0))
+
+        # Distinct counts only need each row's previous occurrence of its value, whatever the number of values
+        self.previous = {col: previous_occurrences(self.codes, pd.factorize(df[col])[0][self.order])
+                         for col in distinct_columns if col in df.columns}
+
+    def window_totals(self, starts, ends, window_ns):
+        count = ends - starts
+        amount = self.amount[ends] - self.amount[starts]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, amount / count, np.nan)
+        return {
+            'transaction_count': count,
+            'transaction_amount': amount,
+            'spend': self.spend[ends] - self.spend[starts],
+            'average_transaction_amount': mean,
+            'velocity': count / (window_ns / NS_PER_DAY)
+        }
+
+    def features(self, starts_by_window, ends):
+        # All windows share ends. Returns the column names <feature>_<window> and one float64 row per column
+        names = [f'{name}_{window}' for window in self.windows for name in ['transaction_count', 'transaction_amount', 'spend', 'average_transaction_amount', 'velocity']]
+        names += [f'distinct_{col}_{window}' for col in self.previous for window in self.windows]
+        matrix = np.zeros((len(names), len(ends)))
+        row = 0
+        for window_ns, starts in zip(self.window_ns, starts_by_window):
+            for values in self.window_totals(starts, ends, window_ns).values():
+                matrix[row] = values
+                row += 1
+
+        for previous in self.previous.values():
+            for starts in starts_by_window:
+                matrix[row] = distinct_counts(previous, starts, ends)
+                row += 1
+        return names, matrix
+
+    def row_features(self, include_current=True):
+        # One row per transaction in the original order. include_current=False sees only strictly earlier
+        # transactions, so a transaction's features never depend on itself or anything at the same time or later
+        ends = np.arange(1, len(self.order) + 1) if include_current else window_starts(self.codes, self.ns, 0, 'left')
+        boundary = 'right' if include_current else 'left'
+        starts_by_window = [window_starts(self.codes, self.ns, window_ns, boundary) for window_ns in self.window_ns]
+        names, matrix = self.features(starts_by_window, ends)
+
+        # Scattered back to row order in one step; rows without a customer or a timestamp have no history (NaN)
+        result = np.full((len(names), self.n_rows), np.nan)
+        result[:, self.order] = matrix
+        return pd.DataFrame(result.T, columns=names, copy=False)
+
+    def as_of(self, customer_ids, times):
+        # Point-in-time features: for each (customer, time) only the customer's transactions in [time - window, time)
+        codes = pd.Index(self.grouping.customers).get_indexer(pd.Series(customer_ids).to_numpy())
+        ns = epoch_nanoseconds(parse_timestamps(pd.Series(times)))
+        known = (codes >= 0) & (ns != np.iinfo(np.int64).min)
+        ends = np.where(known, sorted_positions(self.codes, self.ns, codes, ns, 'left'), 0)
+        starts_by_window = [np.where(known, sorted_positions(self.codes, self.ns, codes, ns - window_ns, 'left'), 0) for window_ns in self.window_ns]
+        names, matrix = self.features(starts_by_window, ends)
+        return pd.DataFrame(matrix.T, columns=names, copy=False)
\ No newline at end of file
@@ -0,0 +1,168 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+# Added to each bin's good and bad counts so a single-class bin still has a finite WoE
+SMOOTHING = 0.5
+
+def woe_binning_path(model_path):
+    # Where the bins of a model saved as a single file live: random_forest_model.pkl -> random_forest_model.woe_binning.pkl
+    return f'{os.path.splitext(model_path)[0]}.woe_binning.pkl'
+
+def target_codes(y, positive='Good'):
+    # 1 for the positive class ('Good' in the notebook's sc.woebin call), 0 otherwise
+    return (np.asarray(y) == positive).astype(np.int8)
+
+def quantile_boundaries(sorted_values, max_bins):
+    # Row positions where each quantile bin starts in the sorted values; ties never straddle a boundary
+    n = len(sorted_values)
+    cuts = np.unique(sorted_values[np.arange(1, max_bins) * n // max_bins])
+    starts = np.searchsorted(sorted_values, cuts, side='left')
+    return np.concatenate([[0], starts[starts > 0], [n]])
+
+def merge_monotonic(boundaries, cumulative_good, increasing):
+    # Pool adjacent bins until the good rate is monotonic; each block's counts are differences of the cumulative counts
+    blocks = []
+    for end in boundaries[1:]:
+        blocks.append(end)
+        while len(blocks) > 1:
+            start = blocks[-3] if len(blocks) > 2 else boundaries[0]
+            middle = blocks[-2]
+            left = (cumulative_good[middle] - cumulative_good[start]) / (middle - start)
+            right = (cumulative_good[blocks[-1]] - cumulative_good[middle]) / (blocks[-1] - middle)
+            if (left <= right) if increasing else (left >= right):
+                break
+            del blocks[-2]
+    return np.concatenate([[boundaries[0]], blocks])
+
+def merge_small_bins(boundaries, min_rows):
+    # Fold bins under min_rows into their smaller neighbour; merging neighbours keeps the rates monotonic
+    boundaries = list(boundaries)
+    while len(boundaries) > 2:
+        sizes = np.diff(boundaries)
+        smallest = int(np.argmin(sizes))
+        if sizes[smallest] >= min_rows:
+            break
+        if smallest == 0:
+            del boundaries[1]
+        elif smallest == len(sizes) - 1 or sizes[smallest - 1] <= sizes[smallest + 1]:
+            del boundaries[smallest]
+        else:
+            del boundaries[smallest + 1]
+    return np.asarray(boundaries)
+
+def weight_of_evidence(good, bad):
+    # good and bad count every bin of a feature, the missing bin included when it has rows; adding SMOOTHING to
+    # each of the n bins adds n * SMOOTHING to the totals, so the smoothed shares still sum to 1
+    good_share = (good + SMOOTHING) / (good.sum() + SMOOTHING * len(good))
+    bad_share = (bad + SMOOTHING) / (bad.sum() + SMOOTHING * len(bad))
+    woe = np.log(good_share / bad_share)
+    return woe, (good_share - bad_share) * woe
+
+def bin_feature(values, target, max_bins=20, min_bin_share=0.05, monotonic='auto'):
+    # One sort per feature; every candidate binning is then scored from cumulative good counts
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    order = np.argsort(values[~missing], kind='stable')
+    sorted_values = values[~missing][order]
+    cumulative_good = np.concatenate([[0], np.cumsum(target[~missing][order], dtype=np.int64)])
+    missing_good = int(target[missing].sum())
+    missing_bad = int(missing.sum()) - missing_good
+    n_missing_bins = 1 if missing_good + missing_bad else 0
+
+    if len(sorted_values):
+        boundaries = quantile_boundaries(sorted_values, max_bins)
+    else:
+        boundaries = np.array([0, 0])
+    min_rows = int(np.ceil(min_bin_share * len(values)))
+
+    # 'auto' keeps whichever direction retains more information
+    candidates = []
+    for increasing in ([True, False] if monotonic == 'auto' else [monotonic == 'increasing']):
+        merged = merge_monotonic(boundaries, cumulative_good, increasing) if monotonic is not None else boundaries
+        merged = merge_small_bins(merged, min_rows)
+        good = np.diff(cumulative_good[merged])
+        bad = np.diff(merged) - good
+        woe, iv = weight_of_evidence(np.append(good, [missing_good] * n_missing_bins), np.append(bad, [missing_bad] * n_missing_bins))
+        candidates.append((iv.sum(), merged, good, bad, woe, iv))
+    _, merged, good, bad, woe, iv = max(candidates, key=lambda candidate: candidate[0])
+
+    # Bin i holds edges[i-1] <= x < edges[i], which is what searchsorted(edges, x, side='right') returns
+    edges = sorted_values[merged[1:-1]]
+    if n_missing_bins:
+        woe, missing_woe, iv, missing_iv = woe[:-1], woe[-1], iv[:-1], iv[-1]
+    else:
+        missing_woe, missing_iv = 0.0, 0.0
+
+    bounds = np.concatenate([[-np.inf], edges, [np.inf]])
+    table = pd.DataFrame({
+        'bin': [f'[{low:.6g}, {high:.6g})' for low, high in zip(bounds[:-1], bounds[1:])] + ['missing'],
+        'count': np.append(good + bad, missing_good + missing_bad),
+        'good': np.append(good, missing_good),
+        'bad': np.append(bad, missing_bad),
+        'woe': np.append(woe, missing_woe),
+        'iv': np.append(iv, missing_iv)
+    })
+    table['good_rate'] = table['good'] / table['count'].where(table['count'] > 0)
+    return {'edges': edges, 'woe': woe, 'missing_woe': float(missing_woe), 'iv': float(table['iv'].sum()), 'table': table}
+
+def apply_woe(values, edges, woe, missing_woe=0.0):
+    # Binary search over the stored edges, then a lookup of each bin's WoE
+    values = np.asarray(values, dtype=np.float64)
+    result = woe[np.searchsorted(edges, values, side='right')]
+    result[np.isnan(values)] = missing_woe
+    return result
+
+class WoEBinning:
+    def __init__(self, max_bins=20, min_bin_share=0.05, monotonic='auto', positive='Good', n_jobs=None):
+        self.max_bins = max_bins
+        self.min_bin_share = min_bin_share
+        self.monotonic = monotonic
+        self.positive = positive
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y, features=None):
+        self.features = list(features or X.columns)
+        target = target_codes(y, self.positive)
+
+        # Features are binned independently, one per worker process
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(bin_feature)(X[feature].to_numpy(dtype=np.float64, na_value=np.nan), target, self.max_bins, self.min_bin_share, self.monotonic)
+            for feature in self.features)
+        self.edges_ = {feature: result['edges'] for feature, result in zip(self.features, results)}
+        self.woe_ = {feature: result['woe'] for feature, result in zip(self.features, results)}
+        self.missing_woe_ = {feature: result['missing_woe'] for feature, result in zip(self.features, results)}
+        self.tables_ = {feature: result['table'] for feature, result in zip(self.features, results)}
+        self.iv_ = pd.Series({feature: result['iv'] for feature, result in zip(self.features, results)}, name='iv').sort_values(ascending=False)
+        return self
+
+    def transform(self, X):
+        # WoE values for the binned features; other columns pass through unchanged
+        X = X.copy()
+        for feature in self.features:
+            X[feature] = apply_woe(X[feature].to_numpy(dtype=np.float64, na_value=np.nan), self.edges_[feature], self.woe_[feature], self.missing_woe_[feature])
+        return X
+
+    def fit_transform(self, X, y, features=None):
+        return self.fit(X, y, features).transform(X)
+
+    def transform_matrix(self, matrix, columns):
+        # Same transform on a plain (n_rows, n_columns) array, as the API builds one; columns names its layout
+        matrix = np.array(matrix, dtype=np.float64)
+        for feature in self.features:
+            j = columns.index(feature)
+            matrix[:, j] = apply_woe(matrix[:, j], self.edges_[feature], self.woe_[feature], self.missing_woe_[feature])
+        return matrix
+
+    def binning_table(self):
+        return pd.concat(self.tables_, names=['feature', None]).reset_index(level=0)
+
+    def save(self, path):
+        joblib.dump(self, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        return joblib.load(path)
\ No newline at end of file
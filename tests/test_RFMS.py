@@ -1,3 +1,4 @@
+import tempfile
 import unittest
 import pandas as pd
 import sys
@@ -6,6 +7,7 @@ import os
 # Add the path to the scripts directory
 sys.path.append(os.path.abspath('../scripts'))
 
+from artifacts import load_artifact
 from RFMS import RFMS
 
 class TestRFMS(unittest.TestCase):
@@ -69,5 +71,48 @@ class TestRFMS(unittest.TestCase):
         except Exception as e:
             self.fail(f"save_rfms_data() raised Exception unexpectedly: {e}")
 
+class TestRFMSLabels(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'CustomerId': ['C1', 'C2', 'C1', 'C3', 'C2', 'C3'],
+            'TransactionId': [101, 102, 103, 104, 105, 106],
+            'Amount': [100, 5, 150, 4000, 7, 2500],
+            'TransactionStartTime': ['2023-01-01 10:00:00', '2023-01-02 11:00:00', '2023-01-03 12:00:00',
+                                     '2023-01-04 13:00:00', '2023-01-05 14:00:00', '2023-01-06 15:00:00']
+        })
+
+    def expected_labels(self, df, threshold):
+        return ['Good' if score >= threshold else 'Bad' for score in df['Score']]
+
+    def test_labels_follow_a_replaced_or_filtered_frame(self):
+        rfms = RFMS(None, df=self.df.copy())
+        rfms.calculate_rfms_features()
+
+        # Replaced with a filtered copy: the cached per-customer table no longer describes the rows
+        rfms.df = rfms.df[rfms.df['CustomerId'] != 'C1'].assign(Score=1000.0)
+        self.assertEqual(list(rfms.assign_labels(threshold=500)['Label']), self.expected_labels(rfms.df, 500))
+        self.assertEqual(rfms.sweep_thresholds(thresholds=[500])['good_customers'].tolist(), [2])
+
+        # Filtered in place: same object, fewer rows
+        rfms = RFMS(None, df=self.df.copy())
+        rfms.calculate_rfms_features()
+        rfms.df.drop(index=[0, 2], inplace=True)
+        self.assertEqual(list(rfms.assign_labels(threshold=500)['Label']), self.expected_labels(rfms.df, 500))
+
+    def test_labels_are_categorical(self):
+        # Label is a Categorical over ['Bad', 'Good']; it compares like strings and saves as the same strings
+        rfms = RFMS(None, df=self.df.copy())
+        rfms.calculate_rfms_features()
+        df = rfms.assign_labels(threshold=500)
+        self.assertIsInstance(df['Label'].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(df['Label'].cat.categories), ['Bad', 'Good'])
+        self.assertEqual(list(df['Label'] == 'Good'), [label == 'Good' for label in self.expected_labels(df, 500)])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for extension in ['csv', 'parquet']:
+                path = os.path.join(tmp_dir, f'rfms.{extension}')
+                rfms.save_rfms_data(path)
+                self.assertEqual(load_artifact(path)['Label'].astype(str).tolist(), self.expected_labels(df, 500))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from aggregation import CustomerGrouping, aggregate_customers
+
+class TestAggregation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Create a sample dataframe for testing
+        rng = np.random.default_rng(0)
+        n = 2000
+        cls.df = pd.DataFrame({
+            'CustomerId': [f'CustomerId_{i}' for i in rng.integers(0, 150, n)],
+            'TransactionId': [f'TransactionId_{i}' for i in range(n)],
+            'Amount': np.round(rng.normal(500, 300, n), 2),
+            'TransactionStartTime': pd.Timestamp('2018-11-15', tz='UTC') + pd.to_timedelta(rng.integers(0, 90 * 86400, n), unit='s')
+        })
+
+    def test_aggregates_match_groupby(self):
+        _, table = aggregate_customers(self.df, time_column='TransactionStartTime')
+        expected = self.df.groupby('CustomerId').agg(
+            total_transaction_amount=('Amount', 'sum'),
+            average_transaction_amount=('Amount', 'mean'),
+            transaction_count=('TransactionId', 'count'),
+            std_transaction_amount=('Amount', 'std'),
+            last_transaction_time=('TransactionStartTime', 'max')
+        ).reset_index()
+        pd.testing.assert_frame_equal(table, expected, check_exact=False, rtol=1e-12)
+
+    def test_broadcast_matches_merge(self):
+        grouping, table = aggregate_customers(self.df)
+        merged = pd.merge(self.df[['CustomerId']], table, on='CustomerId', how='left')
+        np.testing.assert_array_equal(grouping.broadcast(table['transaction_count']), merged['transaction_count'].to_numpy())
+
+    def test_missing_customers_and_values(self):
+        grouping = CustomerGrouping(pd.Series(['b', 'a', None, 'b', 'a']))
+        amounts = pd.Series([1.0, np.nan, 5.0, 3.0, 4.0])
+        np.testing.assert_array_equal(grouping.count(amounts), [1, 2])
+        np.testing.assert_array_equal(grouping.sum(amounts), [4.0, 4.0])
+        self.assertTrue(np.isnan(grouping.std(amounts)[0]))
+        rows = grouping.broadcast(grouping.count(amounts))
+        self.assertTrue(np.isnan(rows[2]))
+        self.assertEqual(rows[0], 2)
+
+    def test_integer_sums_stay_integer(self):
+        grouping = CustomerGrouping(pd.Series([1, 2, 1]))
+        total = grouping.sum(pd.Series([100, 200, 150]))
+        self.assertTrue(np.issubdtype(total.dtype, np.integer))
+        np.testing.assert_array_equal(total, [250, 200])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import importlib
+import os
+import tempfile
+import unittest
+from unittest import mock
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestClassifier
+import sys
+
+# Add the paths to the apps and scripts directories
+sys.path.append(os.path.abspath('../apps'))
+sys.path.append(os.path.abspath('../scripts'))
+
+from feature_store import FeatureStore
+from Feature_Eng import FeatureEngineering
+from model_registry import ModelRegistry
+from woe_binning import WoEBinning
+
+FEATURES = ['Amount', 'Value', 'total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']
+
+def load_api(env):
+    # The API reads its configuration from the environment at import time, so import a fresh copy per test class
+    os.environ.update(env)
+    sys.modules.pop('api', None)
+    try:
+        return importlib.import_module('api')
+    finally:
+        for key in env:
+            del os.environ[key]
+
+class RecordingModel:
+    # Stands in for a fitted classifier and keeps the last matrix it scored
+    classes_ = np.array(['Bad', 'Good'])
+
+    def predict_proba(self, matrix):
+        self.scored = np.array(matrix)
+        return np.tile([1.0, 0.0], (len(matrix), 1))
+
+class TestApi(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.X = pd.DataFrame(rng.random((300, len(FEATURES))) * 100, columns=FEATURES)
+        cls.X['transaction_count'] = np.round(cls.X['transaction_count'])
+        cls.model = RandomForestClassifier(n_estimators=5, random_state=0).fit(cls.X, np.where(cls.X['Amount'] > 50, 'Good', 'Bad'))
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        model_path = os.path.join(cls.tmp_dir.name, 'model.pkl')
+        joblib.dump(cls.model, model_path)
+
+        # One stored customer for /predict/customer
+        cls.store_path = os.path.join(cls.tmp_dir.name, 'feature_store.db')
+        cls.stored = {'total_transaction_amount': 300.0, 'average_transaction_amount': 60.0, 'transaction_count': 5, 'std_transaction_amount': 12.0}
+        store = FeatureStore(cls.store_path)
+        store.write_features(pd.DataFrame([{'CustomerId': 'C1', **cls.stored}]))
+        store.close()
+        cls.api = load_api({'MODEL_PATH': model_path, 'MAX_BATCH_SIZE': '5', 'FEATURE_STORE_PATH': cls.store_path})
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.modules.pop('api', None)
+        cls.tmp_dir.cleanup()
+
+    def records(self, n):
+        return [dict(zip(FEATURES, map(float, row))) for row in self.X.to_numpy()[:n]]
+
+    def test_batch_needs_exactly_one_layout(self):
+        with TestClient(self.api.app) as client:
+            columns = {col: [1.0] for col in FEATURES}
+            self.assertEqual(client.post('/predict/batch', json={}).status_code, 422)
+            self.assertEqual(client.post('/predict/batch', json={'records': self.records(1), 'columns': columns}).status_code, 422)
+
+    def test_batch_ragged_columns(self):
+        columns = {col: [1.0, 2.0] for col in FEATURES}
+        columns['Value'] = [1.0]
+        with TestClient(self.api.app) as client:
+            self.assertEqual(client.post('/predict/batch', json={'columns': columns}).status_code, 422)
+            del columns['Value']
+            self.assertEqual(client.post('/predict/batch', json={'columns': columns}).status_code, 422)
+
+    def test_batch_empty(self):
+        with TestClient(self.api.app) as client:
+            self.assertEqual(client.post('/predict/batch', json={'records': []}).status_code, 422)
+            self.assertEqual(client.post('/predict/batch', json={'columns': {col: [] for col in FEATURES}}).status_code, 422)
+
+    def test_batch_size_limit(self):
+        with TestClient(self.api.app) as client:
+            self.assertEqual(client.post('/predict/batch', json={'records': self.records(6)}).status_code, 413)
+            self.assertEqual(client.post('/predict/batch', json={'records': self.records(5)}).status_code, 200)
+
+    def test_batch_matches_single_predictions(self):
+        records = self.records(5)
+        columns = {col: [record[col] for record in records] for col in FEATURES}
+        with TestClient(self.api.app) as client:
+            by_records = client.post('/predict/batch', json={'records': records}).json()
+            by_columns = client.post('/predict/batch', json={'columns': columns}).json()
+            single = [client.post('/predict', json=record).json()['predictions'][0] for record in records]
+
+        expected = self.model.predict(self.X.iloc[:5]).tolist()
+        self.assertEqual(by_records['predictions'], expected)
+        self.assertEqual(by_columns['predictions'], expected)
+        self.assertEqual(single, expected)
+        np.testing.assert_allclose(by_records['probabilities'], self.model.predict_proba(self.X.iloc[:5]))
+
+    def test_predict_customer(self):
+        with TestClient(self.api.app) as client:
+            response = client.post('/predict/customer/C1', json={'Amount': 80.0, 'Value': 20.0})
+            missing = client.post('/predict/customer/C9', json={'Amount': 80.0, 'Value': 20.0})
+        expected = self.model.predict(pd.DataFrame([{'Amount': 80.0, 'Value': 20.0, **self.stored}], columns=FEATURES))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'CustomerId': 'C1', 'predictions': expected.tolist()})
+        self.assertEqual(missing.status_code, 404)
+
+    def test_predict_customer_with_preprocessor(self):
+        # A feature store written after scaling, served with the preprocessor that did the scaling
+        transactions = pd.DataFrame({'CustomerId': ['C1', 'C2', 'C1', 'C2', 'C1'], 'TransactionId': ['T1', 'T2', 'T3', 'T4', 'T5'],
+                                     'Amount': [100.0, 200.0, 150.0, -50.0, 20.0], 'Value': [100.0, 200.0, 150.0, 50.0, 20.0]})
+        feature_eng = FeatureEngineering(os.path.join(self.tmp_dir.name, 'missing.csv'))
+        feature_eng.df = transactions.copy()
+        feature_eng.create_aggregate_features()
+        feature_eng.scale_numerical_features()
+        store_path = os.path.join(self.tmp_dir.name, 'scaled_store.db')
+        feature_eng.save_feature_store(store_path)
+
+        raw = transactions[transactions['CustomerId'] == 'C1']['Amount']
+        row = pd.DataFrame([{'Amount': 80.0, 'Value': 20.0, 'total_transaction_amount': raw.sum(), 'average_transaction_amount': raw.mean(),
+                             'transaction_count': len(raw), 'std_transaction_amount': raw.std()}], columns=FEATURES)
+        model = RecordingModel()
+        with mock.patch.object(self.api, 'FEATURE_STORE_PATH', store_path), mock.patch.object(self.api, 'feature_store', None), \
+                mock.patch.object(self.api, 'model', model), mock.patch.object(self.api, 'preprocessor', feature_eng.preprocessor):
+            with TestClient(self.api.app) as client:
+                response = client.post('/predict/customer/C1', json={'Amount': 80.0, 'Value': 20.0})
+        self.assertEqual(response.status_code, 200)
+
+        # The model sees the aggregates scaled exactly once
+        np.testing.assert_allclose(model.scored, feature_eng.preprocessor.transform(row).to_numpy())
+
+    def test_predict_customer_without_store(self):
+        missing_path = os.path.join(self.tmp_dir.name, 'missing.db')
+        with mock.patch.object(self.api, 'FEATURE_STORE_PATH', missing_path), mock.patch.object(self.api, 'feature_store', None):
+            with TestClient(self.api.app) as client:
+                response = client.post('/predict/customer/C1', json={'Amount': 80.0, 'Value': 20.0})
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(os.path.exists(missing_path))
+
+    def test_admin_disabled_without_token(self):
+        with TestClient(self.api.app) as client:
+            self.assertEqual(client.get('/admin/model').status_code, 403)
+            self.assertEqual(client.post('/admin/model', json={}, headers={'X-Admin-Token': ''}).status_code, 403)
+
+class TestAdminApi(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(1)
+        X = pd.DataFrame(rng.random((200, len(FEATURES))), columns=FEATURES)
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        y = np.where(X['Amount'] > 0.5, 'Good', 'Bad')
+        cls.registry = ModelRegistry(cls.tmp_dir.name)
+
+        # v0001 is trained on the raw features, v0002 on WoE values and registered with its bins
+        cls.woe = WoEBinning(n_jobs=1).fit(X, y)
+        cls.models = [RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y),
+                      RandomForestClassifier(n_estimators=4, random_state=0).fit(cls.woe.transform(X), y)]
+        cls.registry.register(cls.models[0])
+        cls.registry.register(cls.models[1], promote=False, woe_binning=cls.woe)
+        cls.X = X
+        cls.api = load_api({'MODEL_REGISTRY_DIR': cls.tmp_dir.name, 'ADMIN_TOKEN': 'secret'})
+        cls.headers = {'X-Admin-Token': 'secret'}
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.modules.pop('api', None)
+        cls.tmp_dir.cleanup()
+
+    def setUp(self):
+        self.registry.promote('random_forest', 'v0001')
+        self.api.swap_model('v0001')
+
+    def test_token_is_enforced(self):
+        with TestClient(self.api.app) as client:
+            self.assertEqual(client.get('/admin/model').status_code, 403)
+            self.assertEqual(client.get('/admin/model', headers={'X-Admin-Token': 'wrong'}).status_code, 403)
+            self.assertEqual(client.post('/admin/model', json={'version': 'v0002'}).status_code, 403)
+            response = client.get('/admin/model', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['versions'], ['v0001', 'v0002'])
+        self.assertEqual(self.api.model_info['version'], 'v0001')
+
+    def test_unknown_version(self):
+        with TestClient(self.api.app) as client:
+            for version in ['v0009', '../../model', 'v0001/../../x']:
+                response = client.post('/admin/model', json={'version': version}, headers=self.headers)
+                self.assertEqual(response.status_code, 404, version)
+        self.assertEqual(self.api.model_info['version'], 'v0001')
+
+    def test_swap_and_promote(self):
+        with TestClient(self.api.app) as client:
+            response = client.post('/admin/model', json={'version': 'v0002'}, headers=self.headers)
+            self.assertEqual(response.json()['model']['version'], 'v0002')
+            self.assertEqual(self.registry.current_version('random_forest'), 'v0001')
+
+            response = client.post('/admin/model', json={'version': 'v0002', 'promote': True}, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.registry.current_version('random_forest'), 'v0002')
+        self.assertEqual(len(self.api.model.estimators_), 4)
+
+    def test_woe_binning_follows_the_version(self):
+        matrix = self.X.to_numpy()
+        _, probabilities = self.api.score_matrix(matrix)
+        np.testing.assert_array_equal(probabilities, self.models[0].predict_proba(self.X))
+
+        self.api.swap_model('v0002')
+        _, probabilities = self.api.score_matrix(matrix)
+        np.testing.assert_array_equal(probabilities, self.models[1].predict_proba(self.woe.transform(self.X)))
+
+    def test_failed_refresh_keeps_serving(self):
+        # v0002 was registered without a compiled/ export, so the compiled backend can't load it
+        self.registry.promote('random_forest', 'v0002')
+        with mock.patch.object(self.api, 'MODEL_REFRESH_SECONDS', 1e-9), mock.patch.object(self.api, 'promoted_version', 'v0001'):
+            with mock.patch.object(self.api, 'MODEL_BACKEND', 'compiled'):
+                self.api.promoted_checked_at = 0.0
+                self.assertIsNotNone(self.api.get_model())
+            self.assertEqual(self.api.model_info['version'], 'v0001')
+            self.assertEqual(self.api.promoted_version, 'v0001')
+
+            # The next check retries and picks the version up once it loads
+            self.api.promoted_checked_at = 0.0
+            self.api.get_model()
+            self.assertEqual(self.api.model_info['version'], 'v0002')
+            self.assertEqual(self.api.promoted_version, 'v0002')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
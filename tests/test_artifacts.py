@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from artifacts import artifact_format, artifact_schema, load_artifact, save_artifact
+from Feature_Eng import FeatureEngineering
+from RFMS import RFMS
+from streaming import stream_customer_aggregates
+
+class TestArtifacts(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Create a sample dataframe for testing
+        rng = np.random.default_rng(5)
+        n = 500
+        times = pd.Timestamp('2018-11-15', tz='UTC') + pd.to_timedelta(np.sort(rng.integers(0, 30 * 86400, n)), unit='s')
+        cls.df = pd.DataFrame({
+            'TransactionId': [f'TransactionId_{i}' for i in range(n)],
+            'CustomerId': [f'CustomerId_{i}' for i in rng.integers(0, 40, n)],
+            'ProviderId': rng.choice(['ProviderId_1', 'ProviderId_4', 'ProviderId_6'], n),
+            'ProductId': rng.choice(['ProductId_3', 'ProductId_10'], n),
+            'ChannelId': rng.choice(['ChannelId_2', 'ChannelId_3'], n),
+            'Amount': np.round(rng.normal(1000, 800, n), 2),
+            'Value': np.round(np.abs(rng.normal(1000, 800, n))),
+            'TransactionStartTime': times.strftime('%Y-%m-%dT%H:%M:%SZ')
+        })
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_artifact_format(self):
+        self.assertEqual(artifact_format('a/rfms.parquet'), 'parquet')
+        self.assertEqual(artifact_format('featured.feather'), 'feather')
+        self.assertEqual(artifact_format('featured.csv'), 'csv')
+
+    def test_schema_uses_dictionary_encoding_and_timestamps(self):
+        schema = artifact_schema(self.df)
+        self.assertEqual(str(schema.field('ProviderId').type), 'dictionary<values=string, indices=int8, ordered=0>')
+        self.assertTrue(str(schema.field('TransactionStartTime').type).startswith('timestamp'))
+        self.assertEqual(str(schema.field('TransactionId').type), 'string')
+
+    def test_parquet_round_trip(self):
+        path = os.path.join(self.tmp_dir.name, 'featured.parquet')
+        save_artifact(self.df, path)
+        loaded = load_artifact(path)
+        self.assertIsInstance(loaded['ChannelId'].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(loaded['TransactionStartTime']))
+        self.assertEqual(loaded['ProviderId'].astype(str).tolist(), self.df['ProviderId'].tolist())
+        np.testing.assert_array_equal(loaded['Amount'], self.df['Amount'])
+
+    def test_feather_projection(self):
+        path = os.path.join(self.tmp_dir.name, 'featured.feather')
+        save_artifact(self.df, path)
+        loaded = load_artifact(path, columns=['CustomerId', 'Amount'])
+        self.assertEqual(list(loaded.columns), ['CustomerId', 'Amount'])
+
+    def test_pipeline_handoff_through_parquet(self):
+        raw_path = os.path.join(self.tmp_dir.name, 'data.parquet')
+        featured_path = os.path.join(self.tmp_dir.name, 'featured.parquet')
+        save_artifact(self.df, raw_path)
+
+        feature_eng = FeatureEngineering(raw_path)
+        feature_eng.create_aggregate_features()
+        feature_eng.save_cleaned_data(featured_path)
+
+        rfms = RFMS(featured_path)
+        df = rfms.calculate_rfms_features()
+        self.assertEqual(df['Frequency'].sum(), (self.df.groupby('CustomerId').size() ** 2).sum())
+
+    def test_streaming_from_parquet(self):
+        path = os.path.join(self.tmp_dir.name, 'data.parquet')
+        save_artifact(self.df, path)
+        from_parquet = stream_customer_aggregates(path, chunksize=64).aggregate_frame()
+        from_frame = stream_customer_aggregates(self.write_csv(), chunksize=64).aggregate_frame()
+        pd.testing.assert_frame_equal(from_parquet, from_frame, check_exact=True)
+
+    def write_csv(self):
+        path = os.path.join(self.tmp_dir.name, 'data.csv')
+        self.df.to_csv(path, index=False)
+        return path
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import time
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the path to the apps directory
+sys.path.append(os.path.abspath('../apps'))
+
+from batcher import MicroBatcher
+
+def fake_predict(matrix):
+    # Echo the first feature back so every caller can check it got its own row
+    predictions = matrix[:, 0].copy()
+    probabilities = np.column_stack([1 - matrix[:, 0] / 100, matrix[:, 0] / 100])
+    return predictions, probabilities
+
+def failing_predict(matrix):
+    raise ValueError("model failure")
+
+def slow_predict(matrix):
+    time.sleep(0.2)
+    return fake_predict(matrix)
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def run_requests(self, batcher, rows):
+        async def main():
+            await batcher.start()
+            try:
+                return await asyncio.gather(*[batcher.submit(row) for row in rows], return_exceptions=True)
+            finally:
+                await batcher.stop()
+        return asyncio.run(main())
+
+    def test_results_are_fanned_out_in_order(self):
+        batcher = MicroBatcher(fake_predict, max_batch_size=8, max_wait_ms=5)
+        rows = [np.array([float(i), 0.0]) for i in range(20)]
+        results = self.run_requests(batcher, rows)
+        for i, (predictions, probabilities) in enumerate(results):
+            self.assertEqual(predictions.tolist(), [float(i)])
+            self.assertEqual(probabilities.shape, (1, 2))
+
+    def test_requests_are_coalesced(self):
+        batcher = MicroBatcher(fake_predict, max_batch_size=8, max_wait_ms=5)
+        self.run_requests(batcher, [np.array([1.0, 0.0])] * 20)
+        metrics = batcher.metrics()
+        self.assertEqual(metrics['requests'], 20)
+        self.assertEqual(metrics['batches'], 3)
+        self.assertEqual(metrics['max_queue_depth'], 20)
+        self.assertAlmostEqual(metrics['mean_fill_rate'], 20 / 24)
+
+    def test_errors_propagate_to_callers(self):
+        batcher = MicroBatcher(failing_predict, max_batch_size=4, max_wait_ms=1)
+        results = self.run_requests(batcher, [np.array([1.0])] * 3)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+        self.assertEqual(batcher.metrics()['errors'], 1)
+
+    def test_malformed_row_fails_only_its_batch(self):
+        batcher = MicroBatcher(fake_predict, max_batch_size=4, max_wait_ms=1)
+        async def main():
+            await batcher.start()
+            try:
+                bad = await asyncio.gather(batcher.submit(np.array([1.0, 0.0])), batcher.submit(np.array([1.0, 0.0, 0.0])), return_exceptions=True)
+                good = await asyncio.wait_for(batcher.submit(np.array([3.0, 0.0])), 1)
+                return bad, good
+            finally:
+                await batcher.stop()
+        bad, good = asyncio.run(main())
+        self.assertTrue(all(isinstance(result, ValueError) for result in bad))
+        self.assertEqual(good[0].tolist(), [3.0])
+
+    def test_stop_fails_in_flight_requests(self):
+        batcher = MicroBatcher(slow_predict, max_batch_size=4, max_wait_ms=1)
+        async def main():
+            await batcher.start()
+            requests = [asyncio.ensure_future(batcher.submit(np.array([1.0, 0.0]))) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            await batcher.stop()
+            return await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), 1)
+        for result in asyncio.run(main()):
+            self.assertIsInstance(result, RuntimeError)
+
+    def test_stop_does_not_block_the_event_loop(self):
+        batcher = MicroBatcher(slow_predict, max_batch_size=4, max_wait_ms=1)
+        async def main():
+            await batcher.start()
+            request = asyncio.ensure_future(batcher.submit(np.array([1.0, 0.0])))
+            await asyncio.sleep(0.05)
+
+            # Ticks while stop() waits for the 0.2s batch still scoring in the worker thread
+            ticks = []
+            async def tick():
+                while True:
+                    ticks.append(time.perf_counter())
+                    await asyncio.sleep(0.01)
+            ticker = asyncio.ensure_future(tick())
+            await batcher.stop()
+            ticker.cancel()
+            await asyncio.gather(request, return_exceptions=True)
+            return ticks
+        self.assertGreater(len(asyncio.run(main())), 5)
+
+    def test_submit_requires_running_batcher(self):
+        batcher = MicroBatcher(fake_predict)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(batcher.submit(np.array([1.0])))
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
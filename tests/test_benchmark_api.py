@@ -0,0 +1,69 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+import sys
+
+# Add the path to the apps directory
+sys.path.append(os.path.abspath('../apps'))
+
+from benchmark_api import FEATURES, compare_results, latency_summary, make_request, parse_mix, run_in_process, summarize_run
+
+class TestBenchmarkApi(unittest.TestCase):
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('single:3,batch:1'), {'single': 0.75, 'batch': 0.25})
+        self.assertEqual(parse_mix('columns'), {'columns': 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix('stream:1')
+
+    def test_make_request(self):
+        rng = np.random.default_rng(0)
+        path, body, rows = make_request('single', rng, 10)
+        self.assertEqual((path, rows, list(body)), ('/predict', 1, FEATURES))
+        path, body, rows = make_request('columns', rng, 10)
+        self.assertEqual((path, rows), ('/predict/batch', 10))
+        self.assertEqual(len(body['columns']['Amount']), 10)
+
+    def test_latency_summary(self):
+        summary = latency_summary(np.arange(1, 101) / 1000, errors=2, rows=100, elapsed=2.0, cpu=0.5)
+        self.assertEqual(summary['requests'], 100)
+        self.assertEqual(summary['qps'], 50.0)
+        self.assertAlmostEqual(summary['p50_ms'], 50.5)
+        self.assertAlmostEqual(summary['p99_ms'], 99.01)
+        self.assertEqual(summary['cpu_ms_per_request'], 5.0)
+        self.assertEqual(latency_summary([], 3, 0, 1.0, None), {'requests': 0, 'errors': 3})
+
+    def test_compare_results(self):
+        baseline = {'results': {'overall': {'qps': 100.0, 'p99_ms': 10.0}}}
+        current = {'results': {'overall': {'qps': 95.0, 'p99_ms': 12.0}}}
+        rows = {row['metric']: row for row in compare_results(baseline, current, tolerance=0.1)}
+        self.assertFalse(rows['qps']['regression'])
+        self.assertTrue(rows['p99_ms']['regression'])
+        self.assertAlmostEqual(rows['p99_ms']['change'], 0.2)
+
+    def test_in_process_run(self):
+        # Serve a small model trained on the API's feature columns
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.random((300, len(FEATURES))), columns=FEATURES)
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, np.where(X['Amount'] > 0.5, 'Good', 'Bad'))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.environ['MODEL_PATH'] = os.path.join(tmp_dir, 'model.pkl')
+            joblib.dump(model, os.environ['MODEL_PATH'])
+            try:
+                samples, elapsed, cpu, info = asyncio.run(run_in_process(parse_mix('single:1,batch:1'), 4, 5, 40, None, 5, 0))
+            finally:
+                del os.environ['MODEL_PATH']
+
+        results = summarize_run(samples, elapsed, cpu)
+        self.assertEqual(results['overall']['requests'], 40)
+        self.assertEqual(results['overall']['errors'], 0)
+        self.assertEqual(results['single']['requests'] + results['batch']['requests'], 40)
+        self.assertGreater(results['overall']['cpu_ms_per_request'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from benchmark_pipeline import measure, run_benchmark, scaling_exponents, summary_table
+
+class TestBenchmarkPipeline(unittest.TestCase):
+
+    def test_measure(self):
+        result, stats = measure(lambda: np.ones(2_000_000).sum())
+        self.assertEqual(result, 2_000_000)
+        self.assertEqual(stats['status'], 'ok')
+        self.assertGreater(stats['wall_seconds'], 0)
+        self.assertGreaterEqual(stats['peak_memory_mb'], 0)
+
+        _, stats = measure(lambda: print("Error loading data: missing file"), memory='tracemalloc')
+        self.assertEqual(stats['status'], 'error')
+        self.assertIn('missing file', stats['error'])
+
+    def test_scaling_exponents(self):
+        results = pd.DataFrame({
+            'suite': ['rfms'] * 4,
+            'method': ['linear', 'linear', 'quadratic', 'quadratic'],
+            'rows': [1000, 10000, 1000, 10000],
+            'wall_seconds': [0.1, 1.0, 0.1, 10.0],
+            'status': ['ok'] * 4
+        })
+        exponents = scaling_exponents(results)
+        self.assertAlmostEqual(exponents[('rfms', 'linear')], 1.0)
+        self.assertAlmostEqual(exponents[('rfms', 'quadratic')], 2.0)
+
+    def test_run_benchmark(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results = run_benchmark([2000, 4000], tmp_dir, suites=['feature_engineering', 'rfms', 'model'])
+        self.assertEqual(set(results['rows']), {2000, 4000})
+        self.assertTrue((results['status'] == 'ok').all(), results.loc[results['status'] != 'ok', 'error'].tolist())
+        self.assertIn('save_rfms_data', set(results['method']))
+        self.assertNotIn('check_distribution', set(results['method']))
+
+        # Every method has a wall time per size and a scaling exponent
+        table = summary_table(results)
+        self.assertIn('wall_s@4000', table.columns)
+        self.assertFalse(table['scaling_exponent'].isna().any())
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
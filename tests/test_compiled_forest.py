@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from compiled_forest import CompiledForest, export_forest
+from model import ModelTraining
+
+class TestCompiledForest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Train a small forest on synthetic transaction-like features
+        rng = np.random.default_rng(42)
+        columns = ['Amount', 'Value', 'total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount']
+        cls.X = pd.DataFrame(rng.lognormal(6, 2, size=(600, 6)), columns=columns)
+        cls.X['transaction_count'] = rng.integers(1, 50, size=600)
+        cls.y = np.where(cls.X['Amount'] * rng.uniform(0.5, 1.5, size=600) > 400, 'Good', 'Bad')
+        cls.rf = RandomForestClassifier(n_estimators=25, random_state=42).fit(cls.X, cls.y)
+
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.model_dir = export_forest(cls.rf, os.path.join(cls.tmp_dir.name, 'compiled'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_predict_proba_parity(self):
+        compiled = CompiledForest.load(self.model_dir)
+        X_new = self.X.sample(frac=1.0, random_state=0).to_numpy() * 1.01
+        np.testing.assert_array_equal(compiled.predict_proba(X_new), self.rf.predict_proba(pd.DataFrame(X_new, columns=self.X.columns)))
+
+    def test_predict_parity_single_row(self):
+        compiled = CompiledForest.load(self.model_dir)
+        row = self.X.iloc[[3]]
+        self.assertEqual(compiled.predict(row.to_numpy()).tolist(), self.rf.predict(row).tolist())
+
+    def test_memory_mapped_load(self):
+        compiled = CompiledForest.load(self.model_dir, mmap_mode='r')
+        self.assertIsInstance(compiled.threshold, np.memmap)
+        np.testing.assert_array_equal(compiled.predict_proba(self.X.to_numpy()), self.rf.predict_proba(self.X))
+
+    def test_rejects_wrong_feature_count(self):
+        compiled = CompiledForest.load(self.model_dir)
+        with self.assertRaises(ValueError):
+            compiled.predict_proba(np.zeros((2, 3)))
+
+    def test_save_model_exports_compiled_forest(self):
+        model_training = ModelTraining(os.path.join(self.tmp_dir.name, 'missing.csv'))
+        output_dir = os.path.join(self.tmp_dir.name, 'saved_compiled')
+        model_training.save_model(self.rf, os.path.join(self.tmp_dir.name, 'rf.pkl'), compiled_dir=output_dir)
+        compiled = CompiledForest.load(output_dir)
+        self.assertEqual(compiled.classes_.tolist(), ['Bad', 'Good'])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
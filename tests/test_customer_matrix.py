@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from customer_matrix import build_customer_matrix, customer_feature_columns, grouped_train_test_split
+from model import ModelTraining
+
+class TestCustomerMatrix(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Create a sample transaction-level RFMS frame with customer features repeated on every row
+        rng = np.random.default_rng(0)
+        n_customers, n = 60, 1200
+        codes = rng.integers(0, n_customers, n)
+        df = pd.DataFrame({
+            'CustomerId': [f'CustomerId_{i}' for i in codes],
+            'Amount': rng.normal(500, 200, n),
+            'Value': rng.integers(0, 1000, n),
+            'ProviderId': rng.integers(1, 6, n),
+            'FraudResult': rng.integers(0, 2, n)
+        })
+        grouped = df.groupby('CustomerId')['Amount']
+        df['total_transaction_amount'] = grouped.transform('sum')
+        df['average_transaction_amount'] = grouped.transform('mean')
+        df['transaction_count'] = grouped.transform('count')
+        df['std_transaction_amount'] = grouped.transform('std')
+        df['Score'] = df['total_transaction_amount'] / 1000
+        df['Label'] = np.where(df['Score'] >= df['Score'].median(), 'Good', 'Bad')
+        cls.df = df
+
+    def test_one_row_per_customer(self):
+        customer_df = build_customer_matrix(self.df)
+        self.assertEqual(len(customer_df), self.df['CustomerId'].nunique())
+        self.assertTrue(customer_df['CustomerId'].is_monotonic_increasing)
+
+        expected = self.df.groupby('CustomerId').agg(
+            total_transaction_amount=('total_transaction_amount', 'first'),
+            Label=('Label', 'first'),
+            min_amount=('Amount', 'min'),
+            max_amount=('Amount', 'max'),
+            total_value=('Value', 'sum'),
+            fraud_count=('FraudResult', 'sum'),
+            distinct_providers=('ProviderId', 'nunique')
+        ).reset_index()
+        for col in expected.columns:
+            self.assertEqual(list(customer_df[col]), list(expected[col]), col)
+        self.assertFalse(customer_df['std_transaction_amount'].isna().any())
+
+    def test_summaries_are_optional(self):
+        customer_df = build_customer_matrix(self.df, summaries=False)
+        self.assertNotIn('min_amount', customer_df.columns)
+        self.assertEqual(customer_feature_columns(customer_df),
+                         ['total_transaction_amount', 'average_transaction_amount', 'transaction_count', 'std_transaction_amount'])
+
+    def test_label_inputs_are_not_features(self):
+        # Label is Score >= threshold, so Score and the R/F/M it is built from stay out of the features
+        df = self.df.assign(Recency=3, Frequency=self.df['transaction_count'], Monetary=self.df['total_transaction_amount'])
+        customer_df = build_customer_matrix(df)
+        self.assertIn('Score', customer_df.columns)
+        features = customer_feature_columns(customer_df)
+        for col in ['Recency', 'Frequency', 'Monetary', 'Score', 'Label']:
+            self.assertNotIn(col, features)
+
+    def test_grouped_split_keeps_customers_together(self):
+        X, y = self.df[['Amount', 'Value']], self.df['Label']
+        X_train, X_test, y_train, y_test, groups_train = grouped_train_test_split(X, y, self.df['CustomerId'])
+        train_customers = set(self.df['CustomerId'].iloc[X_train.index])
+        test_customers = set(self.df['CustomerId'].iloc[X_test.index])
+        self.assertFalse(train_customers & test_customers)
+        self.assertEqual(len(X_train) + len(X_test), len(self.df))
+        self.assertEqual(set(groups_train), train_customers)
+
+    def test_model_training_levels(self):
+        model_training = ModelTraining('../src/Data/rfms.csv')
+        model_training.df = self.df
+
+        model_training.split_data(level='customer')
+        self.assertEqual(len(model_training.X_train) + len(model_training.X_test), self.df['CustomerId'].nunique())
+        model_training.train_random_forest()
+        self.assertEqual(len(model_training.y_pred_rf), len(model_training.X_test))
+
+        model_training.split_data(grouped=True)
+        self.assertEqual(len(model_training.groups_train), len(model_training.X_train))
+        results = model_training.hyperparameter_tuning_log_reg(n_jobs=1)
+        self.assertIsNotNone(results)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
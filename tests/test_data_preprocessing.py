@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder, MinMaxScaler, StandardScaler
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from data_preprocessing import Preprocessor, preprocessor_path
+
+class TestPreprocessor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.df = pd.DataFrame({
+            'Amount': rng.normal(1000, 300, 500),
+            'Value': rng.lognormal(6, 1, 500),
+            'constant': np.full(500, 3.0),
+            'ProviderId': rng.choice(['ProviderId_4', 'ProviderId_1', 'ProviderId_6'], 500),
+            'PricingStrategy': rng.choice([0, 2, 4], 500)
+        })
+        cls.numerical = ['Amount', 'Value', 'constant']
+
+    def test_normalize_matches_min_max_scaler(self):
+        preprocessor = Preprocessor().fit_numerical(self.df, self.numerical, 'normalize')
+        expected = MinMaxScaler().fit_transform(self.df[self.numerical])
+        np.testing.assert_allclose(preprocessor.transform(self.df)[self.numerical].to_numpy(), expected)
+
+    def test_standardize_matches_standard_scaler(self):
+        preprocessor = Preprocessor().fit_numerical(self.df, self.numerical, 'standardize')
+        expected = StandardScaler().fit_transform(self.df[self.numerical])
+        np.testing.assert_allclose(preprocessor.transform(self.df)[self.numerical].to_numpy(), expected, atol=1e-12)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            Preprocessor().fit_numerical(self.df, self.numerical, 'log')
+
+    def test_encoding_matches_label_encoder(self):
+        preprocessor = Preprocessor().fit_categorical(self.df, ['ProviderId', 'PricingStrategy'])
+        encoded = preprocessor.transform(self.df)
+        for col in ['ProviderId', 'PricingStrategy']:
+            np.testing.assert_array_equal(encoded[col], LabelEncoder().fit_transform(self.df[col]))
+
+        # Categorical input goes through the per-category lookup and gives the same codes
+        categorical = self.df[['ProviderId']].astype('category')
+        np.testing.assert_array_equal(preprocessor.transform(categorical)['ProviderId'], encoded['ProviderId'])
+
+    def test_unseen_and_missing_categories(self):
+        preprocessor = Preprocessor().fit_categorical(self.df, ['ProviderId'])
+        codes = preprocessor.encode('ProviderId', pd.Series(['ProviderId_1', 'ProviderId_9', None]))
+        np.testing.assert_array_equal(codes, [0, -1, -1])
+        codes = preprocessor.encode('ProviderId', pd.Series(['ProviderId_6', None, 'ProviderId_9'], dtype='category'))
+        np.testing.assert_array_equal(codes, [2, -1, -1])
+
+    def test_transform_matrix_matches_frame(self):
+        preprocessor = Preprocessor().fit_numerical(self.df, ['Amount', 'Value'])
+        columns = ['Value', 'constant', 'Amount']
+        matrix = preprocessor.transform_matrix(self.df[columns].to_numpy(), columns)
+        np.testing.assert_allclose(matrix, preprocessor.transform(self.df)[columns].to_numpy())
+
+    def test_inverse_transform_round_trips(self):
+        for method in ['normalize', 'standardize']:
+            preprocessor = Preprocessor().fit_categorical(self.df, ['ProviderId']).fit_numerical(self.df, self.numerical, method)
+            restored = preprocessor.inverse_transform(preprocessor.transform(self.df, self.numerical), self.numerical)
+            pd.testing.assert_frame_equal(restored, self.df, check_dtype=False)
+
+    def test_save_and_load(self):
+        preprocessor = Preprocessor().fit_categorical(self.df, ['ProviderId']).fit_numerical(self.df, self.numerical)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = preprocessor.save(preprocessor_path(os.path.join(tmp, 'model.pkl')))
+            self.assertTrue(path.endswith('model.preprocessor.pkl'))
+            loaded = Preprocessor.load(path)
+        pd.testing.assert_frame_equal(loaded.transform(self.df), preprocessor.transform(self.df))
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from dtype_planner import numeric_columns, optimize_dtypes, plan_dtypes, restore_ids
+from EDA import EDA
+
+class TestDtypePlanner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Create a sample transaction dataframe for testing
+        n = 200
+        rng = np.random.default_rng(1)
+        cls.df = pd.DataFrame({
+            'TransactionId': [f'TransactionId_{i}' for i in rng.permutation(n) + 70000],
+            'CustomerId': [f'CustomerId_{i}' for i in rng.integers(0, 20, n)],
+            'ProductCategory': rng.choice(['airtime', 'financial_services'], n),
+            'CountryCode': 256,
+            'Amount': rng.integers(-500, 5000, n).astype(float),
+            'Value': rng.integers(0, 5000, n),
+            'TransactionStartTime': pd.date_range('2018-11-15', periods=n, freq='h', tz='UTC').strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'FraudResult': rng.integers(0, 2, n)
+        })
+
+    def test_plan(self):
+        plan = plan_dtypes(self.df)
+        self.assertEqual(plan['TransactionId'], {'kind': 'id_code', 'prefix': 'TransactionId', 'dtype': 'int32'})
+        self.assertEqual(plan['CustomerId'], {'kind': 'category'})
+        self.assertEqual(plan['CountryCode'], {'kind': 'numeric', 'dtype': 'int16'})
+        self.assertEqual(plan['Amount'], {'kind': 'numeric', 'dtype': 'float32'})
+        self.assertEqual(plan['FraudResult'], {'kind': 'numeric', 'dtype': 'int8'})
+        self.assertEqual(plan['TransactionStartTime'], {'kind': 'datetime'})
+
+    def test_float_narrowing_is_lossless_only(self):
+        plan = plan_dtypes(pd.DataFrame({'Amount': [0.1, 1.5]}))
+        self.assertEqual(plan['Amount'], {'kind': 'keep'})
+
+    def test_strip_prefix_columns(self):
+        plan = plan_dtypes(self.df, strip_prefix_columns=['CustomerId'])
+        self.assertEqual(plan['CustomerId']['kind'], 'id_code')
+
+    def test_ids_that_do_not_round_trip_stay_strings(self):
+        # Leading zeros, more digits than int64 holds and non-ASCII digits fall back to category
+        for ids in [['X_007', 'X_7', 'X_8'], ['X_1', 'X_' + '9' * 19, 'X_2'], ['X_1', 'X_\u0662', 'X_3']]:
+            plan = plan_dtypes(pd.DataFrame({'TransactionId': ids}), strip_prefix_columns=['TransactionId'])
+            self.assertEqual(plan['TransactionId'], {'kind': 'category'}, ids)
+        plan = plan_dtypes(pd.DataFrame({'TransactionId': ['X_0', 'X_10', 'X_' + '9' * 18]}), strip_prefix_columns=['TransactionId'])
+        self.assertEqual(plan['TransactionId'], {'kind': 'id_code', 'prefix': 'X', 'dtype': 'int64'})
+
+    def test_optimize_preserves_values_and_reports_memory(self):
+        optimized, report = optimize_dtypes(self.df, verbose=False)
+        self.assertLess(report['memory_after_bytes'], report['memory_before_bytes'])
+        self.assertEqual(restore_ids(optimized['TransactionId'], report['plan']['TransactionId']).tolist(), self.df['TransactionId'].tolist())
+        np.testing.assert_array_equal(optimized['Amount'].astype(float), self.df['Amount'])
+        self.assertEqual(optimized['TransactionStartTime'].iloc[0], pd.Timestamp('2018-11-15', tz='UTC'))
+
+    def test_numeric_columns_skip_id_codes(self):
+        optimized, report = optimize_dtypes(self.df, verbose=False)
+        self.assertNotIn('TransactionId', numeric_columns(optimized, report['plan']))
+        self.assertIn('Amount', numeric_columns(optimized, report['plan']))
+
+    def test_eda_with_compact_dtypes(self):
+        eda = EDA(self.df, compact_dtypes=True)
+        numerical_summary, categorical_summary = eda.summary_statistics()
+        self.assertNotIn('TransactionId', numerical_summary.columns)
+        self.assertIn('CustomerId', categorical_summary.columns)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from feature_store import FeatureStore
+from Feature_Eng import FeatureEngineering
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'feature_store.db')
+
+        # Create a sample dataframe for testing
+        self.df = pd.DataFrame({
+            'CustomerId': ['C1', 'C2', 'C1', 'C3', 'C1'],
+            'TransactionId': ['T1', 'T2', 'T3', 'T4', 'T5'],
+            'Amount': [100.0, 200.0, 150.0, -50.0, 20.0]
+        })
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_build_and_lookup(self):
+        store = FeatureStore(self.db_path)
+        self.assertEqual(store.build_from_transactions(self.df), 3)
+        features = store.get_features('C1')
+        self.assertEqual(features['total_transaction_amount'], 270.0)
+        self.assertEqual(features['average_transaction_amount'], 90.0)
+        self.assertEqual(features['transaction_count'], 3)
+        self.assertAlmostEqual(features['std_transaction_amount'], self.df.loc[self.df['CustomerId'] == 'C1', 'Amount'].std())
+        store.close()
+
+    def test_single_transaction_customer_has_nan_std(self):
+        store = FeatureStore(self.db_path)
+        store.build_from_transactions(self.df)
+        self.assertTrue(np.isnan(store.get_features('C3')['std_transaction_amount']))
+        store.close()
+
+    def test_unknown_customer(self):
+        store = FeatureStore(self.db_path)
+        store.build_from_transactions(self.df)
+        self.assertIsNone(store.get_features('C404'))
+        store.close()
+
+    def test_rebuild_replaces_rows(self):
+        store = FeatureStore(self.db_path)
+        store.build_from_transactions(self.df)
+        store.build_from_transactions(self.df[self.df['CustomerId'] == 'C2'].assign(Amount=500.0))
+        self.assertEqual(store.customer_count(), 3)
+        self.assertEqual(store.get_features('C2')['total_transaction_amount'], 500.0)
+        store.close()
+
+    def test_read_only_store(self):
+        with self.assertRaises(Exception):
+            FeatureStore(self.db_path, read_only=True).get_features('C1')
+
+    def test_save_feature_store_from_feature_engineering(self):
+        feature_eng = FeatureEngineering(os.path.join(self.tmp_dir.name, 'missing.csv'))
+        feature_eng.df = self.df.copy()
+        feature_eng.create_aggregate_features()
+        feature_eng.save_feature_store(self.db_path)
+        store = FeatureStore(self.db_path, read_only=True)
+        self.assertEqual(store.customer_count(), 3)
+        self.assertEqual(store.get_features('C2')['transaction_count'], 1)
+        store.close()
+
+    def test_feature_store_holds_raw_aggregates_after_scaling(self):
+        feature_eng = FeatureEngineering(os.path.join(self.tmp_dir.name, 'missing.csv'))
+        feature_eng.df = self.df.assign(Value=self.df['Amount'].abs())
+        feature_eng.create_aggregate_features()
+        feature_eng.scale_numerical_features()
+        feature_eng.save_feature_store(self.db_path)
+        store = FeatureStore(self.db_path, read_only=True)
+        features = store.get_features('C1')
+        self.assertAlmostEqual(features['total_transaction_amount'], 270.0)
+        self.assertAlmostEqual(features['average_transaction_amount'], 90.0)
+        self.assertEqual(features['transaction_count'], 3)
+        store.close()
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from incremental_aggregates import IncrementalAggregator
+
+class TestIncrementalAggregator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Skewed synthetic history: a few heavy customers and many light ones
+        rng = np.random.default_rng(7)
+        n = 5000
+        times = pd.Timestamp('2018-11-15', tz='UTC') + pd.to_timedelta(np.sort(rng.integers(0, 90 * 86400, n)), unit='s')
+        cls.df = pd.DataFrame({
+            'CustomerId': [f'CustomerId_{i}' for i in rng.zipf(1.5, n) % 300],
+            'TransactionId': [f'TransactionId_{i}' for i in range(n)],
+            'Amount': np.round(rng.lognormal(6, 2, n) * rng.choice([-1, 1], n, p=[0.3, 0.7]), 2),
+            'TransactionStartTime': times.strftime('%Y-%m-%dT%H:%M:%SZ')
+        })
+
+    def fold(self, batch_size, exact=True):
+        aggregator = IncrementalAggregator(exact=exact)
+        for start in range(0, len(self.df), batch_size):
+            aggregator.update(self.df.iloc[start:start + batch_size])
+        return aggregator
+
+    def test_aggregates_match_groupby_exactly(self):
+        expected = self.df.groupby('CustomerId').agg(
+            total_transaction_amount=('Amount', 'sum'),
+            average_transaction_amount=('Amount', 'mean'),
+            transaction_count=('TransactionId', 'count'),
+            std_transaction_amount=('Amount', 'std')
+        ).reset_index()
+        pd.testing.assert_frame_equal(self.fold(997).aggregate_frame(), expected, check_exact=True)
+
+    def test_rfms_matches_batch_computation(self):
+        df = self.df.copy()
+        df['TransactionStartTime'] = pd.to_datetime(df['TransactionStartTime'])
+        expected = df.groupby('CustomerId').agg(
+            TransactionStartTime=('TransactionStartTime', 'max'),
+            Frequency=('TransactionId', 'count'),
+            Monetary=('Amount', 'sum')
+        ).reset_index()
+        expected.insert(2, 'Recency', (df['TransactionStartTime'].max() - expected['TransactionStartTime']).dt.days)
+        expected['Score'] = expected['Frequency'] * expected['Monetary'] / (expected['Recency'] + 1)
+        pd.testing.assert_frame_equal(self.fold(1500).rfms_frame(), expected, check_exact=True)
+
+    def test_batch_boundaries_do_not_change_results(self):
+        pd.testing.assert_frame_equal(self.fold(13).aggregate_frame(), self.fold(5000).aggregate_frame(), check_exact=True)
+
+    def test_integer_amounts_stay_integer(self):
+        aggregator = IncrementalAggregator().update(pd.DataFrame({
+            'CustomerId': [1, 2, 1],
+            'TransactionId': [101, 102, 103],
+            'Amount': [100, 200, 150]
+        }))
+        frame = aggregator.aggregate_frame()
+        self.assertEqual(frame['total_transaction_amount'].tolist(), [250, 200])
+        self.assertTrue(pd.api.types.is_integer_dtype(frame['total_transaction_amount']))
+        self.assertTrue(np.isnan(frame['std_transaction_amount'].iloc[1]))
+
+    def test_merged_batches_match_to_rounding(self):
+        # exact=False merges each batch's per-customer totals in one step instead of row by row
+        pd.testing.assert_frame_equal(self.fold(997, exact=False).aggregate_frame(), self.fold(997).aggregate_frame(), check_exact=False, rtol=1e-9)
+
+        # One customer owning most of a batch is folded in as a single group
+        amounts = np.random.default_rng(1).normal(100, 30, 20000)
+        batch = pd.DataFrame({'CustomerId': ['C1'] * 19990 + ['C2'] * 10, 'TransactionId': np.arange(20000), 'Amount': amounts})
+        frame = IncrementalAggregator(exact=False).update(batch.iloc[:7000]).update(batch.iloc[7000:]).aggregate_frame()
+        self.assertAlmostEqual(frame['std_transaction_amount'].iloc[0], np.std(amounts[:19990], ddof=1), places=9)
+        self.assertAlmostEqual(frame['average_transaction_amount'].iloc[0], np.mean(amounts[:19990]), places=9)
+
+    def test_customer_without_timestamps_has_no_recency(self):
+        frame = IncrementalAggregator().update(pd.DataFrame({
+            'CustomerId': ['C1', 'C2', 'C1'],
+            'TransactionId': ['T1', 'T2', 'T3'],
+            'Amount': [100.0, 50.0, 20.0],
+            'TransactionStartTime': ['2018-11-15T02:18:49Z', None, '2018-11-16T02:18:49Z']
+        })).rfms_frame()
+        self.assertEqual(frame['Recency'].iloc[0], 0)
+        self.assertTrue(np.isnan(frame['Recency'].iloc[1]))
+        self.assertTrue(np.isnan(frame['Score'].iloc[1]))
+
+    def test_save_and_load_state(self):
+        aggregator = self.fold(2500)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'state.joblib')
+            aggregator.save(path)
+            restored = IncrementalAggregator.load(path)
+        pd.testing.assert_frame_equal(restored.aggregate_frame(), aggregator.aggregate_frame())
+        self.assertEqual(restored.rows_seen, len(self.df))
+
+if __name__ == '__main__':
+    unittest.main()
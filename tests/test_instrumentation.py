@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+import instrumentation
+from instrumentation import InstrumentedCall, JsonLinesSink, MemorySink, SummarySink, add_sink, error_count, errors_since, instrument_class, remove_sink, report_error, ERROR_HISTORY
+from EDA import EDA
+
+@instrument_class
+class Doubler:
+    def __init__(self, df):
+        self.df = df
+
+    def double(self):
+        try:
+            self.df = pd.concat([self.df, self.df], ignore_index=True)
+        except Exception as e:
+            report_error("Error doubling", e)
+        return self.df
+
+    def fail(self):
+        try:
+            raise ValueError("bad input")
+        except Exception as e:
+            report_error("Error failing", e)
+
+    def allocate(self):
+        with InstrumentedCall('Doubler', 'inner'):
+            block = np.ones(20_000_000)
+            block.sum()
+
+    def _private(self):
+        return len(self.df)
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.sink = add_sink(MemorySink())
+
+    def tearDown(self):
+        remove_sink(self.sink)
+
+    def test_method_events(self):
+        doubler = Doubler(pd.DataFrame({'a': range(5)}))
+        doubler.double()
+        doubler._private()
+        events = self.sink.frame()
+        self.assertEqual(list(events['method']), ['__init__', 'double'])
+        self.assertEqual(list(events['component']), ['Doubler', 'Doubler'])
+        double = events.iloc[1]
+        self.assertEqual((double['rows_in'], double['rows_out']), (5, 10))
+        self.assertEqual(double['status'], 'ok')
+        self.assertGreaterEqual(double['wall_seconds'], 0)
+        self.assertGreaterEqual(double['cpu_seconds'], 0)
+
+    def test_reported_errors(self):
+        Doubler(pd.DataFrame({'a': [1]})).fail()
+        event = self.sink.events[-1]
+        self.assertEqual(event['status'], 'error')
+        self.assertEqual(event['error'], 'ValueError: bad input')
+
+    def test_error_history_is_bounded(self):
+        n_errors = error_count()
+        for i in range(ERROR_HISTORY + 50):
+            report_error("Error in step", ValueError(i))
+        self.assertEqual(error_count(), n_errors + ERROR_HISTORY + 50)
+        self.assertEqual(errors_since(error_count() - 2), ["Error in step: 148", "Error in step: 149"])
+        self.assertEqual(len(errors_since(n_errors)), ERROR_HISTORY)
+        self.assertEqual(errors_since(error_count()), [])
+
+    @unittest.skipUnless(os.path.exists('/proc/self/clear_refs'), 'needs /proc')
+    def test_nested_peak_memory(self):
+        # The inner call's 150 MB peak is also counted for the outer call
+        Doubler(pd.DataFrame({'a': [1]})).allocate()
+        inner, outer = self.sink.events[-2], self.sink.events[-1]
+        self.assertEqual((inner['method'], inner['depth']), ('inner', 1))
+        self.assertEqual((outer['method'], outer['depth']), ('allocate', 0))
+        self.assertGreater(inner['peak_memory_delta_mb'], 100)
+        self.assertGreater(outer['peak_memory_delta_mb'], 100)
+
+    def test_profiling(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profile_dir, instrumentation.INSTRUMENTATION_PROFILE_DIR = instrumentation.INSTRUMENTATION_PROFILE_DIR, tmp_dir
+            try:
+                with InstrumentedCall('test', 'profiled', profile=['cprofile', 'tracemalloc']):
+                    sorted(np.random.default_rng(0).random(10000).tolist())
+            finally:
+                instrumentation.INSTRUMENTATION_PROFILE_DIR = profile_dir
+            event = self.sink.events[-1]
+            self.assertTrue(os.path.exists(event['profile_path']))
+        self.assertTrue(event['top_functions'])
+        self.assertGreater(event['tracemalloc_peak_mb'], 0)
+        self.assertTrue(event['top_allocations'])
+
+    def test_sinks(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'events.jsonl')
+            json_sink, summary_sink = add_sink(JsonLinesSink(path)), add_sink(SummarySink())
+            try:
+                eda = EDA(pd.DataFrame({'Amount': [1.0, 2.0, np.nan], 'ChannelId': ['a', 'b', 'a']}))
+                eda.identify_missing_values()
+                eda.count_unique_values()
+            finally:
+                remove_sink(json_sink)
+                remove_sink(summary_sink)
+            with open(path) as f:
+                events = [json.loads(line) for line in f]
+        self.assertEqual([event['method'] for event in events], ['__init__', 'identify_missing_values', 'count_unique_values'])
+        self.assertEqual(events[1]['rows_in'], 3)
+
+        summary = summary_sink.summary('EDA')
+        self.assertEqual(summary['identify_missing_values']['calls'], 1)
+        self.assertIn('p99_ms', summary['count_unique_values'])
+
+    def test_no_sinks(self):
+        # Without sinks the methods run as before and nothing is recorded
+        remove_sink(self.sink)
+        Doubler(pd.DataFrame({'a': [1]})).double()
+        self.assertEqual(self.sink.events, [])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from labeling import broadcast_labels, customer_scores, label_scores, sweep_thresholds
+
+class TestLabeling(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Create a sample RFMS-scored dataframe: one score per customer, repeated on every transaction
+        rng = np.random.default_rng(0)
+        n_customers, n = 80, 1500
+        customer_score = rng.lognormal(0, 2, n_customers) - 1.0
+        customer_score[3] = np.nan
+        codes = rng.integers(0, n_customers, n)
+        cls.df = pd.DataFrame({
+            'CustomerId': [f'CustomerId_{i}' for i in codes],
+            'Score': customer_score[codes]
+        })
+
+    def test_labels_match_scalar_rule(self):
+        for threshold in [-0.5, 0.0, 0.5, 3.0]:
+            expected = self.df['Score'].apply(lambda x: 'Good' if x >= threshold else 'Bad')
+            grouping, scores, _ = customer_scores(self.df)
+            self.assertEqual(list(broadcast_labels(grouping, scores, threshold)), list(expected))
+            self.assertEqual(list(label_scores(self.df['Score'], threshold)), list(expected))
+
+    def test_missing_values_are_bad(self):
+        df = pd.DataFrame({'CustomerId': ['a', None, 'a'], 'Score': [2.0, np.nan, 2.0]})
+        grouping, scores, weights = customer_scores(df)
+        self.assertEqual(list(broadcast_labels(grouping, scores, 1.5)), ['Good', 'Bad', 'Good'])
+        self.assertEqual(list(weights), [2.0])
+        self.assertEqual(list(label_scores([np.nan, 0.5], 0.5)), ['Bad', 'Good'])
+
+    def test_sweep_matches_relabelling(self):
+        grouping, scores, weights = customer_scores(self.df)
+        thresholds = [-1.0, 0.0, 0.5, 2.0, 100.0]
+        sweep = sweep_thresholds(scores, weights, thresholds=thresholds)
+        for row, threshold in zip(sweep.itertuples(), thresholds):
+            labels = broadcast_labels(grouping, scores, threshold)
+            self.assertEqual(row.good_transactions, (labels == 'Good').sum())
+            self.assertEqual(row.good_customers, (label_scores(scores, threshold) == 'Good').sum())
+            self.assertEqual(row.good_customers + row.bad_customers, len(scores))
+            self.assertAlmostEqual(row.good_transaction_rate, (labels == 'Good').mean())
+
+    def test_default_thresholds(self):
+        _, scores, weights = customer_scores(self.df)
+        sweep = sweep_thresholds(scores, weights, n_thresholds=50)
+        self.assertLessEqual(len(sweep), 50)
+        self.assertTrue(sweep['threshold'].is_monotonic_increasing)
+        self.assertTrue(sweep['good_customers'].is_monotonic_decreasing)
+        self.assertTrue((sweep['minority_rate'] <= 0.5).all())
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
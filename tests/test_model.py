@@ -43,6 +43,13 @@ class TestModelTraining(unittest.TestCase):
         self.assertIsInstance(self.model_training.log_reg, LogisticRegression)
         self.assertEqual(len(self.model_training.y_pred_log_reg), self.model_training.X_test.shape[0])
 
+    def test_woe_binning(self):
+        self.model_training.split_data()
+        iv = self.model_training.woe_binning(n_jobs=1, apply=True)
+        self.assertEqual(sorted(iv.index), sorted(self.model_training.X_train.columns))
+        self.assertTrue(self.model_training.X_train['Amount'].isin(self.model_training.woe.woe_['Amount']).all())
+        self.assertTrue(self.model_training.woe_applied)
+
     def test_train_random_forest(self):
         self.model_training.split_data()
         self.model_training.train_random_forest()
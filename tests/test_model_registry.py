@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from data_preprocessing import Preprocessor
+from model_registry import ModelRegistry
+from model import ModelTraining
+from woe_binning import WoEBinning
+
+class TestModelRegistry(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Train two small forests on a sample dataset
+        rng = np.random.default_rng(0)
+        cls.X = pd.DataFrame(rng.normal(size=(300, 3)), columns=['a', 'b', 'c'])
+        cls.y = np.where(cls.X['a'] > 0, 'Good', 'Bad')
+        cls.models = [RandomForestClassifier(n_estimators=n, random_state=0).fit(cls.X, cls.y) for n in (5, 10)]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.registry = ModelRegistry(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_register_versions(self):
+        self.assertEqual(self.registry.register(self.models[0], metadata={'note': 'first'}), 'v0001')
+        self.assertEqual(self.registry.register(self.models[1]), 'v0002')
+        self.assertEqual(self.registry.versions('random_forest'), ['v0001', 'v0002'])
+        self.assertEqual(self.registry.current_version('random_forest'), 'v0002')
+
+        metadata = self.registry.metadata('random_forest', 'v0001')
+        self.assertEqual(metadata['note'], 'first')
+        self.assertEqual(metadata['classes'], ['Bad', 'Good'])
+        self.assertEqual(metadata['feature_names'], ['a', 'b', 'c'])
+        self.assertFalse([name for name in os.listdir(self.registry.model_dir('random_forest')) if name.startswith('.staging')])
+
+    def test_load_and_promote(self):
+        self.registry.register(self.models[0])
+        self.registry.register(self.models[1], promote=False)
+        model, metadata = self.registry.load('random_forest')
+        self.assertEqual(metadata['version'], 'v0001')
+        self.assertEqual(len(model.estimators_), 5)
+
+        self.registry.promote('random_forest', 'v0002')
+        model, metadata = self.registry.load('random_forest', mmap_mode='r')
+        self.assertEqual(metadata['version'], 'v0002')
+        np.testing.assert_array_equal(model.predict_proba(self.X), self.models[1].predict_proba(self.X))
+
+        with self.assertRaises(KeyError):
+            self.registry.promote('random_forest', 'v0009')
+        with self.assertRaises(KeyError):
+            self.registry.current_version('unknown')
+
+    def test_unknown_versions_are_rejected(self):
+        self.registry.register(self.models[0])
+        for version in ['v0009', '../../model', 'v0001/../v0001', 'current.json']:
+            with self.assertRaises(KeyError):
+                self.registry.load('random_forest', version)
+            with self.assertRaises(KeyError):
+                self.registry.load_preprocessor('random_forest', version)
+        with self.assertRaises(KeyError):
+            self.registry.version_dir('random_forest', '../elsewhere')
+
+    def test_compiled_backend(self):
+        self.registry.register(self.models[1], compiled=True)
+        model, _ = self.registry.load('random_forest', backend='compiled', mmap_mode='r')
+        self.assertIsInstance(model.threshold, np.memmap)
+        np.testing.assert_array_equal(model.predict_proba(self.X.to_numpy()), self.models[1].predict_proba(self.X))
+
+    def test_save_model_registers(self):
+        model_training = ModelTraining('../src/Data/rfms.csv')
+        model_training.X_train = self.X
+        model_training.save_model(self.models[0], None, registry_dir=self.tmp_dir.name)
+        metadata = self.registry.metadata('random_forest')
+        self.assertEqual(metadata['training_rows'], 300)
+        self.assertEqual(metadata['feature_columns'], ['a', 'b', 'c'])
+
+    def test_preprocessor_travels_with_version(self):
+        preprocessor = Preprocessor().fit_numerical(self.X, ['a', 'b'])
+        self.registry.register(self.models[0])
+        self.registry.register(self.models[1], preprocessor=preprocessor)
+        self.assertIsNone(self.registry.load_preprocessor('random_forest', 'v0001'))
+        loaded = self.registry.load_preprocessor('random_forest')
+        np.testing.assert_array_equal(loaded.scale, preprocessor.scale)
+        self.assertTrue(self.registry.metadata('random_forest')['preprocessor'])
+
+    def test_woe_binning_travels_with_version(self):
+        woe = WoEBinning(n_jobs=1).fit(self.X, self.y)
+        self.registry.register(self.models[0])
+        self.registry.register(self.models[1], woe_binning=woe)
+        self.assertIsNone(self.registry.load_woe_binning('random_forest', 'v0001'))
+        loaded = self.registry.load_woe_binning('random_forest')
+        np.testing.assert_array_equal(loaded.transform_matrix(self.X.to_numpy(), ['a', 'b', 'c']), woe.transform(self.X).to_numpy())
+        self.assertTrue(self.registry.metadata('random_forest')['woe_binning'])
+        self.assertFalse(self.registry.metadata('random_forest', 'v0001')['woe_binning'])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
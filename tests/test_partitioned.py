@@ -0,0 +1,72 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from instrumentation import error_count, errors_since
+from partitioned import partition_ids
+from synthetic_data import generate_transactions
+from Feature_Eng import FeatureEngineering
+from RFMS import RFMS
+
+class TestPartitioned(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = generate_transactions(20000, seed=4)
+        cls.df.loc[11, 'CustomerId'] = np.nan
+
+    def test_partition_ids(self):
+        ids = partition_ids(self.df['CustomerId'], 5)
+        self.assertTrue(((ids >= 0) & (ids < 5)).all())
+
+        # Depends only on the ID: every row of a customer lands in one partition, whatever the dtype
+        self.assertTrue((pd.Series(ids).groupby(self.df['CustomerId'].to_numpy()).nunique() == 1).all())
+        np.testing.assert_array_equal(partition_ids(self.df['CustomerId'].astype(object), 5), ids)
+
+    def test_feature_engineering_matches_serial(self):
+        steps = ['create_aggregate_features', ('extract_time_features', {'since_previous': True}), ('create_window_features', {'windows': ['7D']})]
+        serial = FeatureEngineering(None, df=self.df.copy())
+        serial.create_aggregate_features()
+        serial.extract_time_features(since_previous=True)
+        serial.create_window_features(windows=['7D'])
+
+        # Same frame in the same row order, whatever the number of workers and partitions
+        for n_workers, n_partitions in [(2, None), (2, 7)]:
+            partitioned = FeatureEngineering(None, df=self.df.copy())
+            partitioned.run_partitioned(steps, n_workers=n_workers, n_partitions=n_partitions)
+            pd.testing.assert_frame_equal(partitioned.df, serial.df)
+
+    def test_unsupported_step(self):
+        feature_eng = FeatureEngineering(None, df=self.df.copy())
+        feature_eng.run_partitioned(['create_aggregate_features', 'scale_numerical_features'], n_workers=2)
+        pd.testing.assert_frame_equal(feature_eng.df, self.df)
+
+    def test_failed_step_fails_the_run(self):
+        # Without Amount every worker's create_aggregate_features logs an error; the run must not report success
+        df = self.df.drop(columns='Amount')
+        feature_eng = FeatureEngineering(None, df=df.copy())
+        n_errors = error_count()
+        feature_eng.run_partitioned(['create_aggregate_features'], n_workers=2)
+        self.assertEqual(error_count(), n_errors + 1)
+        self.assertIn("Step 'create_aggregate_features' failed", errors_since(n_errors)[0])
+        pd.testing.assert_frame_equal(feature_eng.df, df)
+
+    def test_rfms_matches_serial(self):
+        serial = RFMS(None, df=self.df.copy())
+        serial.calculate_rfms_features()
+        serial.assign_labels(threshold=0.5)
+        partitioned = RFMS(None, df=self.df.copy())
+        partitioned.calculate_rfms_features(n_workers=2, n_partitions=3)
+        partitioned.assign_labels(threshold=0.5)
+
+        # Recency is measured from the overall latest transaction in every partition
+        pd.testing.assert_frame_equal(partitioned.df, serial.df)
+        pd.testing.assert_frame_equal(partitioned.customer_rfms, serial.customer_rfms)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
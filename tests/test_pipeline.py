@@ -0,0 +1,238 @@
+import importlib
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from pipeline import Pipeline, Stage, module_files
+from instrumentation import MemorySink, add_sink, instrument_class, remove_sink, report_error
+from credit_pipeline import build_credit_pipeline
+
+def double_stage(source_path, doubled_path, factor=2):
+    with open(source_path) as f:
+        value = int(f.read())
+    with open(doubled_path, 'w') as f:
+        f.write(str(value * factor))
+
+def increment_stage(doubled_path, result_path):
+    with open(doubled_path) as f:
+        value = int(f.read())
+    with open(result_path, 'w') as f:
+        f.write(str(value + 1))
+
+def forgetful_stage(source_path, result_path):
+    pass
+
+def swallowing_stage(source_path, result_path):
+    # Writes a partial output and logs its error the way the scripts/ classes do
+    with open(result_path, 'w') as f:
+        f.write('partial')
+    report_error("Error in stage", ValueError("bad input"))
+
+def allocating_stage(source_path, result_path, megabytes):
+    block = bytearray(megabytes * 1_000_000)
+    time.sleep(0.2)
+    with open(result_path, 'w') as f:
+        f.write(str(len(block)))
+
+@instrument_class
+class Allocator:
+    def allocate(self, megabytes):
+        block = np.ones(megabytes * 125_000)
+        return len(block)
+
+def instrumented_stage(source_path, result_path):
+    # A large instrumented call followed by a small one, which resets the RSS high-water mark when it starts
+    sink = add_sink(MemorySink())
+    try:
+        allocator = Allocator()
+        allocator.allocate(60)
+        allocator.allocate(1)
+    finally:
+        remove_sink(sink)
+    with open(result_path, 'w') as f:
+        f.write('done')
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp_dir.name, 'source.txt')
+        with open(self.source, 'w') as f:
+            f.write('5')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def make_pipeline(self, factor=2):
+        stages = [
+            Stage('increment', increment_stage, inputs={'doubled_path': self.path('doubled.txt')}, outputs={'result_path': self.path('result.txt')}),
+            Stage('double', double_stage, inputs={'source_path': self.source}, outputs={'doubled_path': self.path('doubled.txt')}, params={'factor': factor})
+        ]
+        return Pipeline(stages, cache_dir=self.path('cache'), executor='thread')
+
+    def read_result(self):
+        with open(self.path('result.txt')) as f:
+            return int(f.read())
+
+    def test_runs_stages_in_dependency_order(self):
+        pipeline = self.make_pipeline()
+        self.assertEqual(pipeline.dependencies, {'increment': ['double'], 'double': []})
+        report = pipeline.run()
+        self.assertEqual(self.read_result(), 11)
+        self.assertEqual(report['stage'].tolist(), ['double', 'increment'])
+        self.assertTrue((report['status'] == 'ran').all())
+        self.assertTrue((report['wall_seconds'] >= 0).all())
+        self.assertIn('peak_memory_mb', report.columns)
+
+    def test_second_run_is_cached(self):
+        self.make_pipeline().run()
+        report = self.make_pipeline().run()
+        self.assertTrue((report['status'] == 'cached').all())
+        self.assertEqual(self.make_pipeline().run(force=True)['status'].tolist(), ['ran', 'ran'])
+
+    def test_input_and_param_changes_invalidate(self):
+        self.make_pipeline().run()
+        with open(self.source, 'w') as f:
+            f.write('7')
+        report = self.make_pipeline().run()
+        self.assertTrue((report['status'] == 'ran').all())
+        self.assertEqual(self.read_result(), 15)
+
+        # A parameter change reruns that stage and everything downstream of it
+        report = self.make_pipeline(factor=3).run()
+        self.assertTrue((report['status'] == 'ran').all())
+        self.assertEqual(self.read_result(), 22)
+
+    def test_modified_output_is_rebuilt(self):
+        self.make_pipeline().run()
+        with open(self.path('result.txt'), 'w') as f:
+            f.write('0')
+        report = self.make_pipeline().run().set_index('stage')['status']
+        self.assertEqual(report['double'], 'cached')
+        self.assertEqual(report['increment'], 'ran')
+        self.assertEqual(self.read_result(), 11)
+
+    def test_cycle_is_rejected(self):
+        stages = [
+            Stage('a', increment_stage, inputs={'doubled_path': self.path('b.txt')}, outputs={'result_path': self.path('a.txt')}),
+            Stage('b', increment_stage, inputs={'doubled_path': self.path('a.txt')}, outputs={'result_path': self.path('b.txt')})
+        ]
+        with self.assertRaises(ValueError):
+            Pipeline(stages, cache_dir=self.path('cache'), executor='thread')
+
+    def test_missing_output_raises(self):
+        stage = Stage('forgetful', forgetful_stage, inputs={'source_path': self.source}, outputs={'result_path': self.path('never.txt')})
+        with self.assertRaises(RuntimeError):
+            Pipeline([stage], cache_dir=self.path('cache'), executor='thread').run()
+
+    def test_logged_error_fails_the_stage(self):
+        stage = Stage('swallowing', swallowing_stage, inputs={'source_path': self.source}, outputs={'result_path': self.path('partial.txt')})
+        with self.assertRaises(RuntimeError):
+            Pipeline([stage], cache_dir=self.path('cache'), executor='thread').run()
+        self.assertFalse(os.path.exists(os.path.join(self.path('cache'), 'swallowing.json')))
+
+    def test_called_module_changes_invalidate(self):
+        # A stage module calling a helper module next to it, as credit_pipeline calls Feature_Eng and RFMS
+        module_dir = self.path('stage_modules')
+        os.makedirs(module_dir)
+        with open(os.path.join(module_dir, 'helper_module.py'), 'w') as f:
+            f.write('def scale(value):\n    return value * 2\n')
+        with open(os.path.join(module_dir, 'stage_module.py'), 'w') as f:
+            f.write('from helper_module import scale\n\ndef scale_stage(source_path):\n    return scale(1)\n')
+        sys.path.insert(0, module_dir)
+        try:
+            stage = Stage('scale', importlib.import_module('stage_module').scale_stage)
+            self.assertEqual([os.path.basename(path) for path in module_files(stage.func)], ['helper_module.py', 'stage_module.py'])
+            before = stage.source_hash()
+            with open(os.path.join(module_dir, 'helper_module.py'), 'w') as f:
+                f.write('def scale(value):\n    return value * 3\n')
+            self.assertNotEqual(stage.source_hash(), before)
+        finally:
+            sys.path.remove(module_dir)
+            for name in ['stage_module', 'helper_module']:
+                sys.modules.pop(name, None)
+
+    def test_thread_stages_measure_their_own_peaks(self):
+        stages = [
+            Stage('large', allocating_stage, inputs={'source_path': self.source}, outputs={'result_path': self.path('large.txt')}, params={'megabytes': 40}),
+            Stage('small', allocating_stage, inputs={'source_path': self.source}, outputs={'result_path': self.path('small.txt')}, params={'megabytes': 4})
+        ]
+        report = Pipeline(stages, cache_dir=self.path('cache'), executor='thread', measure_memory=True).run().set_index('stage')
+        self.assertGreater(report.loc['large', 'peak_memory_mb'], 40)
+        self.assertLess(report.loc['small', 'peak_memory_mb'], 20)
+
+        report = Pipeline(stages, cache_dir=self.path('cache'), executor='thread', measure_memory=False).run(force=True)
+        self.assertTrue(report['peak_memory_mb'].isna().all())
+
+    def test_independent_thread_stages_overlap(self):
+        # Unmeasured by default, so two 0.2s branches finish together rather than one after the other
+        stages = [
+            Stage(name, allocating_stage, inputs={'source_path': self.source}, outputs={'result_path': self.path(f'{name}.txt')}, params={'megabytes': 1})
+            for name in ['left', 'right']
+        ]
+        start = time.perf_counter()
+        report = Pipeline(stages, cache_dir=self.path('cache'), executor='thread').run()
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertTrue(report['peak_memory_mb'].isna().all())
+
+    def test_process_stages_measure_peak_rss(self):
+        stages = [Stage('large', allocating_stage, inputs={'source_path': self.source}, outputs={'result_path': self.path('large.txt')}, params={'megabytes': 60})]
+        report = Pipeline(stages, cache_dir=self.path('cache')).run().set_index('stage')
+        self.assertGreater(report.loc['large', 'peak_memory_increase_mb'], 40)
+        self.assertGreaterEqual(report.loc['large', 'peak_memory_mb'], report.loc['large', 'peak_memory_increase_mb'])
+
+        # Peaks of instrumented calls inside the stage are passed up past their resets of the high-water mark
+        stages = [Stage('instrumented', instrumented_stage, inputs={'source_path': self.source}, outputs={'result_path': self.path('instrumented.txt')})]
+        report = Pipeline(stages, cache_dir=self.path('cache')).run().set_index('stage')
+        self.assertGreater(report.loc['instrumented', 'peak_memory_increase_mb'], 40)
+
+class TestCreditPipeline(unittest.TestCase):
+
+    def test_end_to_end(self):
+        # Create a small transaction file for testing
+        rng = np.random.default_rng(0)
+        n = 400
+        times = pd.Timestamp('2018-11-15', tz='UTC') + pd.to_timedelta(np.sort(rng.integers(0, 60 * 86400, n)), unit='s')
+        data = pd.DataFrame({
+            'TransactionId': [f'TransactionId_{i}' for i in range(n)],
+            'CustomerId': [f'CustomerId_{i}' for i in rng.integers(0, 40, n)],
+            'CurrencyCode': 'UGX',
+            'CountryCode': 256,
+            'ProviderId': [f'ProviderId_{i}' for i in rng.integers(1, 4, n)],
+            'ProductId': [f'ProductId_{i}' for i in rng.integers(1, 6, n)],
+            'ProductCategory': rng.choice(['airtime', 'financial_services'], n),
+            'ChannelId': [f'ChannelId_{i}' for i in rng.integers(1, 4, n)],
+            'Amount': rng.integers(-1000, 5000, n).astype(float),
+            'Value': rng.integers(0, 5000, n),
+            'TransactionStartTime': times.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'PricingStrategy': rng.integers(0, 3, n),
+            'FraudResult': rng.integers(0, 2, n)
+        })
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            raw_path = os.path.join(work_dir, 'data.csv')
+            data.to_csv(raw_path, index=False)
+            pipeline = build_credit_pipeline(raw_path, work_dir, executor='thread')
+            self.assertEqual(pipeline.dependencies['feature_engineering'], ['aggregate_features', 'time_features'])
+
+            report = pipeline.run()
+            self.assertEqual(len(report), 5)
+            self.assertTrue((report['status'] == 'ran').all())
+            self.assertTrue(os.path.exists(os.path.join(work_dir, 'random_forest_model.pkl')))
+
+            report = build_credit_pipeline(raw_path, work_dir, threshold=0.4, executor='thread').run().set_index('stage')['status']
+            self.assertEqual(report['feature_engineering'], 'cached')
+            self.assertEqual(report['rfms'], 'ran')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from plot_report import box_stats, build_report, count_table, density_grid, eda_sections, histogram_table, rfms_sections
+from synthetic_data import generate_transactions
+from EDA import EDA
+
+class TestPlotReport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = generate_transactions(5000, seed=3)
+
+    def test_histogram_table_skips_missing(self):
+        counts, edges = histogram_table(np.array([1.0, 2.0, np.nan, 3.0, 3.0]), bins=2)
+        self.assertEqual(counts.sum(), 4)
+        self.assertEqual(len(edges), 3)
+
+    def test_count_table(self):
+        labels, counts = count_table(pd.Series(['b', 'a', 'b', None]))
+        self.assertEqual(labels, ['a', 'b'])
+        np.testing.assert_array_equal(counts, [1, 2])
+
+    def test_box_stats_counts_outliers(self):
+        values = np.append(np.arange(100, dtype=float), 1000.0)
+        stats, outliers = box_stats(values, 'x')
+        self.assertEqual(outliers, 1)
+        self.assertEqual(stats['whishi'], 99.0)
+        self.assertEqual(stats['med'], 50.0)
+
+    def test_density_grid_means(self):
+        x = np.array([0.0, 0.0, 1.0, 1.0])
+        y = np.array([0.0, 0.0, 1.0, np.nan])
+        counts, means, _, _ = density_grid(x, y, bins=2, values=np.array([1.0, 3.0, 5.0, 7.0]))
+        self.assertEqual(counts.sum(), 3)
+        self.assertEqual(means[0, 0], 2.0)
+        self.assertEqual(means[1, 1], 5.0)
+        self.assertTrue(np.isnan(means[0, 1]))
+
+    def test_build_report_embeds_every_figure(self):
+        sections = eda_sections(self.df)
+        n_figures = sum(len(section.get('figures', [])) for section in sections)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = build_report(sections, tmp, 'EDA', n_jobs=2)
+            with open(path) as f:
+                report = f.read()
+            self.assertEqual(report.count('data:image/png;base64'), n_figures)
+            self.assertEqual(len(os.listdir(os.path.join(tmp, 'figures'))), n_figures)
+
+    def test_rfms_sections(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'Recency': rng.integers(0, 90, 1000), 'Frequency': rng.integers(1, 50, 1000),
+                           'Monetary': rng.normal(size=1000), 'Score': rng.random(1000)})
+        df['Label'] = np.where(df['Score'] > 0.5, 'Good', 'Bad')
+        sections = rfms_sections(df, bins=10, grid=20)
+        self.assertEqual([section['title'] for section in sections], ['RFMS Distributions', 'RFMS Space', 'Labels'])
+        self.assertEqual(sections[1]['figures'][0]['counts'].sum(), 1000)
+
+    def test_eda_report_in_profile_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path = os.path.join(tmp, 'transactions.csv')
+            self.df.to_csv(data_path, index=False)
+            path = EDA(data_path=data_path, chunksize=1000).generate_report(os.path.join(tmp, 'report'), n_jobs=1)
+            self.assertTrue(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,96 @@
+import os
+import subprocess
+import tempfile
+import time
+import unittest
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+import sys
+
+# Add the paths to the apps and scripts directories
+sys.path.append(os.path.abspath('../apps'))
+sys.path.append(os.path.abspath('../scripts'))
+
+from serve import available_cpus, export_if_stale, prepare_model, serving_environment, worker_count
+from compiled_forest import CompiledForest
+from model_registry import ModelRegistry
+from process_memory import child_pids, process_memory
+
+class TestServe(unittest.TestCase):
+
+    def test_worker_count(self):
+        self.assertGreaterEqual(available_cpus(), 1)
+        self.assertLessEqual(available_cpus(), os.cpu_count())
+        self.assertEqual(worker_count(3), 3)
+        self.assertEqual(worker_count(), available_cpus())
+
+    def test_serving_environment(self):
+        env = serving_environment('compiled', mmap=True, compiled_dir='model_compiled')
+        self.assertEqual(env['MODEL_MMAP_MODE'], 'r')
+        self.assertEqual(env['MODEL_PRELOAD'], '1')
+        self.assertEqual(env['OMP_NUM_THREADS'], '1')
+        self.assertTrue(os.path.isabs(env['COMPILED_MODEL_DIR']))
+
+        env = serving_environment('sklearn', mmap=False, registry_dir='registry')
+        self.assertEqual(env['MODEL_MMAP_MODE'], '')
+        self.assertIn('MODEL_REFRESH_SECONDS', env)
+        self.assertNotIn('COMPILED_MODEL_DIR', env)
+
+    def test_export_once(self):
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 3))
+        forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, X[:, 0] > 0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = os.path.join(tmp_dir, 'model.pkl')
+            compiled_dir = os.path.join(tmp_dir, 'model_compiled')
+            joblib.dump(forest, model_path)
+
+            export_if_stale(model_path, compiled_dir)
+            exported_at = os.path.getmtime(os.path.join(compiled_dir, 'metadata.json'))
+            export_if_stale(model_path, compiled_dir)
+            self.assertEqual(os.path.getmtime(os.path.join(compiled_dir, 'metadata.json')), exported_at)
+
+            compiled = CompiledForest.load(compiled_dir, mmap_mode='r')
+            np.testing.assert_array_equal(compiled.predict_proba(X), forest.predict_proba(X))
+
+    def test_registry_versions_are_not_modified(self):
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 3))
+        forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, X[:, 0] > 0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            registry = ModelRegistry(tmp_dir)
+            registry.register(forest, metadata={'training_rows': 200})
+            original = sorted(os.listdir(registry.version_dir('random_forest', 'v0001')))
+
+            # The uncompiled current version is registered again as a compiled one and promoted
+            compiled_dir = prepare_model(None, None, registry_dir=tmp_dir)
+            self.assertEqual(sorted(os.listdir(registry.version_dir('random_forest', 'v0001'))), original)
+            self.assertEqual(registry.current_version('random_forest'), 'v0002')
+            metadata = registry.metadata('random_forest', 'v0002')
+            self.assertTrue(metadata['compiled'])
+            self.assertEqual((metadata['compiled_from'], metadata['training_rows']), ('v0001', 200))
+            np.testing.assert_array_equal(CompiledForest.load(compiled_dir).predict_proba(X), forest.predict_proba(X))
+
+            # A compiled current version is served as it is
+            self.assertEqual(prepare_model(None, None, registry_dir=tmp_dir), compiled_dir)
+            self.assertEqual(registry.versions('random_forest'), ['v0001', 'v0002'])
+
+    @unittest.skipUnless(os.path.exists('/proc/self/status'), 'needs /proc')
+    def test_process_memory(self):
+        memory = process_memory()
+        self.assertGreater(memory['rss_mb'], 0)
+        self.assertGreaterEqual(memory['rss_mb'], memory['anon_mb'])
+
+        child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+        try:
+            deadline = time.monotonic() + 10
+            while child.pid not in child_pids(os.getpid()) and time.monotonic() < deadline:
+                time.sleep(0.1)
+            self.assertIn(child.pid, child_pids(os.getpid()))
+        finally:
+            child.kill()
+            child.wait()
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
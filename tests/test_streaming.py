@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from Feature_Eng import FeatureEngineering
+from RFMS import RFMS
+from model import ModelTraining
+from artifacts import save_artifact
+from streaming import stream_customer_aggregates
+from streaming_stats import profile_file
+
+class TestStreaming(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Write a sample transaction file for testing
+        rng = np.random.default_rng(3)
+        n = 1000
+        times = pd.Timestamp('2018-11-15', tz='UTC') + pd.to_timedelta(np.sort(rng.integers(0, 90 * 86400, n)), unit='s')
+        cls.df = pd.DataFrame({
+            'TransactionId': [f'TransactionId_{i}' for i in range(n)],
+            'CustomerId': [f'CustomerId_{i}' for i in rng.integers(0, 80, n)],
+            'ProviderId': rng.choice(['ProviderId_1', 'ProviderId_4', 'ProviderId_6'], n),
+            'Amount': np.round(rng.normal(1000, 800, n), 2),
+            'Value': np.round(np.abs(rng.normal(1000, 800, n))),
+            'TransactionStartTime': times.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'FraudResult': rng.integers(0, 2, n)
+        })
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.data_path = os.path.join(cls.tmp_dir.name, 'data.csv')
+        cls.df.to_csv(cls.data_path, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_chunk_size_does_not_change_aggregates(self):
+        small = stream_customer_aggregates(self.data_path, chunksize=37).aggregate_frame()
+        large = stream_customer_aggregates(self.data_path, chunksize=10000).aggregate_frame()
+        pd.testing.assert_frame_equal(small, large, check_exact=True)
+
+    def test_columnar_artifacts_stream_like_csv(self):
+        expected = stream_customer_aggregates(self.data_path, chunksize=100).aggregate_frame()
+        for extension in ['parquet', 'feather']:
+            path = save_artifact(self.df, os.path.join(self.tmp_dir.name, f'data.{extension}'))
+            aggregates = stream_customer_aggregates(path, chunksize=100).aggregate_frame()
+            aggregates['CustomerId'] = aggregates['CustomerId'].astype(str)
+            pd.testing.assert_frame_equal(aggregates, expected, check_exact=True)
+            self.assertEqual(profile_file(path, chunksize=100).rows, len(self.df))
+
+    def test_feature_engineering_streaming_mode(self):
+        feature_eng = FeatureEngineering(self.data_path, chunksize=100)
+        df = feature_eng.create_aggregate_features()
+        self.assertEqual(len(df), self.df['CustomerId'].nunique())
+        expected = self.df.groupby('CustomerId')['Amount'].sum()
+        np.testing.assert_allclose(df.set_index('CustomerId')['total_transaction_amount'], expected.loc[df['CustomerId']])
+
+    def test_rfms_streaming_mode(self):
+        rfms = RFMS(self.data_path, chunksize=100)
+        df = rfms.calculate_rfms_features()
+        self.assertEqual(len(df), self.df['CustomerId'].nunique())
+        for col in ['Recency', 'Frequency', 'Monetary', 'Score']:
+            self.assertIn(col, df.columns)
+        df = rfms.assign_labels(threshold=0.5)
+        self.assertTrue(df['Label'].isin(['Good', 'Bad']).all())
+
+    def test_model_training_streaming_mode(self):
+        featured = self.df.assign(
+            total_transaction_amount=1.0,
+            average_transaction_amount=1.0,
+            transaction_count=2,
+            std_transaction_amount=0.5,
+            Label=np.where(self.df['Amount'] > 1000, 'Good', 'Bad')
+        )
+        path = os.path.join(self.tmp_dir.name, 'rfms.csv')
+        featured.to_csv(path, index=False)
+        model_training = ModelTraining(path, chunksize=128)
+        self.assertEqual(len(model_training.df), len(featured))
+        self.assertNotIn('CustomerId', model_training.df.columns)
+        model_training.split_data()
+        self.assertEqual(model_training.X_train.shape, (800, 6))
+
+if __name__ == '__main__':
+    unittest.main()
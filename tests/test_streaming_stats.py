@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from streaming_stats import HyperLogLog, KLLSketch, StreamingCovariance, StreamingMoments, profile_chunks, profile_file, profile_frame
+from synthetic_data import generate_transactions, write_transactions
+from EDA import EDA
+
+class TestStreamingStats(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.values = np.column_stack([rng.lognormal(7, 1.5, 20000), rng.normal(1e6, 1, 20000), rng.integers(0, 5, 20000).astype(float)])
+        cls.values[rng.random(20000) < 0.05, 0] = np.nan
+        cls.frame = pd.DataFrame(cls.values, columns=['amount', 'shifted', 'code'])
+
+    def test_moments_match_pandas(self):
+        moments = StreamingMoments(3)
+        for part in np.array_split(self.values, 7):
+            moments.update(part)
+        np.testing.assert_allclose(moments.count, self.frame.count())
+        np.testing.assert_allclose(moments.mean, self.frame.mean())
+        np.testing.assert_allclose(np.sqrt(moments.variance()), self.frame.std())
+        np.testing.assert_allclose(moments.skew(), self.frame.skew(), rtol=1e-6)
+        np.testing.assert_allclose(moments.kurtosis(), self.frame.kurt(), rtol=1e-6)
+
+    def test_covariance_merges(self):
+        # Partials with different shifts merge to the pairwise-complete pandas result
+        first, second = StreamingCovariance(3), StreamingCovariance(3)
+        first.update(self.values[:5000])
+        second.update(self.values[5000:])
+        np.testing.assert_allclose(first.merge(second).correlation(), self.frame.corr(), atol=1e-9)
+
+    def test_kll_quantiles(self):
+        values = self.values[:, 0][~np.isnan(self.values[:, 0])]
+        sketches = [KLLSketch(k=200, seed=i).update(part) for i, part in enumerate(np.array_split(values, 4))]
+        sketch = sketches[0]
+        for other in sketches[1:]:
+            sketch.merge(other)
+        self.assertEqual(sketch.count, len(values))
+        self.assertLess(sum(len(level) for level in sketch.levels), 2000)
+
+        # Rank error within a few percent of the count
+        estimates = sketch.quantile([0.1, 0.5, 0.9])
+        ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+        np.testing.assert_allclose(ranks, [0.1, 0.5, 0.9], atol=0.03)
+        self.assertEqual(sketch.quantile([0, 1]).tolist(), [values.min(), values.max()])
+
+    def test_hyperloglog(self):
+        ids = pd.Series([f'CustomerId_{i}' for i in range(50000)])
+        left, right = HyperLogLog().update(ids[:30000]), HyperLogLog().update(ids[20000:])
+        self.assertAlmostEqual(left.merge(right).estimate(), 50000, delta=50000 * 0.03)
+        self.assertAlmostEqual(HyperLogLog().update(ids[:10]).estimate(), 10, delta=0.5)
+
+    def test_profile(self):
+        df = generate_transactions(20000, seed=5)
+        profile = profile_chunks(np.array_split(df, 5))
+        summary = profile.numerical_summary()
+        expected = df[profile.numeric].describe()
+        np.testing.assert_allclose(summary.loc[['count', 'mean', 'std', 'min', 'max']], expected.loc[['count', 'mean', 'std', 'min', 'max']])
+
+        # Low-cardinality columns are counted exactly, so their quantiles and outliers are exact
+        np.testing.assert_allclose(profile.quantiles('PricingStrategy', [0.25, 0.5, 0.75]), df['PricingStrategy'].quantile([0.25, 0.5, 0.75]))
+        q1, q3 = df['FraudResult'].quantile([0.25, 0.75])
+        self.assertEqual(profile.outliers('FraudResult')['count'], int((df['FraudResult'] > q3 + 1.5 * (q3 - q1)).sum()))
+
+        distinct = profile.distinct_counts()
+        self.assertEqual(distinct['ProviderId'], df['ProviderId'].nunique())
+        self.assertAlmostEqual(distinct['TransactionId'], 20000, delta=20000 * 0.03)
+        self.assertEqual(profile.categorical_summary().loc['top', 'ChannelId'], df['ChannelId'].value_counts().idxmax())
+
+    def test_parallel_file_profile(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ['transactions.parquet', 'transactions.csv']:
+                path = write_transactions(os.path.join(tmp_dir, name), 6000, chunksize=2000, seed=6)
+                serial = profile_file(path, chunksize=1500)
+                parallel = profile_file(path, chunksize=1500, n_jobs=2)
+                self.assertEqual(parallel.rows, 6000)
+                np.testing.assert_allclose(parallel.moments.mean, serial.moments.mean)
+                np.testing.assert_allclose(parallel.correlation(), serial.correlation(), atol=1e-9)
+                self.assertEqual(parallel.distinct_counts(), serial.distinct_counts())
+
+    def test_eda_profile_mode(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = write_transactions(os.path.join(tmp_dir, 'transactions.parquet'), 5000, chunksize=1000, seed=7)
+            df = pd.read_parquet(path)
+            eda = EDA(data_path=path, chunksize=1000, n_jobs=2)
+        self.assertIsNone(eda.df)
+        shape, _, _ = eda.overview_of_data()
+        self.assertEqual(shape, df.shape)
+        numerical_summary, _ = eda.summary_statistics()
+        self.assertAlmostEqual(numerical_summary.loc['mean', 'Amount'], df['Amount'].mean())
+        self.assertEqual(eda.count_unique_values()['ChannelId'], df['ChannelId'].nunique())
+        self.assertEqual(len(eda.find_unique_values(['ProductCategory'])['ProductCategory']), df['ProductCategory'].nunique())
+        correlation = eda.correlation_analysis()
+        self.assertAlmostEqual(correlation.loc['Amount', 'Value'], df['Amount'].corr(df['Value']))
+        self.assertEqual(set(eda.detect_outliers_with_visualization()), set(numerical_summary.columns))
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
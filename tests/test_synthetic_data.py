@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from artifacts import load_artifact
+from synthetic_data import generate_transactions, iter_transaction_chunks, write_transactions
+
+TRANSACTION_COLUMNS = ['TransactionId', 'BatchId', 'AccountId', 'SubscriptionId', 'CustomerId', 'CurrencyCode', 'CountryCode',
+                       'ProviderId', 'ProductId', 'ProductCategory', 'ChannelId', 'Amount', 'Value', 'TransactionStartTime',
+                       'PricingStrategy', 'FraudResult']
+
+class TestSyntheticData(unittest.TestCase):
+
+    def test_schema(self):
+        df = generate_transactions(5000, seed=1)
+        self.assertEqual(list(df.columns), TRANSACTION_COLUMNS)
+        self.assertEqual(len(df), 5000)
+        self.assertTrue(df['TransactionId'].is_unique)
+        self.assertTrue(df['CustomerId'].astype(str).str.startswith('CustomerId_').all())
+        np.testing.assert_array_equal(df['Value'], df['Amount'].abs())
+        self.assertTrue(set(df['FraudResult'].unique()) <= {0, 1})
+        self.assertTrue(df['TransactionStartTime'].is_monotonic_increasing)
+
+    def test_skewed_activity(self):
+        # A few customers make a large share of the transactions; most make only a few
+        counts = generate_transactions(50000, n_customers=5000, seed=2)['CustomerId'].value_counts()
+        self.assertGreater(counts.iloc[0], 20 * counts.median())
+
+    def test_deterministic_chunks(self):
+        whole = pd.concat(iter_transaction_chunks(3000, chunksize=1000, seed=3), ignore_index=True)
+        again = pd.concat(iter_transaction_chunks(3000, chunksize=1000, seed=3), ignore_index=True)
+        pd.testing.assert_frame_equal(whole, again)
+        self.assertEqual(len(whole), 3000)
+        self.assertTrue(whole['TransactionId'].is_unique)
+        self.assertTrue(whole['TransactionStartTime'].is_monotonic_increasing)
+
+    def test_streaming_writes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            expected = pd.concat(iter_transaction_chunks(2500, chunksize=1000, seed=4), ignore_index=True)
+            for name in ['transactions.parquet', 'transactions.csv']:
+                path = write_transactions(os.path.join(tmp_dir, name), 2500, chunksize=1000, seed=4)
+                df = load_artifact(path)
+                self.assertEqual(len(df), 2500)
+                np.testing.assert_array_equal(df['CustomerId'].astype(str), expected['CustomerId'].astype(str))
+                np.testing.assert_array_equal(pd.to_datetime(df['TransactionStartTime'], utc=True), expected['TransactionStartTime'])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from aggregation import CustomerGrouping
+from time_features import calendar_features, epoch_nanoseconds, parse_timestamps, rolling_window, seconds_since_previous
+from synthetic_data import TIMESTAMP_FORMAT, generate_transactions
+from Feature_Eng import FeatureEngineering
+
+class TestTimeFeatures(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = generate_transactions(20000, seed=1)
+        cls.strings = cls.df['TransactionStartTime'].dt.strftime(TIMESTAMP_FORMAT)
+
+    def test_parse_matches_pandas(self):
+        strings = self.strings.copy()
+        strings.iloc[5] = None
+        expected = pd.to_datetime(strings)
+        pd.testing.assert_series_equal(parse_timestamps(strings), expected)
+        pd.testing.assert_series_equal(parse_timestamps(strings.astype('category')), expected)
+
+    def test_parse_other_inputs(self):
+        # Other string layouts fall back to ISO 8601 parsing; int64 columns are epoch nanoseconds
+        naive = parse_timestamps(pd.Series(['2023-01-01 10:00:00', '2023-01-02 11:00:00']))
+        self.assertEqual(naive.iloc[1], pd.Timestamp('2023-01-02 11:00:00'))
+        epoch = parse_timestamps(pd.Series(self.df['TransactionStartTime'].astype('int64')))
+        pd.testing.assert_series_equal(epoch, self.df['TransactionStartTime'], check_names=False)
+        pd.testing.assert_series_equal(parse_timestamps(self.df['TransactionStartTime']), self.df['TransactionStartTime'])
+
+    def test_calendar_matches_dt_accessors(self):
+        rng = np.random.default_rng(0)
+        times = pd.Series(pd.to_datetime(rng.integers(-2 * 10**18, 4 * 10**18, 5000), unit='ns', utc=True)).dt.tz_convert('Africa/Kampala').copy()
+        times.iloc[3] = pd.NaT
+        features = calendar_features(times)
+        for col, field in [('transaction_hour', 'hour'), ('transaction_day', 'day'), ('transaction_month', 'month'),
+                           ('transaction_year', 'year'), ('transaction_weekday', 'weekday')]:
+            np.testing.assert_array_equal(features[col].to_numpy(), getattr(times.dt, field).to_numpy(dtype=np.float64))
+
+    def test_history_matches_groupby(self):
+        codes = CustomerGrouping(self.df['CustomerId']).codes
+        ns = epoch_nanoseconds(self.df['TransactionStartTime'])
+        frame = self.df.assign(code=codes).sort_values(['code', 'TransactionStartTime'], kind='stable')
+
+        expected_gap = frame.groupby('code')['TransactionStartTime'].diff().dt.total_seconds().sort_index()
+        np.testing.assert_allclose(seconds_since_previous(codes, ns), expected_gap, equal_nan=True)
+
+        counts, sums = rolling_window(codes, ns, '7D', self.df['Amount'])
+        expected = frame.groupby('code').rolling('7D', on='TransactionStartTime')['Amount'].agg(['count', 'sum'])
+        np.testing.assert_array_equal(counts[frame.index], expected['count'])
+        np.testing.assert_allclose(sums[frame.index], expected['sum'])
+
+    def test_extract_time_features(self):
+        feature_eng = FeatureEngineering.__new__(FeatureEngineering)
+        feature_eng.df = self.df[['CustomerId', 'Amount']].assign(TransactionStartTime=self.strings)
+        df = feature_eng.extract_time_features(since_previous=True, windows=['1D'])
+        self.assertEqual(str(df['TransactionStartTime'].dtype), 'datetime64[ns, UTC]')
+        self.assertTrue((df['transaction_count_1D'] >= 1).all())
+        self.assertEqual(df['seconds_since_previous'].isna().sum(), self.df['CustomerId'].nunique())
+        np.testing.assert_array_equal(df['transaction_weekday'], self.df['TransactionStartTime'].dt.weekday)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from tuning import TuningEngine
+
+class TestTuningEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Create a sample classification dataset for testing
+        rng = np.random.default_rng(0)
+        cls.X = pd.DataFrame(rng.normal(size=(600, 4)), columns=['a', 'b', 'c', 'd'])
+        cls.y = pd.Series(np.where(cls.X['a'] + 0.5 * cls.X['b'] + rng.normal(scale=0.5, size=600) > 0, 'Good', 'Bad'))
+        cls.param_space = {'max_depth': [1, 2, 3, 5, 8, None], 'min_samples_leaf': [1, 5, 20]}
+
+    def test_successive_halving_schedule(self):
+        engine = TuningEngine(DecisionTreeClassifier(random_state=0), self.param_space, n_candidates=9, cv=3, n_jobs=1, min_resources=20)
+        self.assertEqual(engine.resource_schedule(9, 400), [44, 133, 400])
+        self.assertEqual(engine.resource_schedule(9, 50), [50])
+        engine.fit(self.X, self.y)
+        rounds = engine.results_.groupby('round')['candidate'].count().tolist()
+        self.assertEqual(rounds, [9, 3, 1])
+
+    def test_refits_best_model(self):
+        engine = TuningEngine(LogisticRegression(), {'C': [0.01, 1.0]}, cv=3, n_jobs=2).fit(self.X, self.y)
+        self.assertIn(engine.best_params_['C'], [0.01, 1.0])
+        self.assertEqual(len(engine.best_estimator_.predict(self.X)), len(self.X))
+        self.assertGreater(engine.best_score_, 0.7)
+
+    def test_cache_skips_completed_folds(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = TuningEngine(DecisionTreeClassifier(random_state=0), self.param_space, n_candidates=6, cv=3, n_jobs=1, cache_dir=cache_dir).fit(self.X, self.y)
+            second = TuningEngine(DecisionTreeClassifier(random_state=0), self.param_space, n_candidates=6, cv=3, n_jobs=1, cache_dir=cache_dir).fit(self.X, self.y)
+            self.assertEqual(first.results_['cached_folds'].sum(), 0)
+            self.assertTrue((second.results_['cached_folds'] == 3).all())
+            self.assertEqual(first.best_params_, second.best_params_)
+
+            # Changed data invalidates the cached folds
+            third = TuningEngine(DecisionTreeClassifier(random_state=0), self.param_space, n_candidates=6, cv=3, n_jobs=1, cache_dir=cache_dir).fit(self.X * 2, self.y)
+            self.assertEqual(third.results_['cached_folds'].sum(), 0)
+
+    def test_failed_fits_score_nan(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            engine = TuningEngine(LogisticRegression(), {'C': [-1.0, 1.0]}, cv=3, n_jobs=1, halving_factor=None, cache_dir=cache_dir).fit(self.X, self.y)
+            self.assertTrue(engine.results_['mean_score'].isna().any())
+            self.assertEqual(engine.best_params_, {'C': 1.0})
+
+            # The errors are recorded, and the failed folds are not cached
+            failed = engine.results_.set_index('candidate').loc[0]
+            self.assertEqual(len(failed['fit_errors']), 3)
+            self.assertIn('InvalidParameterError', failed['fit_errors'][0])
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+    def test_non_fit_errors_raise(self):
+        # Scoring failures are not the estimator's fault and must not turn into NaN scores
+        engine = TuningEngine(LogisticRegression(), {'C': [1.0]}, cv=3, n_jobs=1, halving_factor=None, scoring='no_such_scorer')
+        with self.assertRaises(ValueError):
+            engine.fit(self.X, self.y)
+
+    def test_grouped_folds(self):
+        groups = np.arange(len(self.X)) // 10
+        engine = TuningEngine(LogisticRegression(), {'C': [0.1, 1.0]}, cv=3, n_jobs=1, halving_factor=None)
+        engine.fit(self.X, self.y, groups=groups)
+        self.assertEqual(len(engine.results_), 2)
+        self.assertGreater(engine.best_score_, 0.7)
+
+if __name__ == '__main__':
+    unittest.main()
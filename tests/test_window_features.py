@@ -0,0 +1,86 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from window_features import WindowFeatureEngine
+from synthetic_data import generate_transactions
+from Feature_Eng import FeatureEngineering
+
+class TestWindowFeatures(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = generate_transactions(20000, seed=2)
+        cls.df.loc[7, 'CustomerId'] = np.nan
+        cls.engine = WindowFeatureEngine(cls.df, windows=['1D', '7D'])
+        cls.features = cls.engine.row_features()
+
+    def test_matches_pandas_rolling(self):
+        frame = self.df.dropna(subset=['CustomerId']).sort_values(['CustomerId', 'TransactionStartTime'], kind='stable')
+        rolling = frame.groupby('CustomerId', observed=True).rolling('7D', on='TransactionStartTime')['Amount']
+        expected = rolling.agg(['count', 'sum', 'mean'])
+        rows = frame.index
+        np.testing.assert_array_equal(self.features.loc[rows, 'transaction_count_7D'], expected['count'])
+        np.testing.assert_allclose(self.features.loc[rows, 'transaction_amount_7D'], expected['sum'])
+        np.testing.assert_allclose(self.features.loc[rows, 'average_transaction_amount_7D'], expected['mean'])
+        np.testing.assert_allclose(self.features.loc[rows, 'velocity_7D'], expected['count'] / 7)
+        self.assertTrue(self.features.loc[7].isna().all())
+
+    def test_distinct_counts(self):
+        rng = np.random.default_rng(0)
+        for row in rng.choice(np.flatnonzero(self.df['CustomerId'].notna()), 200, replace=False):
+            current = self.df.loc[row]
+            window = self.df[(self.df['CustomerId'] == current['CustomerId'])
+                             & (self.df['TransactionStartTime'] > current['TransactionStartTime'] - pd.Timedelta('1D'))
+                             & ((self.df['TransactionStartTime'] < current['TransactionStartTime']) | (self.df.index <= row))]
+            self.assertEqual(self.features.loc[row, 'distinct_ProductId_1D'], window['ProductId'].nunique())
+            self.assertEqual(self.features.loc[row, 'spend_1D'], window['Amount'].clip(lower=0).sum())
+
+    def test_point_in_time(self):
+        # Features as of a cutoff are the same whether or not later transactions exist
+        cutoff = self.df['TransactionStartTime'].quantile(0.6)
+        queries = self.df.dropna(subset=['CustomerId']).drop_duplicates('CustomerId').head(300)
+        times = pd.Series(cutoff, index=queries.index)
+        full = self.engine.as_of(queries['CustomerId'], times)
+        truncated = WindowFeatureEngine(self.df[self.df['TransactionStartTime'] < cutoff], windows=['1D', '7D']).as_of(queries['CustomerId'], times)
+        pd.testing.assert_frame_equal(full, truncated)
+
+        # Row features that exclude the current transaction agree with as_of at each transaction's own time
+        excluded = self.engine.row_features(include_current=False)
+        sample = self.df.dropna(subset=['CustomerId']).sample(500, random_state=0)
+        as_of = self.engine.as_of(sample['CustomerId'], sample['TransactionStartTime'])
+        np.testing.assert_allclose(as_of.to_numpy(), excluded.loc[sample.index].to_numpy(), equal_nan=True)
+
+    def test_unknown_customers(self):
+        features = self.engine.as_of(['CustomerId_unknown'], [self.df['TransactionStartTime'].max()])
+        self.assertEqual(features.loc[0, 'transaction_count_7D'], 0)
+
+    def test_high_cardinality_columns_are_counted(self):
+        rng = np.random.default_rng(1)
+        df = self.df.head(3000).assign(ProductId=[f'ProductId_{i}' for i in rng.integers(0, 1000, 3000)])
+        df.loc[5, 'ProductId'] = np.nan
+        features = WindowFeatureEngine(df, windows=['30D']).row_features()
+        frame = df.dropna(subset=['CustomerId']).sort_values(['CustomerId', 'TransactionStartTime'], kind='stable')
+        for row in rng.choice(frame.index, 200, replace=False):
+            current = frame.loc[row]
+            window = frame[(frame['CustomerId'] == current['CustomerId'])
+                           & (frame['TransactionStartTime'] > current['TransactionStartTime'] - pd.Timedelta('30D'))
+                           & ((frame['TransactionStartTime'] < current['TransactionStartTime']) | (frame.index <= row))]
+            self.assertEqual(features.loc[row, 'distinct_ProductId_30D'], window['ProductId'].nunique())
+
+    def test_create_window_features(self):
+        feature_eng = FeatureEngineering.__new__(FeatureEngineering)
+        feature_eng.streaming = False
+        feature_eng.df = self.df.copy()
+        df = feature_eng.create_window_features(windows=['30D'], point_in_time=True)
+        self.assertIn('distinct_ProviderId_30D', df.columns)
+        first = df.dropna(subset=['CustomerId']).sort_values('TransactionStartTime').drop_duplicates('CustomerId')
+        self.assertTrue((first['transaction_count_30D'] == 0).all())
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the path to the scripts directory
+sys.path.append(os.path.abspath('../scripts'))
+
+from woe_binning import WoEBinning, apply_woe, bin_feature, target_codes
+
+class TestWoEBinning(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        n = 20000
+        cls.X = pd.DataFrame({'signal': rng.normal(size=n), 'noise': rng.normal(size=n), 'falling': rng.normal(size=n)})
+        logit = cls.X['signal'] - cls.X['falling']
+        cls.y = pd.Series(np.where(rng.random(n) < 1 / (1 + np.exp(-logit)), 'Good', 'Bad'))
+        cls.X.loc[rng.random(n) < 0.02, 'noise'] = np.nan
+
+    def test_bins_are_monotonic(self):
+        binning = WoEBinning(max_bins=20, n_jobs=1).fit(self.X, self.y)
+        self.assertTrue(np.all(np.diff(binning.woe_['signal']) > 0))
+        self.assertTrue(np.all(np.diff(binning.woe_['falling']) < 0))
+        self.assertGreater(binning.iv_['signal'], 0.3)
+        self.assertLess(binning.iv_['noise'], 0.02)
+
+    def test_counts_match_bins(self):
+        target = target_codes(self.y)
+        result = bin_feature(self.X['signal'].to_numpy(), target, max_bins=10, min_bin_share=0.05)
+        bins = np.searchsorted(result['edges'], self.X['signal'].to_numpy(), side='right')
+        table = result['table'].iloc[:-1]
+        np.testing.assert_array_equal(np.bincount(bins), table['count'])
+        np.testing.assert_array_equal(np.bincount(bins, weights=target), table['good'])
+        self.assertTrue((table['count'] >= 0.05 * len(target)).all())
+
+    def test_iv_matches_table(self):
+        binning = WoEBinning(n_jobs=1).fit(self.X, self.y)
+        table = binning.binning_table()
+        for feature, iv in binning.iv_.items():
+            self.assertAlmostEqual(table.loc[table['feature'] == feature, 'iv'].sum(), iv)
+
+    def test_smoothed_shares_sum_to_one(self):
+        target = target_codes(self.y)
+        for feature in ['signal', 'noise']:
+            table = bin_feature(self.X[feature].to_numpy(), target)['table']
+            table = table[table['count'] > 0]
+            good_share = (table['good'] + 0.5) / (table['good'].sum() + 0.5 * len(table))
+            bad_share = (table['bad'] + 0.5) / (table['bad'].sum() + 0.5 * len(table))
+            self.assertAlmostEqual(good_share.sum(), 1.0)
+            self.assertAlmostEqual(bad_share.sum(), 1.0)
+            np.testing.assert_allclose(table['woe'], np.log(good_share / bad_share))
+
+    def test_pure_bin_keeps_a_finite_woe(self):
+        values = np.arange(100, dtype=np.float64)
+        target = (values >= 50).astype(np.int64)
+        result = bin_feature(values, target, max_bins=2, min_bin_share=0.1)
+        np.testing.assert_allclose(result['woe'], [np.log(0.5 / 51 / (50.5 / 51)), np.log(50.5 / 51 / (0.5 / 51))])
+
+    def test_missing_values_get_their_own_woe(self):
+        binning = WoEBinning(n_jobs=1).fit(self.X, self.y)
+        transformed = binning.transform(self.X)
+        missing = self.X['noise'].isna()
+        self.assertTrue((transformed.loc[missing, 'noise'] == binning.missing_woe_['noise']).all())
+        self.assertEqual(apply_woe(np.array([np.nan]), np.array([0.0]), np.array([1.0, 2.0]))[0], 0.0)
+
+    def test_parallel_fit_matches_serial(self):
+        serial = WoEBinning(n_jobs=1).fit(self.X, self.y)
+        parallel = WoEBinning(n_jobs=2).fit(self.X, self.y)
+        for feature in serial.features:
+            np.testing.assert_array_equal(serial.edges_[feature], parallel.edges_[feature])
+            np.testing.assert_array_equal(serial.woe_[feature], parallel.woe_[feature])
+
+    def test_transform_matrix_matches_frame(self):
+        binning = WoEBinning(n_jobs=1).fit(self.X, self.y, features=['signal', 'noise'])
+        columns = ['falling', 'signal', 'noise']
+        matrix = binning.transform_matrix(self.X[columns].to_numpy(), columns)
+        np.testing.assert_array_equal(matrix, binning.transform(self.X)[columns].to_numpy())
+
+    def test_save_and_load(self):
+        binning = WoEBinning(n_jobs=1).fit(self.X, self.y)
+        with tempfile.TemporaryDirectory() as tmp:
+            loaded = WoEBinning.load(binning.save(os.path.join(tmp, 'woe.pkl')))
+        pd.testing.assert_frame_equal(loaded.transform(self.X), binning.transform(self.X))
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file